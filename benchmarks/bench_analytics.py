@@ -0,0 +1,101 @@
+"""
+Gera um log de eventos sintético (10M de eventos por padrão), mapeia com
+`analytics.open_history` e mede o relatório completo (percentis, mapa de
+calor, sequências, pausas puladas, Pomodoro), comparado com uma passada em
+Python puro pelos mesmos registros (amostra extrapolada).
+Requer NumPy. Execute com: python benchmarks/bench_analytics.py [quantidade_de_eventos]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+import analytics  # noqa: E402
+from event_log import HEADER, MAGIC, RECORD_SIZE, VERSION, EventLogReader, EventType  # noqa: E402
+
+PYTHON_SAMPLE = 500_000  # eventos da passada em Python (extrapolado)
+
+
+def _write_log(path: Path, count: int):
+    """Pares pausa iniciada/confirmada com pausas naturais, Pomodoros e TODOs no meio."""
+    np = analytics.np
+    rng = np.random.default_rng(11)
+    records = np.zeros(count, dtype=analytics.RECORD_DTYPE)
+    records['ts'] = 1_500_000_000.0 + np.cumsum(rng.exponential(30.0, count))
+    kinds = np.empty(count, dtype=np.uint16)
+    kinds[0::2] = EventType.BREAK_STARTED
+    kinds[1::2] = EventType.BREAK_ENDED
+    other = rng.random(count) < 0.3
+    kinds[other] = rng.choice([EventType.IDLE_BREAK, EventType.POMODORO_CYCLE, EventType.POMODORO_ENDED,
+                               EventType.TODO_COMPLETED], int(other.sum()))
+    records['kind'] = kinds
+    records['duration_ms'] = rng.gamma(2.0, 40_000, count).astype(np.uint32)
+    records['aux'] = np.where(kinds == EventType.POMODORO_ENDED, rng.integers(0, 7, count), 0)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+        records.tofile(f)
+
+
+def _python_pass(path: Path, limit: int) -> float:
+    """O mesmo relatório (sem percentis exatos) percorrendo `EventRecord` um a um."""
+    started = time.perf_counter()
+    with EventLogReader(path) as reader:
+        latencies = []
+        heat = Counter()
+        days = set()
+        waiting = False
+        skipped = 0
+        for record in reader.records(0, limit):
+            if record.kind == EventType.BREAK_STARTED:
+                skipped += waiting
+                waiting = True
+            elif record.kind == EventType.BREAK_ENDED:
+                waiting = False
+                latencies.append(record.duration)
+                local = time.localtime(record.ts)
+                heat[local.tm_wday, local.tm_hour] += 1
+                days.add((local.tm_year, local.tm_yday))
+        latencies.sort()
+    return time.perf_counter() - started
+
+
+def main():
+    if not analytics.available():
+        print("NumPy não está instalado: relatórios indisponíveis")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    tmp_dir = Path(tempfile.mkdtemp(prefix='wsi-bench-'))
+    try:
+        path = tmp_dir / 'events.bin'
+        _write_log(path, count)
+
+        started = time.perf_counter()
+        history = analytics.open_history(path)
+        opened = time.perf_counter() - started
+
+        report = history.report()
+        year = history.between(history.ts[-1] - 365 * 86400).report()
+        sample = min(count, PYTHON_SAMPLE)
+        python = _python_pass(path, sample) / sample * count
+
+        print(f"{count} eventos ({path.stat().st_size / 1024 / 1024:.0f} MiB)")
+        print(f"  abrir (memmap):             {opened * 1000:8.2f} ms")
+        print(f"  relatório completo:         {report.elapsed * 1000:8.1f} ms")
+        print(f"  relatório do último ano:    {year.elapsed * 1000:8.1f} ms ({year.events} eventos)")
+        print(f"  Python puro (estim.):       {python * 1000:8.1f} ms")
+        print(f"  pausas puladas: {report.skipped_ratio:.1%}, p90 até confirmar: "
+              f"{report.latency_percentiles[90]:.0f} s, maior sequência: {report.longest_streak} dias")
+        del history, year
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Mede o gráfico do painel com 1M de pontos (cerca de 10 anos, um ponto a cada
+~5 min): a redução LTTB por viewport (`ChartSeries.visible`) e o quadro
+completo do `ChartWidget` (renderizado fora da tela) ao mostrar tudo,
+arrastar, aplicar zoom e repintar sem mudar o viewport.
+Execute com: python benchmarks/bench_chart.py [quantidade_de_pontos]
+(sem display, use QT_QPA_PLATFORM=offscreen)
+"""
+
+import os
+import random
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from chart_core import ChartSeries, np  # noqa: E402
+from chart_widget import ChartWidget  # noqa: E402
+
+WIDTH, HEIGHT = 1200, 400
+
+
+def _series(count: int):
+    rng = random.Random(9)
+    xs, ys = [], []
+    x, y = 1_600_000_000.0, 0.0
+    for _ in range(count):
+        x += rng.expovariate(1 / 300)
+        y += rng.gauss(0, 1)
+        xs.append(x)
+        ys.append(y)
+    return xs, ys
+
+
+def _frames(widget: ChartWidget, views) -> float:
+    """Tempo médio (ms) por quadro para a sequência de viewports."""
+    started = time.perf_counter()
+    for start, end in views:
+        widget.set_view(start, end)
+        widget.grab()
+    return (time.perf_counter() - started) / len(views) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    xs, ys = _series(count)
+
+    series = ChartSeries(xs, ys)
+    started = time.perf_counter()
+    series.visible(series.x0, series.x1, WIDTH)
+    first = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    series.visible(series.x0, series.x1, WIDTH)
+    cached = (time.perf_counter() - started) * 1000
+
+    widget = ChartWidget()
+    widget.resize(WIDTH, HEIGHT)
+    widget.add_series(xs, ys)
+    low, high = widget.view()
+    span = high - low
+
+    full = _frames(widget, [(low, high)])
+    month = 30 * 86400
+    pan = _frames(widget, [(low + span / 2 + i * month / 20, low + span / 2 + month + i * month / 20)
+                           for i in range(60)])
+    zoom = _frames(widget, [(low + span / 2 - span * 0.8 ** i / 2, low + span / 2 + span * 0.8 ** i / 2)
+                            for i in range(40)])
+    revisit = _frames(widget, [(low + span / 2 - span * 0.8 ** i / 2, low + span / 2 + span * 0.8 ** i / 2)
+                               for i in range(40)])
+    renders = widget.plot_renders
+    started = time.perf_counter()
+    for _ in range(60):
+        widget.grab()
+    repaint = (time.perf_counter() - started) / 60 * 1000
+
+    print(f"{count} pontos, {WIDTH}x{HEIGHT}, NumPy: {'sim' if np is not None else 'não'}")
+    print(f"  LTTB série inteira:        {first:8.1f} ms (cacheado: {cached:.2f} ms)")
+    print(f"  quadro, série inteira:     {full:8.1f} ms")
+    print(f"  quadro, arrastando 1 mês:  {pan:8.1f} ms ({1000 / pan:.0f} fps)")
+    print(f"  quadro, zoom contínuo:     {zoom:8.1f} ms ({1000 / zoom:.0f} fps)")
+    print(f"  quadro, zoom já visto:     {revisit:8.1f} ms ({1000 / revisit:.0f} fps)")
+    print(f"  repintura sem mudança:     {repaint:8.2f} ms (traçados: {renders} → {widget.plot_renders})")
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)  # Global: vive enquanto o benchmark roda
+    main()
@@ -0,0 +1,87 @@
+"""
+Grava anos de histórico no log de eventos e mede a escrita em lote (contra
+um fsync por evento), o tamanho do arquivo e as consultas via mmap: abrir,
+achar o último mês por busca binária e contar os tipos no histórico inteiro.
+Execute com: python benchmarks/bench_event_log.py [quantidade_de_eventos]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from event_log import EventLogReader, EventLogWriter, EventType, RECORD_SIZE  # noqa: E402
+
+KINDS = list(EventType)
+PER_EVENT_SAMPLE = 2000  # eventos gravados com fsync individual (extrapolado)
+
+
+def _events(count: int, start: float):
+    rng = random.Random(3)
+    ts = start
+    for _ in range(count):
+        ts += rng.expovariate(1 / 600)  # Um evento a cada ~10 min
+        yield rng.choice(KINDS), ts, rng.uniform(0, 600)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tmp_dir = Path(tempfile.mkdtemp(prefix='wsi-bench-'))
+    try:
+        start_ts = 1_600_000_000.0
+        events = list(_events(count, start_ts))
+
+        path = tmp_dir / 'events.bin'
+        writer = EventLogWriter(path)
+        started = time.perf_counter()
+        for kind, ts, duration in events:
+            writer.append(kind, ts, duration)
+        writer.close()
+        batched = time.perf_counter() - started
+
+        single_path = tmp_dir / 'single.bin'
+        writer = EventLogWriter(single_path)
+        started = time.perf_counter()
+        for kind, ts, duration in events[:PER_EVENT_SAMPLE]:
+            writer.append(kind, ts, duration)
+            writer.flush()
+        writer.close()
+        single = (time.perf_counter() - started) / PER_EVENT_SAMPLE * count
+
+        started = time.perf_counter()
+        reader = EventLogReader(path)
+        opened = time.perf_counter() - started
+
+        last_ts = reader.record(len(reader) - 1).ts
+        started = time.perf_counter()
+        month = sum(1 for _ in reader.scan(start=last_ts - 30 * 86400))
+        month_query = time.perf_counter() - started
+
+        started = time.perf_counter()
+        by_kind = Counter(record.kind for record in reader.scan())
+        full_scan = time.perf_counter() - started
+        assert sum(by_kind.values()) == count == len(reader)
+        reader.close()
+
+        years = (last_ts - start_ts) / (365 * 86400)
+        size = path.stat().st_size
+        print(f"{count} eventos ({years:.1f} anos a ~1 evento/10 min), {RECORD_SIZE} bytes por registro")
+        print(f"  arquivo:                    {size / 1024 / 1024:8.1f} MiB")
+        print(f"  escrita em lote:            {batched * 1000:8.1f} ms ({count / batched / 1e6:.2f} M eventos/s)")
+        print(f"  fsync por evento (estim.):  {single * 1000:8.1f} ms")
+        print(f"  abrir (mmap):               {opened * 1000:8.3f} ms")
+        print(f"  último mês ({month} eventos): {month_query * 1000:8.3f} ms")
+        print(f"  contagem por tipo (tudo):   {full_scan * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Simula um dia de uso com relógio virtual e conta os despertares do processo:
+cada temporizador com seu próprio timer (tolerância zero) contra o agendador
+único com as tolerâncias usadas na aplicação.
+Execute com: python benchmarks/bench_scheduler.py [horas]
+"""
+
+import os
+import random
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from scheduler import Scheduler  # noqa: E402
+from simulation import VirtualClock  # noqa: E402
+
+
+def _register(scheduler, rng, coalesce, with_status, waiting):
+    """Temporizadores equivalentes aos da aplicação (intervalo, tolerância)."""
+    def tol(value):
+        return value if coalesce else 0.0
+
+    noop = lambda: None  # noqa: E731
+    if with_status:
+        scheduler.timer(noop, interval=1.0, tolerance=tol(0.25), name="status").start()
+    scheduler.timer(noop, interval=20 * 60, tolerance=tol(0.5), name="pausa").start()
+    scheduler.timer(noop, interval=20 * 60, tolerance=tol(1.0), name="pré-notificação").start(20 * 60 - 30)
+    scheduler.timer(noop, interval=30 * 60, tolerance=tol(30.0), name="água").start()
+    if waiting:
+        # Pausa aguardando confirmação: lembretes do timer e do Pomodoro ao mesmo tempo
+        scheduler.timer(noop, interval=60.0, tolerance=tol(5.0), name="lembrete").start(rng.uniform(0, 60))
+        scheduler.timer(noop, interval=30.0, tolerance=tol(5.0), name="pomodoro lembrete").start(rng.uniform(0, 30))
+    # TODOs com horários espalhados no dia
+    for _ in range(40):
+        scheduler.timer(noop, interval=24 * 3600, tolerance=tol(1.0), name="todo").start(rng.uniform(0, 24 * 3600))
+
+
+def _simulate(hours, coalesce, with_status, waiting=False):
+    clock = VirtualClock()
+    scheduler = Scheduler(clock)
+    _register(scheduler, random.Random(42), coalesce, with_status, waiting)
+    end = hours * 3600.0
+    while True:
+        at = scheduler.next_wakeup()
+        if at is None or at > end:
+            break
+        clock.now = at
+        scheduler.run_due()
+    return scheduler.wakeups / hours, scheduler.fired / hours
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24.0
+    print(f"Simulação de {hours:g} h")
+    print(f"  {'cenário':<52} {'despertares/h':>14} {'disparos/h':>11}")
+    scenarios = [("com status 1s", True, False), ("sem status", False, False),
+                 ("sem status, aguardando confirmação", False, True)]
+    for name, with_status, waiting in scenarios:
+        for coalesce in (False, True):
+            wakeups, fired = _simulate(hours, coalesce, with_status, waiting)
+            label = f"{name}, {'agendador único' if coalesce else 'timers separados'}"
+            print(f"  {label:<52} {wakeups:14.0f} {fired:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
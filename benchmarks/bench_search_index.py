@@ -0,0 +1,77 @@
+"""
+Mede o índice da paleta de comandos: tempo por tecla digitada (cada prefixo
+da consulta é uma busca completa) e custo das atualizações incrementais.
+Execute com: python benchmarks/bench_search_index.py [quantidade_de_entradas]
+"""
+
+import os
+import random
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from search_index import SearchIndex  # noqa: E402
+
+FRAME_MS = 16.7
+
+WORDS = ("revisar relatório enviar email ligar cliente comprar café reunião "
+         "planejar sprint beber água alongar pescoço ombros olhos respirar "
+         "fundo caminhar ler documentação atualizar planilha backup").split()
+
+QUERIES = ["pomodoro", "pausa agora", "relatorio", "relatrio cliente",
+           "alongar ombros", "configuracoes todos", "beber agua 4242"]
+
+
+def _build(count, rng):
+    index = SearchIndex(kind_order=('action', 'settings', 'todo', 'message'))
+    index.add('action:take_break', 'action', "Fazer pausa agora")
+    index.add('action:start_pomodoro', 'action', "Iniciar Pomodoro")
+    for tab in ("Pausas", "Mensagens", "Geral", "TODOs", "Pomodoro"):
+        index.add(f'settings:{tab}', 'settings', f"Configurações: {tab}")
+    for i in range(count):
+        index.add(f'todo:{i}', 'todo', f"{' '.join(rng.sample(WORDS, 3))} {i}")
+    index.prepare()
+    return index
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    index = _build(count, rng)
+    build_s = time.perf_counter() - start
+
+    print(f"{len(index)} entradas indexadas em {build_s:.2f}s")
+    print(f"  {'consulta':<22} {'média ms':>9} {'pior ms':>9}  melhor resultado")
+    worst_all = 0.0
+    for query in QUERIES:
+        times = []
+        for end in range(1, len(query) + 1):
+            t0 = time.perf_counter()
+            results = index.search(query[:end])
+            times.append((time.perf_counter() - t0) * 1000)
+        worst_all = max(worst_all, max(times))
+        top = results[0].title if results else "-"
+        print(f"  {query:<22} {sum(times) / len(times):9.2f} {max(times):9.2f}  {top}")
+
+    # Atualizações incrementais (como ao editar/concluir TODOs)
+    keys = [f'todo:{i}' for i in rng.sample(range(count), min(1000, count))]
+    t0 = time.perf_counter()
+    for key in keys:
+        index.add(key, 'todo', f"{' '.join(rng.sample(WORDS, 3))} editado")
+    update_us = (time.perf_counter() - t0) / len(keys) * 1e6
+    t0 = time.perf_counter()
+    for key in keys:
+        index.remove(key)
+    remove_us = (time.perf_counter() - t0) / len(keys) * 1e6
+
+    print(f"\n  atualização: {update_us:.1f} µs, remoção: {remove_us:.1f} µs por entrada")
+    print(f"  pior tecla: {worst_all:.2f} ms ({'dentro' if worst_all < FRAME_MS else 'fora'} "
+          f"de um quadro de {FRAME_MS} ms)")
+
+
+if __name__ == "__main__":
+    main()
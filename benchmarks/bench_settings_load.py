@@ -0,0 +1,63 @@
+"""
+Compara o carregamento das configurações pelo config.json (frio) e pelo
+cache binário (quente).
+Execute com: python benchmarks/bench_settings_load.py [quantidade_de_todos]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from settings import SettingsManager  # noqa: E402
+from todo_model import TodoItem  # noqa: E402
+
+
+def _open(config_path: str) -> SettingsManager:
+    manager = SettingsManager(config_path, save_delay_ms=0)
+    manager.get_todos()
+    return manager
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    runs = 5
+    tmp_dir = tempfile.mkdtemp(prefix='wsi-bench-')
+    try:
+        config_path = os.path.join(tmp_dir, 'config.json')
+        todos = [TodoItem(title=f"TODO {i}", is_recurring=i % 3 == 0,
+                          scheduled_time=f"{i % 24:02d}:{i % 60:02d}" if i % 3 == 0 else None).to_dict()
+                 for i in range(count)]
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'todo_storage': 'json', 'todos': todos}, f, indent=2)
+
+        cold, warm = [], []
+        for _ in range(runs):
+            _open(config_path).cache.clear()
+            start = time.perf_counter()
+            manager = _open(config_path)
+            cold.append(time.perf_counter() - start)
+            assert manager.load_timing['source'] == 'json'
+
+            start = time.perf_counter()
+            manager = _open(config_path)
+            warm.append(time.perf_counter() - start)
+            assert manager.load_timing['source'] == 'cache'
+
+        cold_ms = min(cold) * 1000
+        warm_ms = min(warm) * 1000
+        print(f"{count} TODOs, melhor de {runs} execuções")
+        print(f"  config.json (frio): {cold_ms:8.1f} ms")
+        print(f"  cache (quente):     {warm_ms:8.1f} ms")
+        print(f"  ganho:              {cold_ms / warm_ms:8.1f}x")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Agrega anos de histórico do log de eventos e compara as consultas do painel
+(total do último ano, série mensal) feitas nos agregados com a mesma conta
+varrendo o log, além do custo de agregar, salvar e carregar os agregados.
+Execute com: python benchmarks/bench_stats_rollup.py [quantidade_de_eventos]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from event_log import EventLogReader, EventLogWriter, EventType  # noqa: E402
+from stats_rollup import MONTH, StatsRollup  # noqa: E402
+
+KINDS = [EventType.BREAK_STARTED, EventType.BREAK_ENDED, EventType.IDLE_BREAK,
+         EventType.POMODORO_CYCLE, EventType.TODO_COMPLETED]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tmp_dir = Path(tempfile.mkdtemp(prefix='wsi-bench-'))
+    try:
+        rng = random.Random(5)
+        log_path = tmp_dir / 'events.bin'
+        stats_path = tmp_dir / 'stats.json'
+        writer = EventLogWriter(log_path)
+        ts = 1_600_000_000.0
+        for _ in range(count):
+            ts += rng.expovariate(1 / 600)
+            writer.append(rng.choice(KINDS), ts, rng.uniform(0, 900))
+        writer.close()
+
+        stats = StatsRollup(stats_path)
+        started = time.perf_counter()
+        stats.catch_up(log_path)
+        rebuild = time.perf_counter() - started
+        started = time.perf_counter()
+        stats.save()
+        save_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = StatsRollup(stats_path)
+        loaded.load()
+        loaded.catch_up(log_path)
+        load_time = time.perf_counter() - started
+
+        end = datetime.fromtimestamp(ts).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        start = end - timedelta(days=365)
+        started = time.perf_counter()
+        year = loaded.totals(start, end)
+        months = loaded.series(MONTH, start, end)
+        rollup_query = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with EventLogReader(log_path) as reader:
+            confirmed = 0
+            rest = 0.0
+            for record in reader.scan(start.timestamp(), end.timestamp(),
+                                      (EventType.BREAK_ENDED, EventType.IDLE_BREAK)):
+                confirmed += record.kind == EventType.BREAK_ENDED
+                rest += record.duration
+        scan_query = time.perf_counter() - started
+        assert confirmed == year.confirmed and abs(rest - year.rest_seconds) < 1e-3 * max(1.0, rest)
+
+        print(f"{count} eventos, agregados em {stats_path.stat().st_size / 1024:.0f} KiB")
+        print(f"  agregar o log inteiro:      {rebuild * 1000:8.1f} ms ({rebuild / count * 1e6:.2f} µs/evento)")
+        print(f"  salvar agregados:           {save_time * 1000:8.1f} ms")
+        print(f"  carregar agregados:         {load_time * 1000:8.1f} ms (relidos: {loaded.replayed})")
+        print(f"  último ano + {len(months)} meses (agregados): {rollup_query * 1000:8.3f} ms")
+        print(f"  último ano (varrendo o log): {scan_query * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
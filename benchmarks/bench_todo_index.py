@@ -0,0 +1,99 @@
+"""
+Compara o custo por operação do TodoManager com a implementação anterior
+baseada em lista (busca, atualização e remoção lineares, cópia da lista).
+Execute com: python benchmarks/bench_todo_index.py [quantidades...]
+"""
+
+import os
+import random
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from todo_manager import TodoManager  # noqa: E402
+from todo_model import TodoItem  # noqa: E402
+
+
+class LegacyTodoList:
+    """Operações do TodoManager antes do índice por id."""
+
+    def __init__(self, todos):
+        self._todos = list(todos)
+
+    def get_todos(self):
+        return self._todos.copy()
+
+    def get(self, todo_id):
+        for todo in self._todos:
+            if todo.id == todo_id:
+                return todo
+        return None
+
+    def update(self, todo):
+        for i, t in enumerate(self._todos):
+            if t.id == todo.id:
+                self._todos[i] = todo
+                break
+
+    def remove(self, todo_id):
+        self._todos = [t for t in self._todos if t.id != todo_id]
+
+
+def _make_todos(count):
+    return [TodoItem(title=f"TODO {i}", is_recurring=i % 3 == 0,
+                     scheduled_time=f"{i % 24:02d}:{i % 60:02d}" if i % 3 == 0 else None)
+            for i in range(count)]
+
+
+def _per_op_us(fn, args):
+    """Tempo médio por chamada em microssegundos."""
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def _bench(count, ops):
+    todos = _make_todos(count)
+    rng = random.Random(count)
+    sample = [t.id for t in rng.sample(todos, ops)]
+    by_id = {t.id: t for t in todos}
+
+    legacy = LegacyTodoList(todos)
+    manager = TodoManager()
+    manager.set_todos(todos)
+
+    rows = [
+        ("busca por id",
+         _per_op_us(legacy.get, sample),
+         _per_op_us(manager.get_todo, sample)),
+        ("update_todo",
+         _per_op_us(lambda tid: legacy.update(by_id[tid]), sample),
+         _per_op_us(lambda tid: manager.update_todo(by_id[tid]), sample)),
+        ("listar TODOs",
+         _per_op_us(lambda _: legacy.get_todos(), sample),
+         _per_op_us(lambda _: manager.todos, sample)),
+        ("remove_todo",
+         _per_op_us(legacy.remove, sample),
+         _per_op_us(manager.remove_todo, sample)),
+    ]
+
+    print(f"\n{count} TODOs ({ops} operações de cada tipo), µs por operação")
+    print(f"  {'operação':<14} {'lista':>12} {'índice':>12} {'ganho':>10}")
+    for name, before, after in rows:
+        print(f"  {name:<14} {before:12.2f} {after:12.2f} {before / max(after, 1e-9):9.0f}x")
+
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for count in counts:
+        _bench(count, ops=min(200, count))
+
+
+if __name__ == "__main__":
+    app = QCoreApplication(sys.argv[:1])  # TodoManager cria QTimers
+    main()
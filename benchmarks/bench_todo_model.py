@@ -0,0 +1,131 @@
+"""
+Compara o TodoItem compacto (__slots__, campos pré-processados) com o
+dataclass anterior: memória por item, vazão de is_due() e ida e volta pelo
+formato do config.json.
+Execute com: python benchmarks/bench_todo_model.py [quantidade_de_todos]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Optional
+import uuid
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from todo_model import TodoItem, TodoStatus  # noqa: E402
+
+
+@dataclass
+class LegacyTodoItem:
+    """TodoItem antes da representação compacta."""
+
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    title: str = ""
+    description: str = ""
+    is_recurring: bool = False
+    scheduled_time: Optional[str] = None
+    status: str = TodoStatus.PENDING.value
+    completed_at: Optional[str] = None
+    last_reset_date: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LegacyTodoItem':
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    def is_due(self) -> bool:
+        if self.status != TodoStatus.PENDING.value:
+            return False
+        if not self.is_recurring or not self.scheduled_time:
+            return True
+        now = datetime.now()
+        scheduled_hour, scheduled_minute = map(int, self.scheduled_time.split(':'))
+        scheduled = now.replace(hour=scheduled_hour, minute=scheduled_minute, second=0, microsecond=0)
+        return now >= scheduled
+
+
+def _make_dicts(count):
+    """TODOs no formato do config.json (como gravados pela versão anterior)."""
+    return [LegacyTodoItem(
+        title=f"TODO {i}",
+        is_recurring=i % 2 == 0,
+        scheduled_time=f"{i % 24:02d}:{i % 60:02d}" if i % 2 == 0 else None,
+        status=TodoStatus.COMPLETED.value if i % 5 == 0 else TodoStatus.PENDING.value,
+        completed_at=datetime.now().isoformat() if i % 5 == 0 else None,
+        last_reset_date=datetime.now().date().isoformat() if i % 2 == 0 else None,
+    ).to_dict() for i in range(count)]
+
+
+def _bytes_per_item(cls, payload):
+    """
+    Memória retida por item após carregar o JSON e descartar os dicionários,
+    como no carregamento real (inclui as strings mantidas pelo item).
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    dicts = json.loads(payload)
+    items = [cls.from_dict(d) for d in dicts]
+    del dicts
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return total / len(items), items
+
+
+def _is_due_per_second(check, items):
+    start = time.perf_counter()
+    due = sum(1 for item in items if check(item))
+    elapsed = time.perf_counter() - start
+    return len(items) / elapsed, due
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    dicts = _make_dicts(count)
+
+    payload = json.dumps(dicts)
+    legacy_bytes, legacy = _bytes_per_item(LegacyTodoItem, payload)
+    compact_bytes, compact = _bytes_per_item(TodoItem, payload)
+
+    # Como o TodoManager ao carregar: calcula a próxima ocorrência e dispara as vencidas
+    now = datetime.now()
+    for item in compact:
+        if item.rule is not None:
+            item.schedule_next(now)
+            if item.next_occurrence is not None and item.next_occurrence <= now.timestamp():
+                item.fire_occurrence(now)
+
+    legacy_rate, legacy_due = _is_due_per_second(lambda t: t.is_due(), legacy)
+    compact_rate, compact_due = _is_due_per_second(lambda t: t.is_due(), compact)
+    assert legacy_due == compact_due
+
+    # Ida e volta: o que a versão compacta grava deve ser lido de volta igual
+    # e ainda ser compreensível pelo dataclass anterior
+    for d in dicts[:1000]:
+        item = TodoItem.from_dict(d)
+        assert TodoItem.from_dict(item.to_dict()) == item
+        item.schedule_next(now)
+        assert TodoItem.from_dict(item.to_dict()) == item
+        old = LegacyTodoItem.from_dict(item.to_dict())
+        assert (old.scheduled_time, old.status, old.last_reset_date) == \
+            (d['scheduled_time'], d['status'], d['last_reset_date'])
+
+    print(f"{count} TODOs")
+    print(f"  {'':<26} {'dataclass':>12} {'compacto':>12} {'ganho':>8}")
+    print(f"  {'bytes por item':<26} {legacy_bytes:12.0f} {compact_bytes:12.0f} "
+          f"{legacy_bytes / compact_bytes:7.1f}x")
+    print(f"  {'is_due() por segundo':<26} {legacy_rate:12,.0f} {compact_rate:12,.0f} "
+          f"{compact_rate / legacy_rate:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
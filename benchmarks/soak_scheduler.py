@@ -0,0 +1,366 @@
+"""
+Soak de 30 dias simulados dos núcleos de agendamento (sem Qt): timer de
+pausas, Pomodoro, TODOs recorrentes e detecção de ociosidade no mesmo
+agendador, com relógio virtual. Um dia típico: acorda a máquina às 8h, pausas
+das 9h às 18h, almoço com a máquina suspensa, duas horas de Pomodoro à tarde,
+meia hora longe do computador às 16h e suspensão à noite.
+
+Verifica e sai com código 1 se algo falhar:
+  - desvio: cada pausa, fase do Pomodoro e TODO dispara dentro da tolerância
+    do seu prazo, e os lembretes repetidos não acumulam atraso;
+  - TODOs: cada ocorrência é notificada exatamente uma vez;
+  - ausência: detectada até 1/4 do limite depois dele, volta notada na hora
+    (backend com eventos, dias pares) ou com até AWAY_POLL_MAX de atraso
+    (polling, dias ímpares), sem amostras extras, nenhuma pausa durante a
+    ausência e a próxima pausa contando do zero a partir da volta; com o
+    usuário ativo, cerca de uma amostra por limite;
+  - memória: o crescimento depois do primeiro dia e os heaps ficam limitados;
+  - despertares: no máximo MAX_WAKEUPS_PER_HOUR por hora acordada.
+Execute com: python benchmarks/soak_scheduler.py [dias]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, 'src'))
+
+from idle_core import FakeIdleBackend, IdleCore  # noqa: E402
+from pomodoro_core import PomodoroCore, PomodoroState  # noqa: E402
+from recurrence import RecurrenceRule  # noqa: E402
+from scheduler import ClockEvent  # noqa: E402
+from simulation import VirtualScheduler  # noqa: E402
+from timer_core import TimerCore  # noqa: E402
+from todo_core import TodoCore  # noqa: E402
+from todo_model import TodoItem  # noqa: E402
+
+MAX_WAKEUPS_PER_HOUR = 120
+IDLE_THRESHOLD = 5 * 60  # idle_break_minutes = 5
+MAX_MEMORY_GROWTH = 256 * 1024  # bytes depois do primeiro dia
+EPSILON = 1e-6
+COUNTING = (PomodoroState.WORKING.value, PomodoroState.SHORT_BREAK.value, PomodoroState.LONG_BREAK.value)
+
+
+class Checks:
+    """Acumula violações (com limite) e os piores valores observados."""
+
+    def __init__(self):
+        self.failures = []
+        self.worst = {}
+
+    def within(self, name: str, value: float, low: float, high: float, context: str):
+        self.worst[name] = max(self.worst.get(name, 0.0), abs(value))
+        if not low - EPSILON <= value <= high + EPSILON:
+            self.fail(f"{name}: {value:.3f}s fora de [{low}, {high}] ({context})")
+
+    def fail(self, message: str):
+        if len(self.failures) < 20:
+            self.failures.append(message)
+
+
+class ProbedTimer(TimerCore):
+    """TimerCore que registra os prazos que armou, para medir o desvio."""
+
+    def __init__(self, checks: Checks, **kwargs):
+        super().__init__(**kwargs)
+        self.checks = checks
+        self.expected_break = None
+        self.expected_water = None
+        self.slept = False
+        self.scheduler.add_clock_listener(self._on_sleep)
+
+    def _on_sleep(self, event, seconds):
+        if event is ClockEvent.SLEEP:
+            self.slept = True
+
+    def _start_main_timer(self):
+        super()._start_main_timer()
+        self.expected_break = self.main_timer.deadline
+
+    def _start_water_timer(self):
+        super()._start_water_timer()
+        self.expected_water = self.water_timer.deadline if self.water_timer.is_active() else None
+        self.slept = False
+
+    def _on_main_timer_timeout(self):
+        now = self.scheduler.clock()
+        self.checks.within("pausa", now - self.expected_break, 0.0, self.main_timer.tolerance,
+                           f"t={now:.0f}")
+        super()._on_main_timer_timeout()
+
+    def _on_water_reminder(self):
+        now = self.scheduler.clock()
+        if not self.slept:
+            self.checks.within("água", now - self.expected_water, 0.0, self.water_timer.tolerance,
+                               f"t={now:.0f}")
+            # Repetição ancorada: o próximo prazo não herda o atraso deste disparo
+            self.checks.within("água (âncora)", self.water_timer.deadline - self.expected_water
+                               - self.water_timer.interval, 0.0, 0.0, f"t={now:.0f}")
+        self.expected_water = self.water_timer.deadline
+        self.slept = False
+        super()._on_water_reminder()
+
+
+class DeskIdleBackend(FakeIdleBackend):
+    """Usuário digitando enquanto está à mesa: cada amostra vê uma entrada recente."""
+
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.away = False
+
+    def idle_seconds(self) -> float:
+        if not self.away:
+            self.simulate_input()
+        return super().idle_seconds()
+
+
+def _make_todos(rng: random.Random, start_day):
+    todos = []
+    for i in range(40):
+        todo = TodoItem(title=f"Diário {i}")
+        todo.set_rule(RecurrenceRule.daily(rng.randrange(24 * 60)))
+        todos.append(todo)
+    for i in range(10):
+        todo = TodoItem(title=f"Semanal {i}")
+        todo.set_rule(RecurrenceRule.on_weekdays(rng.sample(range(7), 2), rng.randrange(24 * 60)))
+        todos.append(todo)
+    for i in range(5):
+        todo = TodoItem(title=f"A cada 2 h {i}")
+        todo.set_rule(RecurrenceRule.every_n_hours(2, 9 * 60 + 30, 17 * 60 + 30))
+        todos.append(todo)
+    for i in range(5):
+        todo = TodoItem(title=f"A cada 3 dias {i}")
+        todo.set_rule(RecurrenceRule.every_n_days(3, rng.randrange(8 * 60, 18 * 60), start_day))
+        todos.append(todo)
+    return todos
+
+
+def _expected_occurrences(todos, start: datetime, end: datetime) -> int:
+    """Ocorrências de todas as regras em [start, end)."""
+    total = 0
+    for todo in todos:
+        at = todo.rule.next_after(start - timedelta(seconds=1))
+        while at is not None and at < end:
+            total += 1
+            at = todo.rule.next_after(at)
+    return total
+
+
+def soak(days: int):
+    checks = Checks()
+    rng = random.Random(7)
+    first_day = datetime(2025, 1, 6)  # Segunda-feira
+    start = first_day.replace(hour=8)
+    scheduler = VirtualScheduler(epoch=start.timestamp())
+    scheduler.start_watchdog()  # Como o QtScheduler da aplicação
+
+    timer = ProbedTimer(checks, scheduler=scheduler)
+    timer.configure(break_interval=20, pre_notification_seconds=30, water_interval=30)
+    timer.break_started.connect(lambda: scheduler.call_later(60, timer.confirm_break))
+
+    pomodoro = PomodoroCore(scheduler=scheduler)
+    phase = {'end': None}
+
+    def on_pomodoro_state(state):
+        now = scheduler.clock()
+        if phase['end'] is not None and state == PomodoroState.WAITING_CONFIRMATION.value:
+            checks.within("pomodoro", now - phase['end'], 0.0, pomodoro.phase_timer.tolerance, f"t={now:.0f}")
+        phase['end'] = now + pomodoro.time_remaining() if state in COUNTING else None
+
+    pomodoro.state_changed.connect(on_pomodoro_state)
+    cycles = {'count': 0}
+    pomodoro.cycle_completed.connect(lambda n: cycles.update(count=cycles['count'] + 1))
+    pomodoro.confirmation_needed.connect(lambda msg: scheduler.call_later(5, pomodoro.confirm_next_cycle))
+
+    todo_core = TodoCore(scheduler=scheduler)
+    todos = _make_todos(rng, first_day.date())
+    last_delivered = {}  # todo_id → última ocorrência notificada (memória constante)
+    delivered = {'count': 0}
+    # Ocorrências de antes do início ou de dentro de uma suspensão chegam
+    # atrasadas por definição (ao iniciar / na volta) e não contam como desvio
+    awake_since = {'wall': start.timestamp()}
+    scheduler.add_clock_listener(lambda event, seconds: awake_since.update(wall=scheduler.wall_time()))
+
+    def deliver(todo):
+        if last_delivered.get(todo.id) == todo.occurrence_ts:
+            checks.fail(f"TODO notificado duas vezes: {todo.title} {todo.occurrence_ts}")
+        last_delivered[todo.id] = todo.occurrence_ts
+        delivered['count'] += 1
+
+    def on_due(todo):
+        deliver(todo)
+        if todo.occurrence_ts >= awake_since['wall']:
+            checks.within("TODO", scheduler.wall_time() - todo.occurrence_ts, 0.0,
+                          todo_core._deadline_timer.tolerance, todo.title)
+        # Usuário conclui alguns minutos depois
+        scheduler.call_later(rng.uniform(60, 600), lambda: todo_core.complete_todos([todo.id]))
+
+    def on_missed(missed):
+        for todo in missed:
+            deliver(todo)
+        scheduler.call_later(60, lambda: todo_core.complete_todos([t.id for t in missed]))
+
+    todo_core.todo_due.connect(on_due)
+    todo_core.todos_missed.connect(on_missed)
+    todo_core.set_todos(todos)
+    todo_core.start()
+
+    # Ociosidade ligada como em app._on_idle_started/_on_idle_ended
+    idle_backend = DeskIdleBackend(scheduler.clock)
+    idle = IdleCore(idle_backend, scheduler=scheduler)
+    idle.configure(IDLE_THRESHOLD)
+    away = {'start': None, 'returned': None, 'samples': 0, 'entered': 0, 'ended': 0}
+
+    def on_idle_started(seconds):
+        now = scheduler.clock()
+        away['entered'] += 1
+        away['samples'] = idle_backend.samples
+        if away['start'] is None:
+            checks.fail(f"ausência detectada sem o usuário sair (t={now:.0f})")
+        else:
+            checks.within("ausência (detecção)", now - away['start'] - IDLE_THRESHOLD, 0.0,
+                          IDLE_THRESHOLD / 4, f"t={now:.0f}")
+        timer.enter_idle()
+        pomodoro.suspend()
+        scheduler.stop_watchdog()
+
+    def on_idle_ended(seconds):
+        now = scheduler.clock()
+        away['ended'] += 1
+        if idle_backend.event_driven:
+            late, extra_samples = 0.0, 0
+        else:
+            late, extra_samples = IdleCore.AWAY_POLL_MAX * 1.25, 4 + int(seconds // IdleCore.AWAY_POLL_MAX)
+        checks.within("ausência (volta)", now - away['returned'], 0.0, late, f"t={now:.0f}")
+        checks.within("ausência (duração)", seconds - (away['returned'] - away['start']), 0.0, late,
+                      f"t={now:.0f}")
+        samples = idle_backend.samples - away['samples']
+        if samples > extra_samples:
+            checks.fail(f"{samples} amostras durante a ausência (máximo {extra_samples}, t={now:.0f})")
+        scheduler.start_watchdog()
+        timer.exit_idle()
+        pomodoro.resume(seconds)
+        # A ausência contou como pausa: a próxima conta do zero a partir da volta
+        checks.within("ausência (próxima pausa)", timer.main_timer.deadline - now - timer.break_interval * 60,
+                      0.0, 0.0, f"t={now:.0f}")
+
+    def on_break_started():
+        if timer.is_idle:
+            checks.fail(f"pausa iniciada com o usuário ausente (t={scheduler.clock():.0f})")
+
+    idle.idle_started.connect(on_idle_started)
+    idle.idle_ended.connect(on_idle_ended)
+    timer.break_started.connect(on_break_started)
+
+    tracemalloc.start()
+    baseline = None
+    awake_hours = 0.0
+    max_heap = 0
+    sleeps = 0
+    started = time.perf_counter()
+
+    # O log de suspensão do agendador sai uma vez por noite; fica fora do relatório
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for day in range(days):
+            date = first_day + timedelta(days=day)
+
+            def at(hour, minute=0):
+                return (date + timedelta(hours=hour, minutes=minute)).timestamp()
+
+            if day > 0:
+                scheduler.suspend(at(8) - scheduler.wall_time())  # Noite com a máquina suspensa
+                sleeps += 1
+            scheduler.run_until_wall(at(9))
+            timer.start()
+            idle_backend.simulate_input()
+            idle.start()
+            scheduler.run_until_wall(at(12))
+            idle.stop()  # O monitor só observa o usuário à mesa, não a tampa fechada
+            scheduler.suspend(45 * 60)  # Almoço com a tampa fechada
+            sleeps += 1
+            scheduler.run_until_wall(at(13))
+            idle_backend.simulate_input()
+            idle.start()
+            timer.pause()
+            pomodoro.start()
+            scheduler.run_until_wall(at(15))
+            pomodoro.stop()
+            timer.resume()
+            scheduler.run_until_wall(at(16))
+            # Meia hora longe do computador (mais que a pausa natural de 5 min)
+            idle_backend.event_driven = day % 2 == 0
+            idle_backend.simulate_input()
+            idle_backend.away = True
+            away['start'] = scheduler.clock()
+            scheduler.run_until_wall(at(16, 30))
+            away['returned'] = scheduler.clock()
+            idle_backend.away = False
+            idle_backend.simulate_input()
+            scheduler.run_until_wall(at(18))
+            away['start'] = None
+            idle.stop()
+            timer.stop()
+            awake_hours += 10 - 0.75
+
+            max_heap = max(max_heap, len(scheduler._by_deadline), len(scheduler._by_latest))
+            if len(todo_core._deadlines) > 2 * len(todo_core._deadline_seqs) + 64:
+                checks.fail(f"heap de TODOs com {len(todo_core._deadlines)} entradas no dia {day}")
+            if day == 0:
+                baseline = tracemalloc.get_traced_memory()[0]
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - started
+
+    end = first_day + timedelta(days=days - 1, hours=18)
+    expected = _expected_occurrences(todos, first_day, end)
+    if delivered['count'] != expected:
+        checks.fail(f"TODOs: {delivered['count']} ocorrências notificadas, esperadas {expected}")
+    growth = current - baseline
+    if growth > MAX_MEMORY_GROWTH:
+        checks.fail(f"memória cresceu {growth / 1024:.0f} KiB depois do primeiro dia")
+    if max_heap > max(64, 4 * scheduler.pending()) + 64:
+        checks.fail(f"heap do agendador chegou a {max_heap} entradas")
+    per_hour = scheduler.wakeups / awake_hours
+    if per_hour > MAX_WAKEUPS_PER_HOUR:
+        checks.fail(f"{per_hour:.0f} despertares por hora acordada (máximo {MAX_WAKEUPS_PER_HOUR})")
+    if scheduler.clock_events != sleeps:
+        checks.fail(f"{scheduler.clock_events} suspensões detectadas, esperadas {sleeps}")
+    if away['entered'] != days or away['ended'] != days:
+        checks.fail(f"ausências: {away['entered']} detectadas e {away['ended']} encerradas, esperadas {days}")
+    # Amostragem adaptativa: com o usuário ativo, uma amostra por limite (7,5 h à mesa por dia)
+    max_samples = days * int(7.5 * 3600 / IDLE_THRESHOLD + 20)
+    if idle_backend.samples > max_samples:
+        checks.fail(f"{idle_backend.samples} amostras de ociosidade (máximo {max_samples})")
+
+    print(f"Soak de {days} dias simulados em {elapsed:.2f}s")
+    print(f"  despertares: {scheduler.wakeups} ({per_hour:.1f}/h acordado), disparos: {scheduler.fired}")
+    print(f"  pausas feitas: {timer.breaks_taken}, ciclos de Pomodoro: {cycles['count']}")
+    print(f"  TODOs: {delivered['count']} ocorrências notificadas de {expected}")
+    print(f"  suspensões detectadas: {scheduler.clock_events}")
+    print(f"  ausências: {away['entered']} detectadas, {away['ended']} encerradas; "
+          f"amostras de ociosidade: {idle_backend.samples}")
+    print(f"  memória: +{growth / 1024:.1f} KiB depois do 1º dia (pico {peak / 1024:.0f} KiB); "
+          f"maior heap do agendador: {max_heap}")
+    print("  pior atraso: " + ", ".join(f"{k} {v:.3f}s" for k, v in sorted(checks.worst.items())))
+    if checks.failures:
+        print("FALHAS:")
+        for failure in checks.failures:
+            print(f"  - {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    sys.exit(soak(days))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,34 @@ ASSETS_DIR = ROOT_DIR / 'assets'
 datas = [
     (str(SRC_DIR / 'app.py'), '.'),
     (str(SRC_DIR / 'settings.py'), '.'),
+    (str(SRC_DIR / 'persistence.py'), '.'),
+    (str(SRC_DIR / 'settings_journal.py'), '.'),
+    (str(SRC_DIR / 'settings_cache.py'), '.'),
+    (str(SRC_DIR / 'config_watcher.py'), '.'),
     (str(SRC_DIR / 'timer_manager.py'), '.'),
     (str(SRC_DIR / 'tray_icon.py'), '.'),
     (str(SRC_DIR / 'overlay.py'), '.'),
     (str(SRC_DIR / 'todo_model.py'), '.'),
+    (str(SRC_DIR / 'recurrence.py'), '.'),
     (str(SRC_DIR / 'todo_manager.py'), '.'),
+    (str(SRC_DIR / 'todo_store.py'), '.'),
+    (str(SRC_DIR / 'todo_transfer.py'), '.'),
     (str(SRC_DIR / 'pomodoro_manager.py'), '.'),
+    (str(SRC_DIR / 'search_index.py'), '.'),
+    (str(SRC_DIR / 'command_palette.py'), '.'),
+    (str(SRC_DIR / 'list_models.py'), '.'),
+    (str(SRC_DIR / 'scheduler.py'), '.'),
+    (str(SRC_DIR / 'idle_monitor.py'), '.'),
+    (str(SRC_DIR / 'idle_core.py'), '.'),
+    (str(SRC_DIR / 'signals.py'), '.'),
+    (str(SRC_DIR / 'timer_core.py'), '.'),
+    (str(SRC_DIR / 'pomodoro_core.py'), '.'),
+    (str(SRC_DIR / 'todo_core.py'), '.'),
+    (str(SRC_DIR / 'event_log.py'), '.'),
+    (str(SRC_DIR / 'stats_rollup.py'), '.'),
+    (str(SRC_DIR / 'analytics.py'), '.'),
+    (str(SRC_DIR / 'chart_core.py'), '.'),
+    (str(SRC_DIR / 'chart_widget.py'), '.'),
 ]
 
 if ASSETS_DIR.exists():
@@ -40,17 +62,40 @@ a = Analysis(
         'PyQt6.QtGui',
         'app',
         'settings',
+        'persistence',
+        'settings_journal',
+        'settings_cache',
+        'config_watcher',
         'timer_manager',
         'tray_icon',
         'overlay',
         'todo_model',
+        'recurrence',
         'todo_manager',
+        'todo_store',
+        'todo_transfer',
         'pomodoro_manager',
+        'search_index',
+        'command_palette',
+        'list_models',
+        'scheduler',
+        'idle_monitor',
+        'idle_core',
+        'signals',
+        'timer_core',
+        'pomodoro_core',
+        'todo_core',
+        'event_log',
+        'stats_rollup',
+        'analytics',
+        'chart_core',
+        'chart_widget',
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Relógio virtual dos benchmarks e do soak; a aplicação não o importa
+    excludes=['simulation'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -0,0 +1,293 @@
+"""
+Relatórios detalhados sobre o histórico de eventos, calculados com NumPy.
+O log é mapeado direto como um array estruturado (sem cópia nem objetos por
+evento) e cada métrica é uma operação vetorizada. NumPy é opcional: sem ele,
+`open_history()` retorna None e o painel fica só com os agregados de
+`stats_rollup`.
+"""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+from event_log import HEADER, RECORD_SIZE, EventLogReader, EventType
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional
+    np = None
+
+
+if np is not None:
+    # Mesmo layout de `event_log.RECORD` ('<dIHHQQ')
+    RECORD_DTYPE = np.dtype([('ts', '<f8'), ('duration_ms', '<u4'), ('kind', '<u2'),
+                             ('aux', '<u2'), ('id', '<u8'), ('ref', '<u8')])
+    assert RECORD_DTYPE.itemsize == RECORD_SIZE
+else:
+    RECORD_DTYPE = None
+
+DAY_SECONDS = 86400
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+def available() -> bool:
+    """True se NumPy está instalado e os relatórios podem ser calculados."""
+    return np is not None
+
+
+@dataclass
+class HistoryReport:
+    """Resultado de `History.report()`. Tempos em segundos."""
+    events: int = 0
+    breaks_started: int = 0
+    breaks_confirmed: int = 0
+    skipped_ratio: float = 0.0  # pausas iniciadas que não chegaram à confirmação
+    latency_percentiles: Dict[int, float] = field(default_factory=dict)  # tempo até confirmar
+    compliance: float = 0.0  # fração confirmada em até `compliance_seconds`
+    heatmap: Optional['np.ndarray'] = None  # 7 x 24 (segunda..domingo x hora), pausas confirmadas
+    active_days: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    pomodoro_sessions: int = 0
+    pomodoro_mean_cycles: float = 0.0
+    pomodoro_completion: float = 0.0  # sessões que chegaram a `target_cycles`
+    elapsed: float = 0.0  # tempo de cálculo
+
+
+def _local_offsets(seconds: 'np.ndarray') -> 'np.ndarray':
+    """
+    Deslocamento UTC local (segundos) de cada timestamp inteiro. O fuso é
+    consultado uma vez por dia, e hora a hora só nos dias em que ele muda
+    (horário de verão), então o custo não depende do número de eventos.
+    """
+    first_day = int(seconds[0]) // DAY_SECONDS
+    last_day = int(seconds[-1]) // DAY_SECONDS + 1
+    day_offsets = np.array([time.localtime(day * DAY_SECONDS).tm_gmtoff
+                            for day in range(first_day, last_day + 1)], dtype=np.int64)
+    hour_offsets = np.repeat(day_offsets[:-1], 24)
+    for day in np.flatnonzero(day_offsets[1:] != day_offsets[:-1]):
+        base = (first_day + int(day)) * DAY_SECONDS
+        hour_offsets[day * 24:(day + 1) * 24] = [time.localtime(base + hour * 3600).tm_gmtoff
+                                                 for hour in range(24)]
+    return hour_offsets[seconds // 3600 - first_day * 24]
+
+
+def _match(kinds: 'np.ndarray', wanted: Sequence[int]) -> 'np.ndarray':
+    """Máscara de `kinds` nos tipos de `wanted` (poucos tipos: comparações diretas vencem `np.isin`)."""
+    mask = kinds == wanted[0]
+    for kind in wanted[1:]:
+        mask |= kinds == kind
+    return mask
+
+
+def _run_lengths(days: 'np.ndarray') -> 'np.ndarray':
+    """Tamanho das sequências de dias consecutivos em `days` (ordenado, sem repetição)."""
+    edges = np.flatnonzero(np.diff(days) != 1) + 1
+    return np.diff(np.concatenate(([0], edges, [len(days)])))
+
+
+class History:
+    """
+    Histórico como array estruturado (`RECORD_DTYPE`), ordenado por tempo.
+    Aberto com `open_history()`, o array é um `np.memmap` do próprio log:
+    fatias por período (`between`) e colunas são views, sem cópia.
+    """
+
+    def __init__(self, records: 'np.ndarray'):
+        if np is None:
+            raise RuntimeError("NumPy não está instalado")
+        self.records = records
+        self._kinds = None
+        self._masks = {}
+        self._local = {}
+        self._latency = None
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'History':
+        """Histórico sobre bytes de registros (ex.: `EventLogReader.records_buffer()`)."""
+        return cls(np.frombuffer(buffer, dtype=RECORD_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def ts(self) -> 'np.ndarray':
+        return self.records['ts']
+
+    @property
+    def kinds(self) -> 'np.ndarray':
+        """Coluna de tipos, copiada uma vez para memória contígua (as comparações ficam mais rápidas)."""
+        if self._kinds is None:
+            self._kinds = np.ascontiguousarray(self.records['kind'])
+        return self._kinds
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> 'History':
+        """Eventos com timestamp (epoch) em [start, end), como view."""
+        ts = self.ts
+        first = int(np.searchsorted(ts, start, 'left')) if start is not None else 0
+        last = int(np.searchsorted(ts, end, 'left')) if end is not None else len(ts)
+        return History(self.records[first:last])
+
+    def local_time(self, kinds: Optional[Iterable[int]] = None) -> 'np.ndarray':
+        """
+        Timestamps no horário local, em segundos inteiros desde 1970-01-01
+        00:00 local, de todos os eventos ou só dos tipos informados. Inteiros
+        porque as divisões por hora e dia são bem mais rápidas que em float.
+        """
+        key = tuple(sorted(kinds)) if kinds is not None else None
+        local = self._local.get(key)
+        if local is not None:
+            return local
+        for cached_key, cached in self._local.items():
+            # Subconjunto de um já calculado: filtra o array pequeno em vez de
+            # percorrer de novo as colunas do log inteiro
+            if key is not None and (cached_key is None or set(key) <= set(cached_key)):
+                kinds_cached = self.kinds if cached_key is None else self.kinds[self._of_kinds(cached_key)]
+                local = cached[_match(kinds_cached, key)]
+                break
+        else:
+            ts = self.ts if key is None else self.ts[self._of_kinds(key)]
+            seconds = ts.astype(np.int64)
+            local = seconds + _local_offsets(seconds) if len(seconds) else seconds
+        self._local[key] = local
+        return local
+
+    def _of_kinds(self, kinds: Iterable[int]) -> 'np.ndarray':
+        """Máscara dos eventos dos tipos informados (guardada para as próximas métricas)."""
+        key = tuple(sorted(kinds))
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = _match(self.kinds, key)
+        return mask
+
+    def _of_kind(self, kind: EventType) -> 'np.ndarray':
+        return self._of_kinds((kind,))
+
+    def _latencies(self) -> 'np.ndarray':
+        """Tempo até a confirmação (ms) de cada pausa confirmada."""
+        if self._latency is None:
+            self._latency = self.records['duration_ms'][self._of_kind(EventType.BREAK_ENDED)]
+        return self._latency
+
+    # Métricas
+
+    def latency_percentiles(self, percentiles: Sequence[float] = PERCENTILES) -> Dict[int, float]:
+        """Percentis do tempo até a confirmação das pausas."""
+        durations = self._latencies()
+        if not len(durations):
+            return {}
+        values = np.percentile(durations, percentiles, method='lower') / 1000
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def compliance(self, seconds: float) -> float:
+        """Fração das pausas confirmadas em até `seconds` segundos."""
+        durations = self._latencies()
+        if not len(durations):
+            return 0.0
+        return float(np.count_nonzero(durations <= seconds * 1000) / len(durations))
+
+    def skipped_ratio(self) -> float:
+        """
+        Fração das pausas iniciadas que não foram confirmadas: o próximo
+        evento de pausa depois de `BREAK_STARTED` não é `BREAK_ENDED`
+        (aplicativo fechado ou encerrado no meio da pausa).
+        """
+        breaks = self.kinds[self._of_kinds((EventType.BREAK_STARTED, EventType.BREAK_ENDED))]
+        started = breaks == EventType.BREAK_STARTED
+        total = int(np.count_nonzero(started))
+        if not total:
+            return 0.0
+        # Iniciada seguida de outra iniciada (ou no fim do histórico): não confirmada
+        skipped = np.count_nonzero(started[:-1] & started[1:]) + int(started[-1])
+        return float(skipped / total)
+
+    def heatmap(self, kinds: Iterable[int] = (EventType.BREAK_ENDED,), weight: bool = False) -> 'np.ndarray':
+        """
+        Matriz 7 x 24 (dia da semana, segunda = 0, x hora local) com a
+        contagem dos eventos dos tipos informados, ou a soma das durações
+        (segundos) com `weight=True`.
+        """
+        kinds = tuple(kinds)
+        # Hora da semana: 1970-01-01 00:00 foi quinta-feira, 72 h depois da segunda
+        cells = (self.local_time(kinds) // 3600 + 72) % (7 * 24)
+        weights = self.records['duration_ms'][self._of_kinds(kinds)] / 1000 if weight else None
+        return np.bincount(cells, weights=weights, minlength=7 * 24).reshape(7, 24)
+
+    def active_days(self) -> 'np.ndarray':
+        """Dias locais (dias desde 1970-01-01) com pausa confirmada ou natural, ordenados."""
+        days = self.local_time((EventType.BREAK_ENDED, EventType.IDLE_BREAK)) // DAY_SECONDS
+        if not len(days):
+            return days
+        # Já em ordem, exceto o recuo de 1 h do fim do horário de verão: sem ordenar
+        days = np.maximum.accumulate(days)
+        keep = np.empty(len(days), dtype=bool)
+        keep[0] = True
+        np.not_equal(days[1:], days[:-1], out=keep[1:])
+        return days[keep]
+
+    def streaks(self, today: Optional[int] = None):
+        """
+        (sequência atual, maior sequência) de dias seguidos com pausa. A atual
+        vale se terminou hoje ou ontem (`today` em dias locais desde 1970).
+        """
+        return self._streaks(self.active_days(), today)
+
+    @staticmethod
+    def _streaks(days: 'np.ndarray', today: Optional[int]):
+        if not len(days):
+            return 0, 0
+        lengths = _run_lengths(days)
+        if today is None:
+            now = time.time()
+            today = int((now + time.localtime(now).tm_gmtoff) // DAY_SECONDS)
+        current = int(lengths[-1]) if today - days[-1] <= 1 else 0
+        return current, int(lengths.max())
+
+    def pomodoro_sessions(self, target_cycles: int = 4):
+        """
+        (sessões, média de ciclos por sessão, fração das sessões com pelo
+        menos `target_cycles` ciclos), a partir de `POMODORO_ENDED`.
+        """
+        cycles = self.records['aux'][self._of_kind(EventType.POMODORO_ENDED)]
+        if not len(cycles):
+            return 0, 0.0, 0.0
+        return (len(cycles), float(cycles.mean()),
+                float(np.count_nonzero(cycles >= target_cycles) / len(cycles)))
+
+    def report(self, compliance_seconds: float = 60.0, target_cycles: int = 4,
+               today: Optional[int] = None) -> HistoryReport:
+        """Calcula todas as métricas de uma vez."""
+        started = time.perf_counter()
+        kinds = self.kinds
+        report = HistoryReport(events=len(self))
+        report.breaks_started = int(np.count_nonzero(kinds == EventType.BREAK_STARTED))
+        report.breaks_confirmed = int(np.count_nonzero(kinds == EventType.BREAK_ENDED))
+        report.skipped_ratio = self.skipped_ratio()
+        report.latency_percentiles = self.latency_percentiles()
+        report.compliance = self.compliance(compliance_seconds)
+        days = self.active_days()  # Antes do mapa de calor, que reaproveita o horário local
+        report.active_days = len(days)
+        report.current_streak, report.longest_streak = self._streaks(days, today)
+        report.heatmap = self.heatmap()
+        (report.pomodoro_sessions, report.pomodoro_mean_cycles,
+         report.pomodoro_completion) = self.pomodoro_sessions(target_cycles)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+def open_history(path: Path) -> Optional[History]:
+    """
+    Mapeia o log de eventos como `History` (valida o cabeçalho e ignora um
+    registro final incompleto). Retorna None sem NumPy.
+    """
+    if np is None:
+        return None
+    with EventLogReader(path) as reader:
+        count = len(reader)
+    if not count:
+        return History(np.empty(0, dtype=RECORD_DTYPE))
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+    # View como ndarray comum: o mapa continua vivo pela base, e a indexação
+    # não passa pelo `memmap.__getitem__`
+    return History(records.view(np.ndarray))
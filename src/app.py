@@ -3,24 +3,38 @@ Classe principal da aplicação Wsi Break Time.
 Integra todos os componentes: timer, tray, overlay e configurações.
 """
 
+import copy
+import math
+import os
 import random
-from typing import List, Optional
+from typing import List, Optional, Set
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QSpinBox, QCheckBox, QTextEdit, QPushButton, QGroupBox,
     QFormLayout, QTabWidget, QWidget, QSystemTrayIcon,
-    QListWidget, QListWidgetItem, QMessageBox, QTimeEdit, QLineEdit
+    QListView, QMessageBox, QTimeEdit, QLineEdit, QInputDialog,
+    QFileDialog, QProgressDialog
 )
-from PyQt6.QtCore import QTimer, Qt, QTime
+from PyQt6.QtCore import Qt, QTime, QModelIndex
 from PyQt6.QtGui import QFont
 
-from settings import SettingsManager, AppSettings
+from settings import SettingsManager, AppSettings, TIMER_FIELDS, POMODORO_FIELDS, OVERLAY_FIELDS, IDLE_FIELDS
+from config_watcher import ConfigWatcher
+from scheduler import get_scheduler
+from idle_monitor import IdleMonitor, create_idle_backend
 from timer_manager import TimerManager
 from tray_icon import TrayIcon
 from overlay import BreakOverlay, ConfirmToast
 from todo_model import TodoItem, TodoStatus
 from todo_manager import TodoManager
+from todo_transfer import ImportStats, export_todos, read_todos
+from list_models import StringListModel, TodoListModel
 from pomodoro_manager import PomodoroManager, PomodoroState
+from event_log import EventLogWriter, EventRecorder
+from stats_rollup import StatsRollup
+from command_palette import (
+    CommandPalette, KIND_ACTION, KIND_SETTINGS, KIND_TODO, KIND_MESSAGE, KIND_CHALLENGE
+)
 
 
 class TodoVerificationDialog(QDialog):
@@ -117,23 +131,35 @@ class TodoVerificationDialog(QDialog):
 class SettingsDialog(QDialog):
     """Diálogo de configurações."""
 
+    # Nomes das abas, na ordem em que aparecem
+    TAB_BREAKS = "Pausas"
+    TAB_MESSAGES = "Mensagens"
+    TAB_GENERAL = "Geral"
+    TAB_TODOS = "TODOs"
+    TAB_POMODORO = "Pomodoro"
+    TABS = (TAB_BREAKS, TAB_MESSAGES, TAB_GENERAL, TAB_TODOS, TAB_POMODORO)
+
     def __init__(self, settings: AppSettings, timer_manager: Optional[TimerManager] = None,
-                 todos: Optional[List[TodoItem]] = None, parent=None):
+                 todos: Optional[List[TodoItem]] = None, initial_tab: Optional[str] = None,
+                 parent=None):
         super().__init__(parent)
         self.settings = settings
         self.timer_manager = timer_manager
-        self._todos = todos if todos else []
+        self._todos = todos if todos is not None else []
         self._editing_todo_id = None  # ID do TODO sendo editado
         self.setWindowTitle("Configurações - Wsi Break Time")
         self.setMinimumSize(500, 600)
         self._setup_ui()
         self._load_settings()
+        if initial_tab:
+            self.select_tab(initial_tab)
 
-        # Timer para atualizar informações da próxima pausa
+        # Contagem da próxima pausa: calculada do prazo e rearmada para a
+        # próxima virada de segundo só enquanto o label está visível
         if self.timer_manager:
-            self.update_timer = QTimer(self)
-            self.update_timer.timeout.connect(self._update_next_break_info)
-            self.update_timer.start(1000)  # Atualiza a cada segundo
+            self.update_timer = self.timer_manager.scheduler.timer(
+                self._update_next_break_info, tolerance=0.05, name="diálogo: próxima pausa")
+            self.tabs.currentChanged.connect(lambda _: self._update_next_break_info())
             self._update_next_break_info()  # Atualização inicial
 
     def _setup_ui(self):
@@ -142,6 +168,7 @@ class SettingsDialog(QDialog):
 
         # Tabs
         tabs = QTabWidget()
+        self.tabs = tabs
 
         # Tab: Pausas
         breaks_tab = QWidget()
@@ -224,7 +251,10 @@ class SettingsDialog(QDialog):
         challenge_desc.setStyleSheet("color: gray; font-size: 11px;")
         challenge_layout.addWidget(challenge_desc)
 
-        self.challenge_list = QListWidget()
+        self.challenge_model = StringListModel(parent=self)
+        self.challenge_list = QListView()
+        self.challenge_list.setModel(self.challenge_model)
+        self.challenge_list.setUniformItemSizes(True)
         self.challenge_list.setMaximumHeight(100)
         challenge_layout.addWidget(self.challenge_list)
 
@@ -247,7 +277,7 @@ class SettingsDialog(QDialog):
         breaks_layout.addWidget(challenge_group)
 
         breaks_layout.addStretch()
-        tabs.addTab(breaks_tab, "Pausas")
+        tabs.addTab(breaks_tab, self.TAB_BREAKS)
 
         # Tab: Mensagens
         messages_tab = QWidget()
@@ -257,9 +287,12 @@ class SettingsDialog(QDialog):
         messages_layout.addWidget(messages_label)
 
         # Lista de mensagens
-        self.messages_list = QListWidget()
-        self.messages_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.messages_list.itemDoubleClicked.connect(self._edit_message)
+        self.messages_model = StringListModel(parent=self)
+        self.messages_list = QListView()
+        self.messages_list.setModel(self.messages_model)
+        self.messages_list.setUniformItemSizes(True)
+        self.messages_list.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.messages_list.doubleClicked.connect(self._edit_message)
         messages_layout.addWidget(self.messages_list)
 
         # Campo para adicionar/editar mensagem
@@ -289,7 +322,7 @@ class SettingsDialog(QDialog):
         tip_label.setStyleSheet("color: gray; font-size: 11px;")
         messages_layout.addWidget(tip_label)
 
-        tabs.addTab(messages_tab, "Mensagens")
+        tabs.addTab(messages_tab, self.TAB_MESSAGES)
 
         # Tab: Geral
         general_tab = QWidget()
@@ -318,19 +351,29 @@ class SettingsDialog(QDialog):
         self.water_reminder_spin.setSpecialValueText("Desativado")
         extras_layout.addRow("Lembrete de água:", self.water_reminder_spin)
 
+        self.idle_break_spin = QSpinBox()
+        self.idle_break_spin.setRange(0, 120)
+        self.idle_break_spin.setSuffix(" minutos")
+        self.idle_break_spin.setSpecialValueText("Desativado")
+        self.idle_break_spin.setToolTip(
+            "Ficar longe do computador por esse tempo conta como pausa:\n"
+            "a contagem para e a próxima pausa recomeça quando você voltar."
+        )
+        extras_layout.addRow("Pausa natural (ausência):", self.idle_break_spin)
+
         extras_group.setLayout(extras_layout)
         general_layout.addWidget(extras_group)
 
         general_layout.addStretch()
-        tabs.addTab(general_tab, "Geral")
+        tabs.addTab(general_tab, self.TAB_GENERAL)
 
         # Tab: TODOs
         todos_tab = self._setup_todos_tab()
-        tabs.addTab(todos_tab, "TODOs")
+        tabs.addTab(todos_tab, self.TAB_TODOS)
 
         # Tab: Pomodoro
         pomodoro_tab = self._setup_pomodoro_tab()
-        tabs.addTab(pomodoro_tab, "Pomodoro")
+        tabs.addTab(pomodoro_tab, self.TAB_POMODORO)
 
         layout.addWidget(tabs)
 
@@ -358,17 +401,13 @@ class SettingsDialog(QDialog):
         self.start_minimized_check.setChecked(self.settings.start_minimized)
         self.start_windows_check.setChecked(self.settings.start_with_windows)
         self.water_reminder_spin.setValue(self.settings.water_reminder_interval)
+        self.idle_break_spin.setValue(self.settings.idle_break_minutes)
         self.fixed_message_edit.setPlainText(self.settings.fixed_message)
 
-        # Carrega lista de mensagens
-        self.messages_list.clear()
-        for msg in self.settings.break_messages:
-            self.messages_list.addItem(msg)
-
-        # Carrega textos de desafio
-        self.challenge_list.clear()
-        for text in self.settings.skip_challenge_texts:
-            self.challenge_list.addItem(text)
+        # Mensagens e textos de desafio: os modelos editam as listas da cópia
+        # das configurações diretamente
+        self.messages_model.set_items(self.settings.break_messages)
+        self.challenge_model.set_items(self.settings.skip_challenge_texts)
 
     def _enforce_fixed_message_limit(self):
         """Limita o texto fixo a no máximo 6 linhas."""
@@ -388,47 +427,47 @@ class SettingsDialog(QDialog):
         """Adiciona uma nova mensagem à lista."""
         text = self.message_edit.toPlainText().strip()
         if text:
-            self.messages_list.addItem(text)
+            self.messages_model.append(text)
             self.message_edit.clear()
 
     def _update_message(self):
         """Atualiza a mensagem selecionada."""
-        current_item = self.messages_list.currentItem()
-        if current_item:
+        current = self.messages_list.currentIndex()
+        if current.isValid():
             text = self.message_edit.toPlainText().strip()
             if text:
-                current_item.setText(text)
+                self.messages_model.set_text(current.row(), text)
                 self.message_edit.clear()
 
     def _remove_message(self):
         """Remove a mensagem selecionada."""
-        current_row = self.messages_list.currentRow()
-        if current_row >= 0:
-            if self.messages_list.count() > 1:
-                self.messages_list.takeItem(current_row)
+        current = self.messages_list.currentIndex()
+        if current.isValid():
+            if self.messages_model.rowCount() > 1:
+                self.messages_model.remove(current.row())
             else:
                 QMessageBox.warning(
                     self, "Aviso",
                     "Deve haver pelo menos uma mensagem na lista."
                 )
 
-    def _edit_message(self, item: QListWidgetItem):
+    def _edit_message(self, index: QModelIndex):
         """Carrega a mensagem selecionada no campo de edição."""
-        self.message_edit.setPlainText(item.text())
+        self.message_edit.setPlainText(self.messages_model.text_at(index.row()))
 
     def _add_challenge_text(self):
         """Adiciona um novo texto de desafio."""
         text = self.challenge_edit.text().strip()
         if text:
-            self.challenge_list.addItem(text)
+            self.challenge_model.append(text)
             self.challenge_edit.clear()
 
     def _remove_challenge_text(self):
         """Remove o texto de desafio selecionado."""
-        current_row = self.challenge_list.currentRow()
-        if current_row >= 0:
-            if self.challenge_list.count() > 1:
-                self.challenge_list.takeItem(current_row)
+        current = self.challenge_list.currentIndex()
+        if current.isValid():
+            if self.challenge_model.rowCount() > 1:
+                self.challenge_model.remove(current.row())
             else:
                 QMessageBox.warning(
                     self, "Aviso",
@@ -440,8 +479,10 @@ class SettingsDialog(QDialog):
         # Verifica se os labels existem (só existem se timer_manager foi passado)
         if not hasattr(self, 'next_break_time_label'):
             return
+        self.update_timer.stop()
 
-        if not self.timer_manager or not self.timer_manager.is_running:
+        if (not self.timer_manager or not self.timer_manager.is_running
+                or not self.timer_manager.main_timer.is_active() and not self.timer_manager.is_on_break):
             self.next_break_time_label.setText("Timer pausado")
             self.time_remaining_label.setText("--:--")
             return
@@ -452,8 +493,8 @@ class SettingsDialog(QDialog):
             return
 
         # Obtém o tempo restante
-        remaining = self.timer_manager.get_time_until_break()
-        total_seconds = int(remaining.total_seconds())
+        remaining = self.timer_manager.get_time_until_break().total_seconds()
+        total_seconds = int(remaining)
 
         if total_seconds > 0:
             minutes = total_seconds // 60
@@ -469,12 +510,31 @@ class SettingsDialog(QDialog):
         else:
             self.next_break_time_label.setText("--:--")
 
+        # Próximo redesenho quando o segundo exibido mudar (aba visível apenas)
+        if total_seconds > 0 and self.next_break_time_label.isVisible():
+            self.update_timer.start((remaining % 1 or 1.0) + 0.01)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_next_break_info()
+
+    def hideEvent(self, event):
+        if hasattr(self, 'update_timer'):
+            self.update_timer.stop()
+        super().hideEvent(event)
+
     def closeEvent(self, event):
         """Chamado quando o diálogo é fechado."""
         if hasattr(self, 'update_timer'):
             self.update_timer.stop()
         super().closeEvent(event)
 
+    def done(self, result: int):
+        """OK/Cancelar não passam por closeEvent; o timer do agendador precisa parar."""
+        if hasattr(self, 'update_timer'):
+            self.update_timer.stop()
+        super().done(result)
+
     def _setup_todos_tab(self) -> QWidget:
         """Configura a aba de TODOs."""
         todos_tab = QWidget()
@@ -484,10 +544,14 @@ class SettingsDialog(QDialog):
         list_group = QGroupBox("Lista de TODOs")
         list_layout = QVBoxLayout()
 
-        self.todos_list = QListWidget()
-        self.todos_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.todos_list.itemDoubleClicked.connect(self._edit_todo)
-        self.todos_list.itemClicked.connect(self._on_todo_selected)
+        # O modelo edita a lista `_todos` no lugar e avisa a view linha a linha
+        self.todos_model = TodoListModel(self._todos, self)
+        self.todos_list = QListView()
+        self.todos_list.setModel(self.todos_model)
+        self.todos_list.setUniformItemSizes(True)
+        self.todos_list.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.todos_list.doubleClicked.connect(self._edit_todo)
+        self.todos_list.clicked.connect(self._on_todo_selected)
         list_layout.addWidget(self.todos_list)
 
         list_group.setLayout(list_layout)
@@ -549,29 +613,13 @@ class SettingsDialog(QDialog):
 
         layout.addStretch()
 
-        # Carrega TODOs existentes
-        self._load_todos()
-
         return todos_tab
 
     def _on_recurring_toggled(self, checked: bool):
         """Habilita/desabilita seleção de horário baseado em recorrência."""
         self.todo_time_edit.setEnabled(checked)
 
-    def _load_todos(self):
-        """Carrega TODOs na lista."""
-        self.todos_list.clear()
-        for todo in self._todos:
-            status_icon = "[OK]" if todo.status == TodoStatus.COMPLETED.value else "[  ]"
-            recurring_icon = "[R]" if todo.is_recurring else ""
-            time_str = f" {todo.scheduled_time}" if todo.scheduled_time else ""
-            display_text = f"{status_icon} {recurring_icon} {todo.title}{time_str}"
-
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.ItemDataRole.UserRole, todo.id)
-            self.todos_list.addItem(item)
-
-    def _on_todo_selected(self, item: QListWidgetItem):
+    def _on_todo_selected(self, index: QModelIndex):
         """Habilita botão de atualizar quando um TODO é selecionado."""
         self.update_todo_btn.setEnabled(True)
 
@@ -589,14 +637,13 @@ class SettingsDialog(QDialog):
             scheduled_time=self.todo_time_edit.time().toString("HH:mm") if self.todo_recurring_check.isChecked() else None
         )
 
-        self._todos.append(todo)
-        self._load_todos()
+        self.todos_model.append(todo)
         self._clear_todo_form()
 
     def _update_todo(self):
         """Atualiza o TODO selecionado."""
-        current_item = self.todos_list.currentItem()
-        if not current_item:
+        current = self.todos_list.currentIndex()
+        if not current.isValid():
             return
 
         title = self.todo_title_edit.text().strip()
@@ -604,43 +651,34 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(self, "Aviso", "O título é obrigatório.")
             return
 
-        todo_id = current_item.data(Qt.ItemDataRole.UserRole)
-        for todo in self._todos:
-            if todo.id == todo_id:
-                todo.title = title
-                todo.description = self.todo_description_edit.toPlainText().strip()
-                todo.is_recurring = self.todo_recurring_check.isChecked()
-                todo.scheduled_time = self.todo_time_edit.time().toString("HH:mm") if todo.is_recurring else None
-                break
-
-        self._load_todos()
+        todo = self.todos_model.todo_at(current.row())
+        todo.title = title
+        todo.description = self.todo_description_edit.toPlainText().strip()
+        todo.is_recurring = self.todo_recurring_check.isChecked()
+        todo.scheduled_time = self.todo_time_edit.time().toString("HH:mm") if todo.is_recurring else None
+        self.todos_model.todo_changed(current.row())
         self._clear_todo_form()
 
     def _remove_todo(self):
         """Remove o TODO selecionado."""
-        current_item = self.todos_list.currentItem()
-        if not current_item:
+        current = self.todos_list.currentIndex()
+        if not current.isValid():
             return
 
-        todo_id = current_item.data(Qt.ItemDataRole.UserRole)
-        self._todos = [t for t in self._todos if t.id != todo_id]
-        self._load_todos()
+        self.todos_model.remove(current.row())
         self._clear_todo_form()
 
-    def _edit_todo(self, item: QListWidgetItem):
+    def _edit_todo(self, index: QModelIndex):
         """Carrega TODO selecionado no formulário para edição."""
-        todo_id = item.data(Qt.ItemDataRole.UserRole)
-        for todo in self._todos:
-            if todo.id == todo_id:
-                self.todo_title_edit.setText(todo.title)
-                self.todo_description_edit.setPlainText(todo.description)
-                self.todo_recurring_check.setChecked(todo.is_recurring)
-                if todo.scheduled_time:
-                    h, m = map(int, todo.scheduled_time.split(':'))
-                    self.todo_time_edit.setTime(QTime(h, m))
-                self._editing_todo_id = todo_id
-                self.update_todo_btn.setEnabled(True)
-                break
+        todo = self.todos_model.todo_at(index.row())
+        self.todo_title_edit.setText(todo.title)
+        self.todo_description_edit.setPlainText(todo.description)
+        self.todo_recurring_check.setChecked(todo.is_recurring)
+        if todo.scheduled_time:
+            h, m = map(int, todo.scheduled_time.split(':'))
+            self.todo_time_edit.setTime(QTime(h, m))
+        self._editing_todo_id = todo.id
+        self.update_todo_btn.setEnabled(True)
 
     def _clear_todo_form(self):
         """Limpa o formulário de TODO."""
@@ -654,7 +692,14 @@ class SettingsDialog(QDialog):
 
     def get_todos(self) -> List[TodoItem]:
         """Retorna a lista de TODOs editada."""
-        return self._todos.copy()
+        return self.todos_model.todos().copy()
+
+    def select_tab(self, name: str):
+        """Mostra a aba com o nome informado (ver `TABS`)."""
+        for i in range(self.tabs.count()):
+            if self.tabs.tabText(i) == name:
+                self.tabs.setCurrentIndex(i)
+                return
 
     def _setup_pomodoro_tab(self) -> QWidget:
         """Configura a aba do Pomodoro."""
@@ -722,20 +767,15 @@ class SettingsDialog(QDialog):
         self.settings.start_minimized = self.start_minimized_check.isChecked()
         self.settings.start_with_windows = self.start_windows_check.isChecked()
         self.settings.water_reminder_interval = self.water_reminder_spin.value()
+        self.settings.idle_break_minutes = self.idle_break_spin.value()
 
         # Texto fixo (limita a 6 linhas como salvaguarda)
         fixed_text = self.fixed_message_edit.toPlainText()
         self.settings.fixed_message = "\n".join(fixed_text.split("\n")[:6])
 
-        # Coleta mensagens da lista
-        self.settings.break_messages = []
-        for i in range(self.messages_list.count()):
-            self.settings.break_messages.append(self.messages_list.item(i).text())
-
-        # Coleta textos de desafio
-        self.settings.skip_challenge_texts = []
-        for i in range(self.challenge_list.count()):
-            self.settings.skip_challenge_texts.append(self.challenge_list.item(i).text())
+        # Mensagens e textos de desafio já foram editados no lugar pelos modelos
+        self.settings.break_messages = self.messages_model.items()
+        self.settings.skip_challenge_texts = self.challenge_model.items()
 
         # Pomodoro settings
         self.settings.pomodoro_work_duration = self.pomodoro_work_spin.value()
@@ -749,27 +789,72 @@ class SettingsDialog(QDialog):
 class WsiBreakTimeApp:
     """Aplicação principal Wsi Break Time."""
 
+    PALETTE_REINDEX_THRESHOLD = 500  # TODOs alterados a partir dos quais a paleta reindexa tudo
+    DEBUG = bool(os.environ.get('WSI_BREAK_DEBUG'))  # Relatórios de diagnóstico no console
+
     def __init__(self):
-        self.settings_manager = SettingsManager()
+        self.settings_manager = SettingsManager(journal_mode=True)
         self.settings = self.settings_manager.settings
+        if self.DEBUG:
+            print(self.settings_manager.startup_report())
+
+        # Agendador único: todos os temporizadores da aplicação usam um só timer do sistema
+        self.scheduler = get_scheduler()
 
         # Componentes
-        self.timer = TimerManager()
+        self.timer = TimerManager(scheduler=self.scheduler)
         self.tray = TrayIcon()
         self.overlay = BreakOverlay()
         self.confirm_toast = ConfirmToast()
 
         # TODO Manager
-        self.todo_manager = TodoManager()
-        self.todo_manager.set_todos(self.settings_manager.get_todos())
+        self.todo_manager = TodoManager(scheduler=self.scheduler)
+        self.todo_manager.set_store(self.settings_manager.todo_store)
+        # Só o conjunto de trabalho fica em memória; o histórico é consultado no backend
+        self.todo_manager.set_todos(self.settings_manager.get_working_todos())
+        # O submenu de TODOs do tray consulta os pendentes só quando é aberto
+        self.tray.set_todos_source(self.todo_manager.get_pending_todos)
 
         # Pomodoro Manager
-        self.pomodoro = PomodoroManager()
-
-        # Timer para atualizar status no tray
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self._update_tray_status)
-        self.status_timer.setInterval(1000)
+        self.pomodoro = PomodoroManager(scheduler=self.scheduler)
+
+        # Detecção de ausência (pausa natural); None = plataforma sem backend
+        self.idle_monitor = IdleMonitor(create_idle_backend(), scheduler=self.scheduler)
+
+        # Histórico de pausas, Pomodoros e TODOs (base das estatísticas)
+        self.event_log = EventLogWriter(self.settings_manager.config_dir / 'events.bin', scheduler=self.scheduler)
+        # Estatísticas agregadas: relê só o que o log tem além do último salvamento
+        self.stats = StatsRollup(self.settings_manager.config_dir / 'stats.json')
+        self.stats.load()
+        self.stats.catch_up(self.event_log.path)
+        self.stats.attach(self.event_log)
+        self.event_recorder = EventRecorder(self.event_log, self.scheduler)
+        self.event_recorder.attach_timer(self.timer)
+        self.event_recorder.attach_pomodoro(self.pomodoro)
+        self.event_recorder.attach_todos(self.todo_manager)
+
+        # Paleta de comandos; o índice acompanha as mudanças de TODOs e textos
+        self.command_palette = CommandPalette()
+        self.command_palette.set_actions([
+            ('take_break', "Fazer pausa agora"),
+            ('start_pomodoro', "Iniciar Pomodoro"),
+        ])
+        self.command_palette.set_settings_tabs(SettingsDialog.TABS)
+        self.command_palette.set_todo_source(self.todo_manager.all_todos)
+
+        # Recarga automática de edições externas do config.json
+        self.config_watcher = ConfigWatcher(self.settings_manager.config_path, scheduler=self.scheduler)
+
+        # Status do tray sem polling: o texto sai dos prazos quando o menu vai
+        # abrir; só com o menu aberto a contagem é redesenhada a cada segundo
+        self.tray.set_status_source(self._tray_status_text)
+        self.menu_status_timer = self.scheduler.timer(
+            self.tray.refresh_status, interval=1.0, tolerance=0.25, name="status do tray (menu aberto)")
+        # Tooltip com granularidade de minuto, rearmado na virada do minuto
+        self.tooltip_timer = self.scheduler.timer(
+            self._update_tray_tooltip, tolerance=5.0, name="tooltip do tray")
+        # Depois dos listeners do timer e do Pomodoro: vê os prazos já reconciliados
+        self.scheduler.add_clock_listener(lambda event, seconds: self._refresh_tray_status())
 
         self._connect_signals()
         self._apply_settings()
@@ -789,21 +874,33 @@ class WsiBreakTimeApp:
         self.tray.resume_requested.connect(self._resume_timer)
         self.tray.take_break_now_requested.connect(self._take_break_now)
         self.tray.quit_requested.connect(self._quit)
+        self.tray.menu_visibility_changed.connect(self._on_tray_menu_visibility_changed)
 
         # Overlay -> App
         self.overlay.confirmed.connect(self._confirm_break)
 
         # TodoManager -> App
         self.todo_manager.todo_due.connect(self._on_todo_due)
+        self.todo_manager.todos_missed.connect(self._on_todos_missed)
         self.todo_manager.todos_changed.connect(self._on_todos_changed)
         self.todo_manager.verification_required.connect(self._on_verification_required)
+        self.todo_manager.todos_changeset.connect(self._on_todos_changeset)
 
         # Tray -> App (TODOs)
         self.tray.complete_todo_requested.connect(self._on_complete_todo_requested)
 
+        # Tray -> App (Perfis)
+        self.tray.profile_selected.connect(self._on_profile_selected)
+        self.tray.create_profile_requested.connect(self._create_profile)
+        self.tray.import_todos_requested.connect(self._import_todos)
+        self.tray.export_todos_requested.connect(self._export_todos)
+
+        # Paleta de comandos
+        self.tray.command_palette_requested.connect(self.command_palette.open_palette)
+        self.command_palette.activated.connect(self._on_palette_activated)
+
         # Pomodoro -> App
         self.pomodoro.state_changed.connect(self._on_pomodoro_state_changed)
-        self.pomodoro.tick.connect(self._on_pomodoro_tick)
         self.pomodoro.confirmation_needed.connect(self._on_pomodoro_confirmation_needed)
         self.pomodoro.reminder_notification.connect(self._on_pomodoro_reminder)
         self.pomodoro.pomodoro_started.connect(self._on_pomodoro_started)
@@ -816,20 +913,157 @@ class WsiBreakTimeApp:
         self.tray.confirm_pomodoro_cycle_requested.connect(self._confirm_pomodoro_cycle)
         self.tray.end_pomodoro_requested.connect(self._end_pomodoro)
 
-    def _apply_settings(self):
-        """Aplica as configurações ao timer, overlay e pomodoro."""
-        self.timer.configure(
-            break_interval=self.settings.break_interval,
-            pre_notification_seconds=self.settings.pre_notification_seconds if self.settings.show_pre_notification else 0,
-            water_interval=self.settings.water_reminder_interval
-        )
+        # ConfigWatcher -> App
+        self.config_watcher.changed.connect(self._on_config_file_changed)
+
+        # IdleMonitor -> App
+        self.idle_monitor.idle_started.connect(self._on_idle_started)
+        self.idle_monitor.idle_ended.connect(self._on_idle_ended)
+
+    def _apply_settings(self, changed: Optional[Set[str]] = None):
+        """
+        Aplica as configurações ao timer, overlay e pomodoro.
+        Com `changed`, reconfigura apenas os componentes afetados por esses campos.
+        """
+        apply_all = changed is None
+
+        if apply_all or changed & TIMER_FIELDS:
+            self.timer.configure(
+                break_interval=self.settings.break_interval,
+                pre_notification_seconds=self.settings.pre_notification_seconds if self.settings.show_pre_notification else 0,
+                water_interval=self.settings.water_reminder_interval
+            )
+            self._refresh_tray_status()
 
         # Configura Pomodoro
-        self.pomodoro.configure(
-            work_duration=self.settings.pomodoro_work_duration,
-            short_break_duration=self.settings.pomodoro_short_break,
-            long_break_duration=self.settings.pomodoro_long_break,
-            cycles_before_long_break=self.settings.pomodoro_cycles_before_long
+        if apply_all or changed & POMODORO_FIELDS:
+            self.pomodoro.configure(
+                work_duration=self.settings.pomodoro_work_duration,
+                short_break_duration=self.settings.pomodoro_short_break,
+                long_break_duration=self.settings.pomodoro_long_break,
+                cycles_before_long_break=self.settings.pomodoro_cycles_before_long
+            )
+
+        if apply_all or changed & IDLE_FIELDS:
+            self.idle_monitor.configure(self.settings.idle_break_minutes * 60)
+
+        # Mensagens e desafios são sorteados na próxima pausa; o texto fixo
+        # é atualizado na hora se a janela de confirmação estiver aberta
+        if not apply_all and 'fixed_message' in changed and self.overlay.isVisible():
+            self.overlay.set_fixed_message(self.settings.fixed_message)
+
+        # Índice da paleta de comandos (só as diferenças são reindexadas)
+        if apply_all or changed & OVERLAY_FIELDS:
+            self.command_palette.set_texts(KIND_MESSAGE, self.settings.break_messages)
+            self.command_palette.set_texts(KIND_CHALLENGE, self.settings.skip_challenge_texts)
+
+    def _on_config_file_changed(self):
+        """Recarrega o config.json editado fora da aplicação."""
+        changed = self.settings_manager.reload()
+        self.settings = self.settings_manager.settings
+        self._refresh_profiles_menu()
+        if changed:
+            self._apply_settings(changed)
+            self.tray.show_notification(
+                "Configurações recarregadas",
+                "As alterações no config.json foram aplicadas.",
+                QSystemTrayIcon.MessageIcon.Information,
+                3000
+            )
+
+    def _refresh_profiles_menu(self):
+        """Sincroniza o submenu de perfis com o SettingsManager."""
+        self.tray.set_profiles(self.settings_manager.profile_names(),
+                               self.settings_manager.active_profile)
+
+    def _on_profile_selected(self, name: str):
+        """Troca o perfil ativo aplicando apenas os campos que mudaram."""
+        changed = self.settings_manager.switch_profile(name)
+        self.settings = self.settings_manager.settings
+        self._apply_settings(changed)
+        self._refresh_profiles_menu()
+        self.tray.show_notification(
+            "Perfil alterado",
+            f"Perfil ativo: {name or 'Padrão'}",
+            QSystemTrayIcon.MessageIcon.Information,
+            3000
+        )
+
+    def _create_profile(self):
+        """Cria um novo perfil (inicialmente igual à base) e o ativa."""
+        name, ok = QInputDialog.getText(None, "Novo perfil", "Nome do perfil:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in self.settings_manager.profile_names():
+            QMessageBox.warning(None, "Aviso", "Já existe um perfil com esse nome.")
+            return
+        self.settings_manager.create_profile(name)
+        self._on_profile_selected(name)
+
+    # Importação/exportação de TODOs
+
+    TRANSFER_FILTER = "TODOs (*.jsonl *.csv);;JSON Lines (*.jsonl);;CSV (*.csv)"
+
+    def _transfer_progress(self, label: str):
+        """Cria um diálogo de progresso e o callback que o atualiza."""
+        dialog = QProgressDialog(label, None, 0, 1000)
+        dialog.setWindowTitle("Wsi Break Time")
+        dialog.setMinimumDuration(500)
+
+        def progress(count: int, fraction: Optional[float]):
+            if fraction is None:
+                dialog.setMaximum(0)  # Indeterminado
+            else:
+                dialog.setValue(int(fraction * 1000))
+            dialog.setLabelText(f"{label} ({count})")
+            QApplication.processEvents()
+
+        return dialog, progress
+
+    def _import_todos(self):
+        """Importa TODOs de um arquivo JSONL/CSV em uma única transação."""
+        path, _ = QFileDialog.getOpenFileName(None, "Importar TODOs", "", self.TRANSFER_FILTER)
+        if not path:
+            return
+        dialog, progress = self._transfer_progress("Importando TODOs...")
+        stats = ImportStats()
+        try:
+            # Uma gravação no backend e uma atualização do tray, qualquer que seja o tamanho
+            self.todo_manager.add_todos(read_todos(path, progress=progress, stats=stats))
+        except (OSError, ValueError) as e:
+            # A transação grava o que já foi lido: o usuário precisa saber da importação parcial
+            partial = f"\n\n{stats.read} TODOs lidos antes do erro foram importados." if stats.read else ""
+            QMessageBox.warning(None, "Erro", f"Não foi possível importar todos os TODOs:\n{e}{partial}")
+            return
+        finally:
+            dialog.close()
+        self.tray.show_notification(
+            "TODOs importados",
+            f"{stats.read} importados, {stats.skipped} ignorados",
+            QSystemTrayIcon.MessageIcon.Information,
+            5000
+        )
+
+    def _export_todos(self):
+        """Exporta os TODOs do backend para JSONL/CSV, sem carregar a lista inteira."""
+        path, _ = QFileDialog.getSaveFileName(None, "Exportar TODOs", "todos.jsonl", self.TRANSFER_FILTER)
+        if not path:
+            return
+        store = self.settings_manager.todo_store
+        dialog, progress = self._transfer_progress("Exportando TODOs...")
+        try:
+            count = export_todos(store.iter_dicts(), path, total=store.count(), progress=progress)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(None, "Erro", f"Não foi possível exportar os TODOs:\n{e}")
+            return
+        finally:
+            dialog.close()
+        self.tray.show_notification(
+            "TODOs exportados",
+            f"{count} TODOs exportados",
+            QSystemTrayIcon.MessageIcon.Information,
+            5000
         )
 
     def _get_random_message(self) -> str:
@@ -843,10 +1077,13 @@ class WsiBreakTimeApp:
         self.tray.show()
         self.timer.start()
         self.todo_manager.start()
-        self.status_timer.start()
+        self._refresh_tray_status()
+        self.config_watcher.start()
+        self.idle_monitor.start()
 
-        # Atualiza menu de TODOs
+        # Atualiza menus de TODOs e perfis
         self._on_todos_changed()
+        self._refresh_profiles_menu()
 
         # Notificação inicial
         self.tray.show_notification(
@@ -856,17 +1093,62 @@ class WsiBreakTimeApp:
             3000
         )
 
-    def _update_tray_status(self):
-        """Atualiza o status no menu do tray."""
-        # Não atualiza se Pomodoro estiver ativo (tem seu próprio status)
+    def _tray_status_text(self) -> str:
+        """Texto de status do menu, calculado dos prazos no momento da abertura."""
+        # Depois de uma suspensão o menu pode abrir antes do próximo despertar
+        self.scheduler.check_clocks()
         if self.pomodoro.is_active:
+            return f"Pomodoro: {self.pomodoro.get_status_text()}"
+        if self.timer.is_on_break:
+            return "Em pausa..."
+        if self.timer.is_idle:
+            return "Ausente (pausa natural)"
+        if not self.timer.main_timer.is_active():
+            return "Timer pausado"
+        remaining = int(self.timer.get_time_until_break().total_seconds())
+        return f"Próxima pausa em: {remaining // 60:02d}:{remaining % 60:02d}"
+
+    def _on_tray_menu_visibility_changed(self, visible: bool):
+        """Contagem ao vivo só enquanto o menu está aberto."""
+        if visible:
+            self.menu_status_timer.start()
+        else:
+            self.menu_status_timer.stop()
+
+    def _update_tray_tooltip(self):
+        """
+        Mostra no tooltip os minutos até a próxima transição e rearma para a
+        virada do minuto exibido. Estados sem contagem (pausado, em pausa,
+        aguardando confirmação) mantêm o tooltip definido pelo tray.
+        """
+        self.tooltip_timer.stop()
+        if self.timer.is_idle:
             return
+        if self.pomodoro.is_active:
+            phases = {
+                PomodoroState.WORKING: "Trabalho",
+                PomodoroState.SHORT_BREAK: "Pausa curta",
+                PomodoroState.LONG_BREAK: "Pausa longa",
+            }
+            phase = phases.get(self.pomodoro.state)
+            if phase is None:
+                return
+            remaining = self.pomodoro.time_remaining()
+            template = f"Pomodoro - {phase}: {{}} min restantes"
+        elif self.timer.is_on_break or not self.timer.main_timer.is_active():
+            return
+        else:
+            remaining = self.timer.main_timer.remaining()
+            template = "Wsi Break Time - Próxima pausa em {} min"
 
-        if not self.timer.is_on_break:
-            remaining = self.timer.get_time_until_break()
-            minutes = int(remaining.total_seconds() // 60)
-            seconds = int(remaining.total_seconds() % 60)
-            self.tray.update_status(f"{minutes:02d}:{seconds:02d}")
+        minutes = max(1, math.ceil(remaining / 60))
+        self.tray.set_tooltip(template.format(minutes))
+        self.tooltip_timer.start(max(1.0, remaining - (minutes - 1) * 60))
+
+    def _refresh_tray_status(self):
+        """Recalcula status e tooltip após uma mudança de estado."""
+        self.tray.refresh_status()
+        self._update_tray_tooltip()
 
     def _get_random_challenge_text(self) -> str:
         """Retorna um texto de desafio aleatório da lista."""
@@ -886,12 +1168,14 @@ class WsiBreakTimeApp:
             fixed_message=self.settings.fixed_message,
         )
         self.overlay.show_window()
+        self._refresh_tray_status()
 
     def _on_break_ended(self):
         """Chamado quando uma pausa termina."""
         self.overlay.hide()
         self.confirm_toast.hide()
         self.tray.set_break_state(False)
+        self._refresh_tray_status()
 
     def _on_confirmation_reminder(self):
         """Lembrete a cada 1 minuto enquanto a sessão não é confirmada."""
@@ -915,40 +1199,44 @@ class WsiBreakTimeApp:
             5000
         )
 
-    def _show_settings(self):
-        """Abre o diálogo de configurações."""
+    def _show_settings(self, tab: Optional[str] = None):
+        """Abre o diálogo de configurações, opcionalmente em uma aba."""
+        # O diálogo edita cópias (inclusive dos TODOs); só o que mudou é aplicado ao aceitar
         dialog = SettingsDialog(
-            self.settings,
+            copy.deepcopy(self.settings),
             self.timer,
-            todos=self.todo_manager.get_todos()
+            todos=[TodoItem.from_dict(t.to_dict()) for t in self.todo_manager.all_todos()],
+            initial_tab=tab
         )
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.settings = dialog.get_settings()
-            self.settings_manager.settings = self.settings
-            self.settings_manager.save()
-            self._apply_settings()
-
-            # Atualiza TODOs
-            self.todo_manager.set_todos(dialog.get_todos())
-            self.settings_manager.save_todos(self.todo_manager.get_todos())
-
-            # Reinicia o timer com novas configurações
-            was_running = self.timer.is_running
-            self.timer.stop()
-            if was_running:
-                self.timer.start()
+            changed = self.settings_manager.apply(dialog.get_settings())
+            self._apply_settings(changed)
+
+            self._apply_todo_edits(dialog.get_todos())
+
+    def _apply_todo_edits(self, edited: List[TodoItem]):
+        """
+        Aplica a lista editada no diálogo como diferença: só os TODOs
+        adicionados, alterados e removidos são gravados, em uma transação.
+        """
+        current = {todo.id: todo for todo in self.todo_manager.all_todos()}
+        edited_ids = {todo.id for todo in edited}
+        with self.todo_manager.batch():
+            self.todo_manager.remove_todos([i for i in current if i not in edited_ids])
+            self.todo_manager.update_todos([t for t in edited if t.id in current and t != current[t.id]])
+            self.todo_manager.add_todos([t for t in edited if t.id not in current])
 
     def _pause_timer(self):
         """Pausa o timer."""
         self.timer.pause()
         self.tray.set_paused_state(True)
-        self.status_timer.stop()
+        self._refresh_tray_status()
 
     def _resume_timer(self):
         """Retoma o timer."""
         self.timer.resume()
         self.tray.set_paused_state(False)
-        self.status_timer.start()
+        self._refresh_tray_status()
 
     def _confirm_break(self):
         """Confirma a sessão e encerra a pausa atual."""
@@ -966,15 +1254,26 @@ class WsiBreakTimeApp:
         """Encerra a aplicação."""
         self.timer.stop()
         self.todo_manager.stop()
-        self.status_timer.stop()
+        self.menu_status_timer.stop()
+        self.tooltip_timer.stop()
+        self.config_watcher.stop()
+        self.idle_monitor.stop()
         self.overlay.force_close()
         self.confirm_toast.close()
+        self.command_palette.close()
         self.tray.hide()
+        self.event_log.close()
+        self.settings_manager.close()
+        if self.DEBUG:
+            print(self.scheduler.report())
         QApplication.quit()
 
     def _on_todo_due(self, todo: TodoItem):
         """Chamado quando um TODO está pendente no horário."""
-        time_str = f" - {todo.scheduled_time}" if todo.scheduled_time else ""
+        if todo.recurrence is not None:
+            time_str = f" - {todo.recurrence.describe()}"
+        else:
+            time_str = f" - {todo.scheduled_time}" if todo.scheduled_time else ""
         recurring_str = " (recorrente)" if todo.is_recurring else ""
         self.tray.show_notification(
             "TODO Pendente",
@@ -983,13 +1282,21 @@ class WsiBreakTimeApp:
             5000
         )
 
-    def _on_todos_changed(self):
-        """Atualiza o menu do tray quando TODOs mudam."""
-        pending = self.todo_manager.get_pending_todos()
-        self.tray.update_todos_menu(pending)
+    def _on_todos_missed(self, todos: List[TodoItem]):
+        """TODOs que venceram durante a suspensão: uma única notificação."""
+        titles = ", ".join(todo.title for todo in todos[:3])
+        more = f" e mais {len(todos) - 3}" if len(todos) > 3 else ""
+        self.tray.show_notification(
+            f"{len(todos)} TODOs Pendentes",
+            f"{titles}{more}",
+            QSystemTrayIcon.MessageIcon.Information,
+            5000
+        )
 
-        # Persiste alterações
-        self.settings_manager.save_todos(self.todo_manager.get_todos())
+    def _on_todos_changed(self):
+        """Marca o menu de TODOs do tray para ser refeito na próxima abertura."""
+        # As alterações já foram gravadas no backend pelo TodoManager
+        self.tray.invalidate_todos_menu()
 
     def _on_verification_required(self, todo: TodoItem, code: str):
         """Exibe diálogo de verificação para TODO recorrente."""
@@ -1002,6 +1309,66 @@ class WsiBreakTimeApp:
         """Usuário solicitou completar um TODO via menu do tray."""
         self.todo_manager.request_completion(todo_id)
 
+    def _on_todos_changeset(self, changes):
+        """Mantém o índice da paleta de comandos em dia com os TODOs."""
+        # Lotes grandes (ex.: importação) reindexam sob demanda, sem buscar o
+        # histórico no backend item a item
+        if changes.reloaded or len(changes.added) + len(changes.updated) > self.PALETTE_REINDEX_THRESHOLD:
+            self.command_palette.reset_todos()
+            return
+        for todo_id in changes.removed:
+            self.command_palette.remove_todo(todo_id)
+        for todo_id in changes.added | changes.updated:
+            todo = self.todo_manager.get_todo(todo_id)
+            if todo is not None:
+                self.command_palette.update_todo(todo)
+
+    def _on_palette_activated(self, kind: str, payload):
+        """Executa o resultado escolhido na paleta de comandos."""
+        if kind == KIND_ACTION:
+            if payload == 'take_break' and not self.tray.is_on_break:
+                self._take_break_now()
+            elif payload == 'start_pomodoro':
+                self._start_pomodoro()
+        elif kind == KIND_SETTINGS:
+            self._show_settings(payload)
+        elif kind == KIND_TODO:
+            # Pendentes são concluídos; os demais abrem a aba de TODOs
+            todo = self.todo_manager.get_todo(payload)
+            if todo is not None and todo.state is TodoStatus.PENDING:
+                self.todo_manager.request_completion(payload)
+            else:
+                self._show_settings(SettingsDialog.TAB_TODOS)
+        elif kind == KIND_MESSAGE:
+            self._show_settings(SettingsDialog.TAB_MESSAGES)
+        elif kind == KIND_CHALLENGE:
+            self._show_settings(SettingsDialog.TAB_BREAKS)
+
+    def _on_idle_started(self, idle_seconds: float):
+        """Usuário ausente: conta como pausa natural e para tudo que é periódico."""
+        self.timer.enter_idle()
+        self.pomodoro.suspend()
+        self._refresh_tray_status()
+        # Sem vigia: a volta do usuário (ou da suspensão) é avisada pelo IdleMonitor
+        self.scheduler.stop_watchdog()
+
+    def _on_idle_ended(self, away_seconds: float):
+        """Usuário voltou: retoma os temporizadores, com a próxima pausa contando do zero."""
+        self.scheduler.start_watchdog()
+        self.timer.exit_idle()
+        self.pomodoro.resume(away_seconds)
+        self.event_recorder.record_idle_break(away_seconds)
+        self._refresh_tray_status()
+
+        if self.timer.main_timer.is_active():
+            self.tray.show_notification(
+                "Pausa natural",
+                f"Você ficou {int(away_seconds // 60)} minutos ausente. "
+                f"Próxima pausa em {self.settings.break_interval} minutos.",
+                QSystemTrayIcon.MessageIcon.Information,
+                3000
+            )
+
     # Métodos do Pomodoro
     def _start_pomodoro(self):
         """Inicia o modo Pomodoro."""
@@ -1010,7 +1377,6 @@ class WsiBreakTimeApp:
 
         # Pausa o timer regular
         self.timer.pause()
-        self.status_timer.stop()
 
         # Inicia o Pomodoro
         self.pomodoro.start()
@@ -1026,11 +1392,12 @@ class WsiBreakTimeApp:
         # Retoma o timer regular
         self.timer.resume()
         self.tray.set_paused_state(False)
-        self.status_timer.start()
+        self._refresh_tray_status()
 
     def _on_pomodoro_started(self):
         """Chamado quando o Pomodoro inicia."""
         self.tray.set_pomodoro_state(active=True, waiting_confirmation=False)
+        self._refresh_tray_status()
         self.tray.show_notification(
             "Pomodoro Iniciado",
             f"Período de trabalho: {self.settings.pomodoro_work_duration} minutos. Foco!",
@@ -1041,6 +1408,7 @@ class WsiBreakTimeApp:
     def _on_pomodoro_ended(self):
         """Chamado quando o Pomodoro é encerrado."""
         self.tray.set_pomodoro_state(active=False)
+        self._refresh_tray_status()
         self.tray.show_notification(
             "Pomodoro Encerrado",
             f"Você completou {self.pomodoro.cycles_completed} ciclo(s). Bom trabalho!",
@@ -1056,10 +1424,7 @@ class WsiBreakTimeApp:
             waiting_confirmation=is_waiting,
             status_text=self.pomodoro.get_status_text()
         )
-
-    def _on_pomodoro_tick(self, seconds_remaining: int):
-        """Atualiza o status a cada segundo durante o Pomodoro."""
-        self.tray.update_pomodoro_status(self.pomodoro.get_status_text())
+        self._refresh_tray_status()
 
     def _on_pomodoro_confirmation_needed(self, message: str):
         """Chamado quando precisa confirmação do usuário."""
@@ -0,0 +1,245 @@
+"""
+Redução de séries para gráficos, sem Qt.
+Uma série com milhões de pontos é reduzida à largura em pixels com LTTB
+(Largest-Triangle-Three-Buckets). Os baldes seguem uma grade fixa por nível
+de zoom (potências de 2), em blocos cacheados: arrastar o gráfico só
+calcula os blocos que entram na tela, e voltar a um trecho já visto não
+calcula nada. NumPy acelera os cálculos quando está instalado.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional
+    np = None
+
+
+TILE_BUCKETS = 256  # baldes por bloco cacheado
+MAX_TILES = 96  # blocos no cache (LRU), somando todos os níveis
+
+
+def _lttb_python(xs, ys, bounds: Sequence[int], before: int, after: int):
+    """
+    LTTB sobre baldes já delimitados (`bounds[j]:bounds[j + 1]` são os
+    índices do balde j). `before`/`after` são os pontos vizinhos fora do
+    bloco (-1 se não há), usados como âncora do primeiro balde e como
+    terceiro vértice do último. Retorna os índices escolhidos.
+    """
+    buckets = [(bounds[j], bounds[j + 1]) for j in range(len(bounds) - 1) if bounds[j + 1] > bounds[j]]
+    averages = []
+    for start, end in buckets:
+        count = end - start
+        averages.append((sum(xs[start:end]) / count, sum(ys[start:end]) / count))
+    selected = []
+    anchor = before
+    for k, (start, end) in enumerate(buckets):
+        if k + 1 < len(buckets):
+            cx, cy = averages[k + 1]
+        elif after >= 0:
+            cx, cy = xs[after], ys[after]
+        else:
+            selected.append(end - 1)  # Último ponto da série: sempre mantido
+            break
+        if anchor < 0:
+            selected.append(start)  # Primeiro ponto da série: sempre mantido
+            anchor = start
+            continue
+        ax, ay = xs[anchor], ys[anchor]
+        dx, dy = ax - cx, cy - ay
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs(dx * (ys[i] - ay) - (ax - xs[i]) * dy)
+            if area > best_area:
+                best, best_area = i, area
+        selected.append(best)
+        anchor = best
+    return selected
+
+
+def _lttb_numpy(xs, ys, bounds, before: int, after: int):
+    """Mesmo algoritmo de `_lttb_python`, com cada balde calculado de uma vez no NumPy."""
+    bounds = np.asarray(bounds)
+    nonempty = np.flatnonzero(bounds[1:] > bounds[:-1])
+    starts = bounds[:-1][nonempty]
+    ends = bounds[1:][nonempty]
+    first, last = int(bounds[0]), int(bounds[-1])
+    sum_x = np.concatenate(([0.0], np.cumsum(xs[first:last])))
+    sum_y = np.concatenate(([0.0], np.cumsum(ys[first:last])))
+    counts = ends - starts
+    avg_x = ((sum_x[ends - first] - sum_x[starts - first]) / counts).tolist()
+    avg_y = ((sum_y[ends - first] - sum_y[starts - first]) / counts).tolist()
+    starts = starts.tolist()
+    ends = ends.tolist()
+
+    selected = []
+    anchor = before
+    for k in range(len(starts)):
+        start, end = starts[k], ends[k]
+        if k + 1 < len(starts):
+            cx, cy = avg_x[k + 1], avg_y[k + 1]
+        elif after >= 0:
+            cx, cy = float(xs[after]), float(ys[after])
+        else:
+            selected.append(end - 1)
+            break
+        if anchor < 0:
+            selected.append(start)
+            anchor = start
+            continue
+        if end - start == 1:
+            selected.append(start)
+            anchor = start
+            continue
+        ax, ay = float(xs[anchor]), float(ys[anchor])
+        areas = np.abs((ax - cx) * (ys[start:end] - ay) - (ax - xs[start:end]) * (cy - ay))
+        anchor = start + int(areas.argmax())
+        selected.append(anchor)
+    return selected
+
+
+class ChartSeries:
+    """
+    Série (x crescente, y) com níveis de detalhe cacheados.
+
+    No nível `z`, o balde tem largura `base_width * 2**z` (em unidades de x)
+    e começa em `x0 + j * largura`, numa grade fixa; cada bloco de
+    `TILE_BUCKETS` baldes é reduzido por LTTB uma única vez. `visible()`
+    escolhe o nível pela largura do viewport em pixels e junta os blocos
+    que o cobrem, ou devolve os pontos originais quando já cabem na tela.
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]):
+        if len(xs) != len(ys):
+            raise ValueError("xs e ys com tamanhos diferentes")
+        if np is not None:
+            self.xs = np.ascontiguousarray(xs, dtype=np.float64)
+            self.ys = np.ascontiguousarray(ys, dtype=np.float64)
+        else:
+            self.xs = array('d', xs)
+            self.ys = array('d', ys)
+        count = len(self.xs)
+        self.x0 = float(self.xs[0]) if count else 0.0
+        self.x1 = float(self.xs[-1]) if count else 0.0
+        if count:
+            self.y_min = float(self.ys.min() if np is not None else min(self.ys))
+            self.y_max = float(self.ys.max() if np is not None else max(self.ys))
+        else:
+            self.y_min = self.y_max = 0.0
+        # Largura do balde no nível 0: o espaçamento médio entre pontos
+        self.base_width = (self.x1 - self.x0) / (count - 1) if count > 1 else 1.0
+        if self.base_width <= 0:
+            self.base_width = 1.0
+        self._tiles: 'OrderedDict[Tuple[int, int], tuple]' = OrderedDict()
+
+        # Estatísticas
+        self.tiles_built = 0
+        self.tile_hits = 0
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def _search(self, value: float) -> int:
+        if np is not None:
+            return int(np.searchsorted(self.xs, value, 'left'))
+        return bisect_left(self.xs, value)
+
+    def level_for(self, span: float, pixels: int) -> int:
+        """Nível de zoom com cerca de um balde por pixel (0 = pontos originais)."""
+        if span <= 0 or pixels <= 0:
+            return 0
+        return max(0, math.ceil(math.log2(span / pixels / self.base_width)))
+
+    def visible(self, x_start: float, x_end: float, pixels: int):
+        """
+        (xs, ys) a desenhar em [x_start, x_end] com `pixels` de largura,
+        incluindo um ponto além de cada borda para a linha não ser cortada.
+        """
+        count = len(self.xs)
+        if not count or x_end <= x_start:
+            return self.xs[:0], self.ys[:0]
+        first = max(0, self._search(x_start) - 1)
+        last = min(count, self._search(x_end) + 1)
+        level = self.level_for(x_end - x_start, pixels)
+        if level == 0 or last - first <= 2 * pixels:
+            return self.xs[first:last], self.ys[first:last]
+
+        width = self.base_width * 2 ** level
+        tile_width = width * TILE_BUCKETS
+        first_tile = math.floor((x_start - self.x0) / tile_width)
+        last_tile = math.floor((x_end - self.x0) / tile_width)
+        parts = [self._tile(level, tile) for tile in range(first_tile - 1, last_tile + 2)]
+        parts = [part for part in parts if len(part[0])]
+        if not parts:
+            return self.xs[:0], self.ys[:0]
+        if np is not None:
+            xs = np.concatenate([part[0] for part in parts])
+            ys = np.concatenate([part[1] for part in parts])
+            lo = max(0, int(np.searchsorted(xs, x_start, 'left')) - 1)
+            hi = min(len(xs), int(np.searchsorted(xs, x_end, 'left')) + 1)
+        else:
+            xs = array('d')
+            ys = array('d')
+            for part_x, part_y in parts:
+                xs.extend(part_x)
+                ys.extend(part_y)
+            lo = max(0, bisect_left(xs, x_start) - 1)
+            hi = min(len(xs), bisect_left(xs, x_end) + 1)
+        return xs[lo:hi], ys[lo:hi]
+
+    def _tile(self, level: int, tile: int):
+        """Pontos escolhidos por LTTB no bloco `tile` do nível `level` (cacheado, LRU)."""
+        key = (level, tile)
+        cached = self._tiles.get(key)
+        if cached is not None:
+            self._tiles.move_to_end(key)
+            self.tile_hits += 1
+            return cached
+
+        width = self.base_width * 2 ** level
+        start_x = self.x0 + tile * TILE_BUCKETS * width
+        count = len(self.xs)
+        if np is not None:
+            edges = start_x + width * np.arange(TILE_BUCKETS + 1)
+            bounds = np.searchsorted(self.xs, edges, 'left')
+            lo, hi = int(bounds[0]), int(bounds[-1])
+        else:
+            bounds = [bisect_left(self.xs, start_x + width * j) for j in range(TILE_BUCKETS + 1)]
+            lo, hi = bounds[0], bounds[-1]
+        if lo == hi:
+            indices = []
+        else:
+            before = lo - 1  # Âncora: ponto anterior ao bloco (independe dos outros blocos)
+            after = hi if hi < count else -1
+            lttb = _lttb_numpy if np is not None else _lttb_python
+            indices = lttb(self.xs, self.ys, bounds, before, after)
+
+        if np is not None:
+            index = np.asarray(indices, dtype=np.int64)
+            result = (self.xs[index], self.ys[index])
+        else:
+            result = (array('d', (self.xs[i] for i in indices)), array('d', (self.ys[i] for i in indices)))
+        self._tiles[key] = result
+        self.tiles_built += 1
+        if len(self._tiles) > MAX_TILES:
+            self._tiles.popitem(last=False)
+        return result
+
+    def clear_cache(self):
+        self._tiles.clear()
+
+    def nearest(self, x: float) -> Optional[int]:
+        """Índice do ponto original mais próximo de `x` (None se a série está vazia)."""
+        count = len(self.xs)
+        if not count:
+            return None
+        i = self._search(x)
+        if i >= count:
+            return count - 1
+        if i > 0 and x - self.xs[i - 1] <= self.xs[i] - x:
+            return i - 1
+        return i
@@ -0,0 +1,318 @@
+"""
+Gráfico de linhas para o painel de estatísticas.
+Desenha séries com milhões de pontos reduzindo cada uma à largura da tela
+(`chart_core.ChartSeries`, LTTB em blocos cacheados). O fundo (moldura,
+grade e eixo Y) e o traçado ficam em QPixmaps reaproveitados entre
+repinturas; só o cursor de leitura é desenhado a cada movimento do mouse.
+Arrastar move o gráfico, a roda do mouse aplica zoom e o duplo clique
+mostra a série inteira.
+"""
+
+import math
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QPointF, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+from chart_core import ChartSeries, np
+
+
+# Passos do eixo de tempo (segundos) e formato do rótulo de cada um
+TIME_STEPS = (
+    (60, '%H:%M'), (300, '%H:%M'), (900, '%H:%M'), (1800, '%H:%M'), (3600, '%H:%M'),
+    (3 * 3600, '%d/%m %Hh'), (6 * 3600, '%d/%m %Hh'), (12 * 3600, '%d/%m %Hh'),
+    (86400, '%d/%m'), (7 * 86400, '%d/%m'), (30 * 86400, '%m/%Y'),
+    (91 * 86400, '%m/%Y'), (365 * 86400, '%Y'),
+)
+MIN_TICK_SPACING = 90  # pixels entre rótulos do eixo X
+
+
+def _nice_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """Marcas em passos 1-2-5 cobrindo [low, high]."""
+    span = high - low
+    if span <= 0:
+        return [low]
+    raw = span / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    first = math.ceil(low / step) * step
+    return [first + i * step for i in range(int((high - first) / step) + 1)]
+
+
+def _format_number(value: float) -> str:
+    if abs(value) >= 1000:
+        return f"{value / 1000:.1f}k"
+    return f"{value:g}"
+
+
+class ChartWidget(QWidget):
+    """Gráfico de linhas com pan/zoom e níveis de detalhe por série."""
+
+    view_changed = pyqtSignal(float, float)  # início e fim do eixo X visível
+
+    MARGIN_LEFT = 56
+    MARGIN_TOP = 12
+    MARGIN_RIGHT = 16
+    MARGIN_BOTTOM = 28
+    ZOOM_STEP = 0.8  # fator por "clique" da roda
+    MIN_POINTS = 8  # zoom máximo: cerca de 8 pontos (espaçamento médio) visíveis
+
+    def __init__(self, parent=None, time_axis: bool = True):
+        super().__init__(parent)
+        self.time_axis = time_axis
+        self._series: List[Tuple[ChartSeries, QColor, str]] = []
+        self._series_version = 0
+        self._view = (0.0, 1.0)
+        self._bounds = (0.0, 1.0)
+        self._min_span = 1.0
+        self._y_range = (0.0, 1.0)
+        self._background: Optional[QPixmap] = None
+        self._background_key = None
+        self._plot: Optional[QPixmap] = None
+        self._plot_key = None
+        self._drag_from: Optional[Tuple[float, Tuple[float, float]]] = None
+        self._hover_x: Optional[float] = None
+
+        # Estatísticas
+        self.frames = 0
+        self.plot_renders = 0
+        self.background_renders = 0
+
+        self.setMouseTracking(True)
+        self.setMinimumSize(320, 180)
+
+    # Séries e viewport
+
+    def add_series(self, xs: Sequence[float], ys: Sequence[float],
+                   color: str = '#1565C0', name: str = "") -> ChartSeries:
+        """Adiciona uma série (x crescente) e ajusta os limites do gráfico."""
+        series = ChartSeries(xs, ys)
+        self._series.append((series, QColor(color), name))
+        self._series_version += 1
+        self._update_bounds()
+        return series
+
+    def clear_series(self):
+        self._series.clear()
+        self._series_version += 1
+        self._update_bounds()
+
+    def _update_bounds(self):
+        filled = [s for s, _, _ in self._series if len(s)]
+        if not filled:
+            self._bounds = (0.0, 1.0)
+            self._min_span = 1.0
+            self._y_range = (0.0, 1.0)
+        else:
+            self._bounds = (min(s.x0 for s in filled), max(s.x1 for s in filled))
+            self._min_span = min(s.base_width for s in filled) * self.MIN_POINTS
+            low = min(s.y_min for s in filled)
+            high = max(s.y_max for s in filled)
+            pad = (high - low) * 0.05 or 1.0
+            self._y_range = (low - pad, high + pad)
+        self.fit()
+
+    def view(self) -> Tuple[float, float]:
+        return self._view
+
+    def set_view(self, x_start: float, x_end: float):
+        """Mostra [x_start, x_end], limitado ao intervalo dos dados."""
+        low, high = self._bounds
+        span = min(max(x_end - x_start, self._min_span), max(high - low, self._min_span))
+        x_start = min(max(x_start, low), max(low, high - span))
+        view = (x_start, x_start + span)
+        if view == self._view:
+            return
+        self._view = view
+        self.view_changed.emit(*view)
+        self.update()
+
+    def fit(self):
+        """Mostra todas as séries."""
+        self.set_view(*self._bounds)
+
+    def zoom(self, factor: float, anchor_x: Optional[float] = None):
+        """Aplica zoom (factor < 1 aproxima) mantendo `anchor_x` no mesmo lugar da tela."""
+        start, end = self._view
+        if anchor_x is None:
+            anchor_x = (start + end) / 2
+        self.set_view(anchor_x - (anchor_x - start) * factor, anchor_x + (end - anchor_x) * factor)
+
+    def pan(self, dx: float):
+        """Desloca o viewport `dx` unidades do eixo X."""
+        start, end = self._view
+        self.set_view(start + dx, end + dx)
+
+    # Coordenadas
+
+    def plot_rect(self) -> QRectF:
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(1, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+                      max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+    def _x_to_data(self, px: float) -> float:
+        rect = self.plot_rect()
+        start, end = self._view
+        return start + (px - rect.left()) / rect.width() * (end - start)
+
+    # Desenho
+
+    def _new_pixmap(self) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+    def _render_background(self) -> QPixmap:
+        """Moldura, grade horizontal e eixo Y (não dependem do viewport X)."""
+        self.background_renders += 1
+        pixmap = self._new_pixmap()
+        pixmap.fill(QColor('#FFFFFF'))
+        painter = QPainter(pixmap)
+        rect = self.plot_rect()
+        low, high = self._y_range
+        painter.setFont(QFont("Segoe UI", 8))
+        for tick in _nice_ticks(low, high):
+            y = rect.bottom() - (tick - low) / (high - low) * rect.height()
+            painter.setPen(QPen(QColor('#EEEEEE'), 1))
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+            painter.setPen(QColor('#707070'))
+            painter.drawText(QRectF(0, y - 8, self.MARGIN_LEFT - 6, 16),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             _format_number(tick))
+        painter.setPen(QPen(QColor('#BDBDBD'), 1))
+        painter.drawRect(rect)
+        painter.end()
+        return pixmap
+
+    def _x_ticks(self) -> List[Tuple[float, str]]:
+        start, end = self._view
+        rect = self.plot_rect()
+        wanted = (end - start) * MIN_TICK_SPACING / rect.width()
+        if not self.time_axis:
+            return [(t, _format_number(t)) for t in _nice_ticks(start, end, max(1, int(rect.width() // MIN_TICK_SPACING)))]
+        step, fmt = next(((s, f) for s, f in TIME_STEPS if s >= wanted), TIME_STEPS[-1])
+        if wanted > step:
+            step = math.ceil(wanted / step) * step
+        # Alinha as marcas à meia-noite local (o deslocamento do fuso no início do viewport)
+        offset = datetime.fromtimestamp(start).astimezone().utcoffset().total_seconds()
+        tick = math.ceil((start + offset) / step) * step - offset
+        ticks = []
+        while tick <= end:
+            ticks.append((tick, datetime.fromtimestamp(tick).strftime(fmt)))
+            tick += step
+        return ticks
+
+    def _render_plot(self) -> QPixmap:
+        """Eixo X e séries do viewport atual, sobre fundo transparente."""
+        self.plot_renders += 1
+        pixmap = self._new_pixmap()
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        rect = self.plot_rect()
+        start, end = self._view
+        scale_x = rect.width() / (end - start)
+        low, high = self._y_range
+        scale_y = rect.height() / (high - low)
+
+        painter.setFont(QFont("Segoe UI", 8))
+        for tick, label in self._x_ticks():
+            x = rect.left() + (tick - start) * scale_x
+            painter.setPen(QPen(QColor('#F3F3F3'), 1))
+            painter.drawLine(QPointF(x, rect.top() + 1), QPointF(x, rect.bottom() - 1))
+            painter.setPen(QColor('#707070'))
+            painter.drawText(QRectF(x - 60, rect.bottom() + 4, 120, 16), Qt.AlignmentFlag.AlignHCenter, label)
+
+        painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pixels = max(1, round(rect.width()))
+        for series, color, _ in self._series:
+            xs, ys = series.visible(start, end, pixels)
+            if len(xs) < 2:
+                continue
+            if np is not None:
+                px = ((xs - start) * scale_x + rect.left()).tolist()
+                py = (rect.bottom() - (ys - low) * scale_y).tolist()
+            else:
+                px = [(x - start) * scale_x + rect.left() for x in xs]
+                py = [rect.bottom() - (y - low) * scale_y for y in ys]
+            painter.setPen(QPen(color, 1.5))
+            painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(px, py)]))
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        self.frames += 1
+        size = (self.width(), self.height(), self.devicePixelRatioF())
+        background_key = (size, self._y_range)
+        if self._background is None or self._background_key != background_key:
+            self._background = self._render_background()
+            self._background_key = background_key
+        plot_key = (size, self._view, self._series_version)
+        if self._plot is None or self._plot_key != plot_key:
+            self._plot = self._render_plot()
+            self._plot_key = plot_key
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background)
+        painter.drawPixmap(0, 0, self._plot)
+        if self._hover_x is not None:
+            self._draw_hover(painter)
+        painter.end()
+
+    def _draw_hover(self, painter: QPainter):
+        """Linha vertical no cursor e o valor do ponto mais próximo de cada série."""
+        rect = self.plot_rect()
+        if not rect.left() <= self._hover_x <= rect.right():
+            return
+        painter.setPen(QPen(QColor('#9E9E9E'), 1, Qt.PenStyle.DashLine))
+        painter.drawLine(QPointF(self._hover_x, rect.top()), QPointF(self._hover_x, rect.bottom()))
+        x = self._x_to_data(self._hover_x)
+        parts = []
+        for series, color, name in self._series:
+            index = series.nearest(x)
+            if index is not None:
+                value = _format_number(round(float(series.ys[index]), 2))
+                parts.append(f"{name}: {value}" if name else value)
+        if not parts:
+            return
+        when = datetime.fromtimestamp(x).strftime('%d/%m/%Y %H:%M') if self.time_axis else _format_number(x)
+        painter.setPen(QColor('#424242'))
+        painter.setFont(QFont("Segoe UI", 8))
+        painter.drawText(QRectF(rect.left() + 6, rect.top() + 4, rect.width() - 12, 16),
+                         Qt.AlignmentFlag.AlignLeft, f"{when}  " + "  ".join(parts))
+
+    # Interação
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_from = (event.position().x(), self._view)
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        x = event.position().x()
+        if self._drag_from is not None:
+            origin, (start, end) = self._drag_from
+            dx = (origin - x) / self.plot_rect().width() * (end - start)
+            self.set_view(start + dx, end + dx)
+        self._hover_x = x
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_from = None
+            self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom(self.ZOOM_STEP ** steps, self._x_to_data(event.position().x()))
+
+    def leaveEvent(self, event):
+        self._hover_x = None
+        self.update()
@@ -0,0 +1,163 @@
+"""
+Paleta de comandos (busca rápida).
+Busca incremental sobre ações, abas das configurações, TODOs, mensagens de
+pausa e textos de desafio; o resultado escolhido é repassado à aplicação.
+"""
+
+from typing import Callable, Iterable, Optional
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QKeyEvent
+
+from search_index import SearchIndex
+from todo_model import TodoItem, TodoStatus
+
+
+# Tipos de entrada (ordem = prioridade no desempate)
+KIND_ACTION = 'action'
+KIND_SETTINGS = 'settings'
+KIND_TODO = 'todo'
+KIND_MESSAGE = 'message'
+KIND_CHALLENGE = 'challenge'
+
+KIND_LABELS = {
+    KIND_ACTION: "Ação",
+    KIND_SETTINGS: "Configurações",
+    KIND_TODO: "TODO",
+    KIND_MESSAGE: "Mensagem",
+    KIND_CHALLENGE: "Desafio",
+}
+
+MAX_RESULTS = 20
+_TODO_TEXT_CHARS = 200  # Trecho da descrição indexado junto com o título
+
+
+class CommandPalette(QDialog):
+    """Janela de busca rápida com o índice mantido em memória."""
+
+    # Emite (tipo, payload) do resultado escolhido
+    activated = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = SearchIndex(kind_order=(KIND_ACTION, KIND_SETTINGS, KIND_TODO,
+                                             KIND_MESSAGE, KIND_CHALLENGE))
+        self.setWindowTitle("Busca rápida - Wsi Break Time")
+        self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.WindowStaysOnTopHint)
+        self.setMinimumWidth(480)
+        # Os TODOs só são indexados quando a paleta é aberta pela primeira vez
+        # (ou depois de um reset); até lá as mudanças incrementais são ignoradas
+        self._todo_source: Optional[Callable[[], Iterable[TodoItem]]] = None
+        self._todos_stale = True
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Buscar ações, TODOs, mensagens...")
+        self.query_input.textChanged.connect(self._refresh)
+        layout.addWidget(self.query_input)
+
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(self._activate_item)
+        layout.addWidget(self.results_list)
+
+    # Conteúdo do índice
+
+    def set_actions(self, actions: Iterable[tuple]):
+        """Ações fixas: (payload, título)."""
+        self.index.sync_kind(KIND_ACTION, (
+            (f"{KIND_ACTION}:{payload}", title, "", payload) for payload, title in actions))
+
+    def set_settings_tabs(self, tabs: Iterable[str]):
+        """Abas do diálogo de configurações; o payload é o nome da aba."""
+        self.index.sync_kind(KIND_SETTINGS, (
+            (f"{KIND_SETTINGS}:{tab}", f"Configurações: {tab}", "", tab) for tab in tabs))
+
+    def set_texts(self, kind: str, texts: Iterable[str]):
+        """Mensagens de pausa ou textos de desafio (só as diferenças são aplicadas)."""
+        self.index.sync_kind(kind, ((f"{kind}:{text}", text, "", text) for text in texts))
+
+    def set_todo_source(self, source: Callable[[], Iterable[TodoItem]]):
+        """Função que devolve todos os TODOs, usada para (re)construir o índice."""
+        self._todo_source = source
+        self._todos_stale = True
+
+    def reset_todos(self):
+        """A lista inteira mudou: reindexa na próxima abertura."""
+        self._todos_stale = True
+        self.index.remove_kind(KIND_TODO)
+
+    def update_todo(self, todo: TodoItem):
+        """Adiciona ou atualiza um TODO; o payload é o id."""
+        if self._todos_stale:
+            return
+        detail = "concluído" if todo.state is TodoStatus.COMPLETED else "pendente"
+        if todo.scheduled_time:
+            detail = f"{detail} - {todo.scheduled_time}"
+        text = f"{todo.title} {todo.description[:_TODO_TEXT_CHARS]}"
+        self.index.add(f"{KIND_TODO}:{todo.id}", KIND_TODO, todo.title, detail, todo.id, text=text)
+
+    def remove_todo(self, todo_id: str):
+        self.index.remove(f"{KIND_TODO}:{todo_id}")
+
+    def _index_todos(self):
+        self._todos_stale = False
+        self.index.remove_kind(KIND_TODO)
+        for todo in self._todo_source() if self._todo_source else ():
+            self.update_todo(todo)
+        self.index.prepare()
+
+    # Interface
+
+    def open_palette(self):
+        """Mostra a paleta vazia, com as ações fixas listadas."""
+        if self._todos_stale:
+            self._index_todos()
+        self.query_input.clear()
+        self._refresh("")
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_input.setFocus()
+
+    def _refresh(self, query: str):
+        if query.strip():
+            entries = self.index.search(query, MAX_RESULTS)
+        else:
+            entries = list(self.index.entries(KIND_ACTION))
+
+        self.results_list.clear()
+        for entry in entries:
+            text = f"{KIND_LABELS.get(entry.kind, entry.kind)}: {entry.title}"
+            if entry.detail:
+                text = f"{text}  ({entry.detail})"
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, entry.key)
+            self.results_list.addItem(item)
+        if entries:
+            self.results_list.setCurrentRow(0)
+
+    def _activate_item(self, item: Optional[QListWidgetItem]):
+        if item is None:
+            return
+        entry = self.index.get(item.data(Qt.ItemDataRole.UserRole))
+        if entry is None:
+            return
+        self.hide()
+        self.activated.emit(entry.kind, entry.payload)
+
+    def keyPressEvent(self, event: QKeyEvent):
+        """Setas navegam nos resultados sem tirar o foco da busca; Enter ativa."""
+        key = event.key()
+        if key in (Qt.Key.Key_Up, Qt.Key.Key_Down):
+            row = self.results_list.currentRow() + (1 if key == Qt.Key.Key_Down else -1)
+            if 0 <= row < self.results_list.count():
+                self.results_list.setCurrentRow(row)
+            return
+        if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self._activate_item(self.results_list.currentItem())
+            return
+        super().keyPressEvent(event)
@@ -0,0 +1,69 @@
+"""
+Módulo de observação do arquivo de configurações.
+Detecta edições externas do config.json para recarregá-lo sem reiniciar a app.
+"""
+
+from pathlib import Path
+from typing import Optional
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+
+from scheduler import Scheduler, get_scheduler
+
+
+class ConfigWatcher(QObject):
+    """Observa o config.json e emite `changed` após uma rajada de alterações."""
+
+    changed = pyqtSignal()
+
+    DEBOUNCE_MS = 300  # Editores costumam gravar o arquivo em várias etapas
+    RETRY_MS = 2000  # Enquanto o arquivo não existe, tenta observá-lo de novo
+
+    def __init__(self, config_path: Path, parent=None, scheduler: Optional[Scheduler] = None):
+        super().__init__(parent)
+        self.config_path = Path(config_path)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_event)
+
+        scheduler = scheduler or get_scheduler()
+        self._debounce_timer = scheduler.timer(
+            self._emit_changed, tolerance=0.1, name="config.json")
+
+    def start(self):
+        """
+        Começa a observar só o config.json (observar o diretório acordaria a
+        app a cada gravação do banco de TODOs, do journal e do log de eventos).
+        """
+        if not self._watch_file():
+            self._debounce_timer.start(self.RETRY_MS / 1000)
+
+    def stop(self):
+        """Para de observar."""
+        self._debounce_timer.stop()
+        paths = self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _watch_file(self) -> bool:
+        """
+        (Re)adiciona o arquivo; a substituição atômica (`os.replace`) troca o
+        inode e remove a observação anterior. Retorna False se ele não existe.
+        """
+        path = str(self.config_path)
+        if not self.config_path.exists():
+            return False
+        if path not in self._watcher.files():
+            self._watcher.addPath(path)
+        return True
+
+    def _on_file_event(self, _path: str):
+        """Agrupa os eventos de uma rajada de gravações."""
+        self._watch_file()
+        self._debounce_timer.start(self.DEBOUNCE_MS / 1000)
+
+    def _emit_changed(self):
+        # O editor pode ter removido o arquivo antes de gravar o novo
+        if self._watch_file():
+            self.changed.emit()
+        else:
+            self._debounce_timer.start(self.RETRY_MS / 1000)
@@ -0,0 +1,386 @@
+"""
+Histórico de eventos (pausas, Pomodoro, TODOs) em um log binário append-only.
+Cada evento é um registro de tamanho fixo; o escritor acumula os registros e
+grava em lotes, e o leitor mapeia o arquivo em memória (mmap), então anos de
+histórico podem ser percorridos sem virar objetos Python.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from scheduler import ClockEvent, Scheduler
+
+
+MAGIC = b'WSIEVLOG'
+VERSION = 1
+# Cabeçalho: magic, versão, tamanho do registro, reservado (16 bytes; os
+# registros ficam alinhados a 8 bytes para leitura direta como array)
+HEADER = struct.Struct('<8sHH4x')
+# Registro: timestamp (epoch), duração (ms), tipo, aux, id, ref
+RECORD = struct.Struct('<dIHHQQ')
+RECORD_SIZE = RECORD.size  # 32 bytes
+
+MAX_DURATION_MS = 0xFFFFFFFF
+
+
+class EventType(IntEnum):
+    """Tipos de evento gravados no log (valores persistidos: não renumerar)."""
+    BREAK_STARTED = 1
+    BREAK_ENDED = 2  # duração: tempo em pausa até a confirmação
+    IDLE_BREAK = 3  # pausa natural; duração: tempo ausente
+    SLEEP = 4  # suspensão do sistema; duração: tempo parado
+    POMODORO_STARTED = 10
+    POMODORO_CYCLE = 11  # duração: período de trabalho; aux: número do ciclo
+    POMODORO_BREAK = 12  # duração: pausa; aux: 1 se longa
+    POMODORO_ENDED = 13  # duração: sessão; aux: ciclos completados
+    TODO_DUE = 20  # id: hash do TODO
+    TODO_COMPLETED = 21  # id: hash do TODO; duração: desde que ficou pendente
+
+
+class EventRecord(NamedTuple):
+    ts: float
+    duration_ms: int
+    kind: int
+    aux: int
+    id: int
+    ref: int
+
+    @property
+    def duration(self) -> float:
+        """Duração em segundos."""
+        return self.duration_ms / 1000
+
+
+def id_hash(value: str) -> int:
+    """Identificador estável de 64 bits para ids textuais (ex.: id do TODO)."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _duration_ms(seconds: float) -> int:
+    return min(MAX_DURATION_MS, max(0, round(seconds * 1000)))
+
+
+def _check_header(data: bytes, path: Path):
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"Log de eventos inválido ou de outra versão: {path}")
+
+
+class EventLogWriter:
+    """
+    Escritor em lote: `append()` só empacota o registro no buffer; a gravação
+    (um write + fsync por lote) acontece quando o buffer enche, num timer com
+    tolerância folgada do agendador, ou em `flush()`/`close()`.
+
+    Os timestamps são mantidos não decrescentes (um ajuste do relógio para
+    trás não desordena o arquivo), o que permite busca binária na leitura.
+
+    Ouvintes recebem cada `EventRecord` acrescentado (`add_listener`) e são
+    avisados depois de cada lote gravado em disco (`add_flush_listener`).
+    """
+
+    FLUSH_DELAY = 300.0  # segundos até gravar o lote pendente
+    FLUSH_TOLERANCE = 120.0
+    MAX_BUFFERED = 4096  # registros (128 KiB); acima disso grava na hora
+
+    def __init__(self, path: Path, scheduler: Optional[Scheduler] = None):
+        self.path = Path(path)
+        self.scheduler = scheduler
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._last_ts = 0.0
+        self._file = None
+        self._flush_timer = None
+        self._listeners: List[Callable[[EventRecord], None]] = []
+        self._flush_listeners: List[Callable[[], None]] = []
+        if scheduler is not None:
+            self._flush_timer = scheduler.timer(
+                self.flush, tolerance=self.FLUSH_TOLERANCE, name="log de eventos")
+
+        # Estatísticas
+        self.appended = 0
+        self.flushes = 0
+
+        self._open()
+
+    def _open(self):
+        """Abre (ou cria) o arquivo e descarta um registro final incompleto."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        size = self._file.seek(0, os.SEEK_END)
+        if size == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+            self._file.flush()
+            return
+        self._file.seek(0)
+        try:
+            _check_header(self._file.read(HEADER.size), self.path)
+        except (ValueError, struct.error) as e:
+            # Não sobrescreve um arquivo que não reconhece: guarda e começa outro
+            print(f"Erro ao abrir log de eventos: {e}")
+            self._file.close()
+            self.path.replace(self.path.with_name(self.path.name + '.invalid'))
+            self._open()
+            return
+        whole = HEADER.size + (size - HEADER.size) // RECORD_SIZE * RECORD_SIZE
+        if whole != size:
+            # Queda no meio de uma escrita: o registro parcial é descartado
+            self._file.truncate(whole)
+        if whole > HEADER.size:
+            self._file.seek(whole - RECORD_SIZE)
+            self._last_ts = RECORD.unpack(self._file.read(RECORD_SIZE))[0]
+        self._file.seek(0, os.SEEK_END)
+
+    def add_listener(self, callback: Callable[[EventRecord], None]):
+        """Registra um ouvinte chamado com cada registro acrescentado."""
+        self._listeners.append(callback)
+
+    def add_flush_listener(self, callback: Callable[[], None]):
+        """Registra um ouvinte chamado depois de cada lote gravado em disco."""
+        self._flush_listeners.append(callback)
+
+    def append(self, kind: EventType, ts: float, duration: float = 0.0,
+               aux: int = 0, id: int = 0, ref: int = 0):
+        """Acrescenta um evento ao lote pendente (`duration` em segundos)."""
+        ts = max(ts, self._last_ts)
+        self._last_ts = ts
+        values = (ts, _duration_ms(duration), int(kind), aux & 0xFFFF, id, ref)
+        self._buffer += RECORD.pack(*values)
+        self._buffered += 1
+        self.appended += 1
+        if self._listeners:
+            record = EventRecord(*values)
+            for callback in self._listeners:
+                callback(record)
+        if self._buffered >= self.MAX_BUFFERED:
+            self.flush()
+        elif self._flush_timer is not None and not self._flush_timer.is_active():
+            self._flush_timer.start(self.FLUSH_DELAY)
+
+    @property
+    def pending(self) -> int:
+        """Registros ainda no buffer."""
+        return self._buffered
+
+    def flush(self):
+        """Grava o lote pendente e força a gravação em disco."""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        if not self._buffered or self._file is None:
+            return
+        try:
+            self._file.write(self._buffer)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"Erro ao gravar log de eventos: {e}")
+            return
+        self._buffer.clear()
+        self._buffered = 0
+        self.flushes += 1
+        for callback in self._flush_listeners:
+            callback()
+
+    def close(self):
+        """Grava o pendente e fecha o arquivo."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class EventLogReader:
+    """
+    Leitura do log via mmap. Os registros só viram `EventRecord` quando são
+    percorridos; `find_time` faz busca binária direto nos bytes e
+    `records_buffer()` expõe a região dos registros para leitura vetorizada.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+        self.refresh()
+
+    def refresh(self):
+        """(Re)mapeia o arquivo para enxergar registros gravados depois da abertura."""
+        self.close()
+        if not self.path.exists():
+            return
+        self._file = open(self.path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self._map[:HEADER.size], self.path)
+        self._count = (size - HEADER.size) // RECORD_SIZE
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, index: int) -> EventRecord:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return EventRecord(*RECORD.unpack_from(self._map, HEADER.size + index * RECORD_SIZE))
+
+    def _ts_at(self, index: int) -> float:
+        return struct.unpack_from('<d', self._map, HEADER.size + index * RECORD_SIZE)[0]
+
+    def find_time(self, ts: float) -> int:
+        """Índice do primeiro registro com timestamp >= `ts` (busca binária)."""
+        return bisect_left(range(self._count), ts, key=self._ts_at)
+
+    def scan(self, start: Optional[float] = None, end: Optional[float] = None,
+             kinds: Optional[Iterable[int]] = None) -> Iterator[EventRecord]:
+        """Percorre os registros em [start, end), opcionalmente só dos tipos informados."""
+        if self._map is None:
+            return
+        first = self.find_time(start) if start is not None else 0
+        last = self.find_time(end) if end is not None else self._count
+        yield from self.records(first, last, kinds)
+
+    def records(self, first: int = 0, last: Optional[int] = None,
+                kinds: Optional[Iterable[int]] = None) -> Iterator[EventRecord]:
+        """Percorre os registros de índice [first, last), opcionalmente só dos tipos informados."""
+        if self._map is None:
+            return
+        last = self._count if last is None else min(last, self._count)
+        if first >= last:
+            return
+        wanted = set(kinds) if kinds is not None else None
+        view = memoryview(self._map)[HEADER.size + first * RECORD_SIZE:HEADER.size + last * RECORD_SIZE]
+        try:
+            for values in RECORD.iter_unpack(view):
+                if wanted is None or values[2] in wanted:
+                    yield EventRecord(*values)
+        finally:
+            view.release()
+
+    def records_buffer(self) -> memoryview:
+        """Bytes dos registros completos (somente leitura, sem cópia)."""
+        if self._map is None:
+            return memoryview(b'')
+        return memoryview(self._map)[HEADER.size:HEADER.size + self._count * RECORD_SIZE]
+
+
+class EventRecorder:
+    """
+    Liga os sinais dos núcleos (timer, Pomodoro, TODOs) ao log. Funciona com
+    os gerenciadores Qt e com os núcleos sem Qt (só usa `connect`).
+    Durações vêm do relógio monotônico do agendador; timestamps, do de parede.
+    """
+
+    def __init__(self, writer: EventLogWriter, scheduler: Scheduler):
+        self.writer = writer
+        self.scheduler = scheduler
+        self._break_started_at: Optional[float] = None
+        self._pomodoro = None
+        self._pomodoro_started_at: Optional[float] = None
+        self._phase_started_at: Optional[float] = None
+        self._pomodoro_ref = 0
+        self._todos_due_at = {}  # id_hash → relógio em que o TODO ficou pendente
+        scheduler.add_clock_listener(self._on_clock_event)
+
+    def _record(self, kind: EventType, duration: float = 0.0, aux: int = 0, id: int = 0, ref: int = 0):
+        self.writer.append(kind, self.scheduler.wall_time(), duration, aux, id, ref)
+
+    def _elapsed(self, since: Optional[float]) -> float:
+        return self.scheduler.clock() - since if since is not None else 0.0
+
+    # Pausas
+
+    def attach_timer(self, timer):
+        timer.break_started.connect(self._on_break_started)
+        timer.break_ended.connect(self._on_break_ended)
+
+    def _on_break_started(self):
+        self._break_started_at = self.scheduler.clock()
+        self._record(EventType.BREAK_STARTED)
+
+    def _on_break_ended(self):
+        self._record(EventType.BREAK_ENDED, self._elapsed(self._break_started_at))
+        self._break_started_at = None
+
+    def record_idle_break(self, away_seconds: float):
+        """Pausa natural (usuário ausente), informada pelo orquestrador."""
+        self._record(EventType.IDLE_BREAK, away_seconds)
+
+    def _on_clock_event(self, event: ClockEvent, seconds: float):
+        if event is ClockEvent.SLEEP:
+            self._record(EventType.SLEEP, seconds)
+
+    # Pomodoro
+
+    def attach_pomodoro(self, pomodoro):
+        self._pomodoro = pomodoro
+        pomodoro.pomodoro_started.connect(self._on_pomodoro_started)
+        pomodoro.state_changed.connect(self._on_pomodoro_state_changed)
+        pomodoro.cycle_completed.connect(self._on_cycle_completed)
+        pomodoro.break_ended.connect(self._on_pomodoro_break_ended)
+        pomodoro.pomodoro_ended.connect(self._on_pomodoro_ended)
+
+    def _on_pomodoro_started(self):
+        self._pomodoro_started_at = self.scheduler.clock()
+        self._pomodoro_ref = int(self.scheduler.wall_time())  # Identifica a sessão
+        self._record(EventType.POMODORO_STARTED, ref=self._pomodoro_ref)
+
+    def _on_pomodoro_state_changed(self, state: str):
+        if state in ('working', 'short_break', 'long_break'):
+            self._phase_started_at = self.scheduler.clock()
+
+    def _on_cycle_completed(self, cycle: int):
+        self._record(EventType.POMODORO_CYCLE, self._elapsed(self._phase_started_at),
+                     aux=cycle, ref=self._pomodoro_ref)
+
+    def _on_pomodoro_break_ended(self):
+        is_long = self._pomodoro is not None and self._pomodoro.state.value == 'long_break'
+        self._record(EventType.POMODORO_BREAK, self._elapsed(self._phase_started_at),
+                     aux=int(is_long), ref=self._pomodoro_ref)
+
+    def _on_pomodoro_ended(self):
+        cycles = self._pomodoro.cycles_completed if self._pomodoro is not None else 0
+        self._record(EventType.POMODORO_ENDED, self._elapsed(self._pomodoro_started_at),
+                     aux=cycles, ref=self._pomodoro_ref)
+        self._pomodoro_started_at = None
+
+    # TODOs
+
+    def attach_todos(self, todos):
+        todos.todo_due.connect(self._on_todo_due)
+        todos.todos_missed.connect(self._on_todos_missed)
+        todos.todo_completed.connect(self._on_todo_completed)
+
+    def _on_todo_due(self, todo):
+        key = id_hash(todo.id)
+        self._todos_due_at[key] = self.scheduler.clock()
+        self._record(EventType.TODO_DUE, id=key)
+
+    def _on_todos_missed(self, todos: List):
+        for todo in todos:
+            self._on_todo_due(todo)
+
+    def _on_todo_completed(self, todo):
+        key = id_hash(todo.id)
+        self._record(EventType.TODO_COMPLETED, self._elapsed(self._todos_due_at.pop(key, None)), id=key)
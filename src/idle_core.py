@@ -0,0 +1,191 @@
+"""
+Núcleo da detecção de ociosidade, sem Qt.
+O tempo sem entrada de teclado/mouse vem de um `IdleBackend`; o núcleo
+amostra de forma adaptativa pelo agendador (real ou virtual) e avisa quando
+a ausência começa e termina.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from scheduler import Scheduler, get_scheduler
+from signals import Signal
+
+
+class IdleBackend(ABC):
+    """
+    Fonte do tempo ocioso do sistema. Backends que conseguem avisar a próxima
+    entrada do usuário sem polling implementam `watch_activity`.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def idle_seconds(self) -> float:
+        """Segundos desde a última entrada de teclado/mouse."""
+
+    def watch_activity(self, callback: Callable[[], None]) -> bool:
+        """
+        Chama `callback` (uma vez) na próxima entrada do usuário.
+        Retorna False se o backend não suporta; o monitor então faz polling.
+        """
+        return False
+
+    def unwatch_activity(self):
+        """Cancela o `watch_activity` em andamento."""
+
+    def close(self):
+        """Libera os recursos do backend."""
+
+
+class FakeIdleBackend(IdleBackend):
+    """Backend controlado manualmente (testes, simulações e benchmarks)."""
+
+    name = "fake"
+
+    def __init__(self, clock: Callable[[], float], event_driven: bool = True):
+        self.clock = clock
+        self.event_driven = event_driven
+        self.samples = 0
+        self._last_input = clock()
+        self._callback: Optional[Callable[[], None]] = None
+
+    def idle_seconds(self) -> float:
+        self.samples += 1
+        return max(0.0, self.clock() - self._last_input)
+
+    def simulate_input(self):
+        """Entrada do usuário agora."""
+        self._last_input = self.clock()
+        callback, self._callback = self._callback, None
+        if callback is not None:
+            callback()
+
+    def watch_activity(self, callback: Callable[[], None]) -> bool:
+        if not self.event_driven:
+            return False
+        self._callback = callback
+        return True
+
+    def unwatch_activity(self):
+        self._callback = None
+
+
+class IdleCore:
+    """
+    Avisa quando o usuário fica ausente por `threshold` segundos e quando volta
+    (ver `IdleMonitor` para o adaptador Qt).
+
+    Amostragem adaptativa: com o usuário ativo, o tempo ocioso não pode
+    atingir o limite antes de `threshold - ocioso` segundos, então a próxima
+    amostra é marcada para esse instante (com o usuário digitando, uma amostra
+    por `threshold`). Durante a ausência, um backend com eventos avisa a volta
+    sem nenhum despertar; nos demais, o intervalo entre amostras dobra de
+    `AWAY_POLL` até `AWAY_POLL_MAX` (a volta é notada com até esse atraso).
+    """
+
+    # Sinais
+    idle_started = Signal(float)  # Segundos ocioso ao detectar
+    idle_ended = Signal(float)  # Duração total da ausência (segundos)
+
+    AWAY_POLL = 5.0  # Polling durante a ausência, sem eventos do backend
+    AWAY_POLL_MAX = 30.0
+    MIN_POLL = 1.0
+
+    def __init__(self, backend: Optional[IdleBackend], scheduler: Optional[Scheduler] = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.backend = backend
+        self.scheduler = scheduler or get_scheduler()
+        self.threshold = 0.0  # 0 = desativado
+        self.is_idle = False
+        self._idle_since = 0.0  # Relógio do agendador
+        self._last_idle = 0.0
+        self._away_poll = self.AWAY_POLL
+        self._running = False
+        self._timer = self.scheduler.timer(self._poll, name="ociosidade")
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.threshold > 0
+
+    def configure(self, threshold: float):
+        """Define o tempo (segundos) de ausência que conta como pausa natural."""
+        self.threshold = threshold
+        if self._running:
+            self._restart()
+
+    def start(self):
+        self._running = True
+        self._restart()
+
+    def stop(self):
+        self._running = False
+        self._timer.stop()
+        if self.backend is not None:
+            self.backend.unwatch_activity()
+
+    def _restart(self):
+        self._timer.stop()
+        if self.backend is not None:
+            self.backend.unwatch_activity()
+        if self.is_idle:
+            self._leave_idle()
+        if self.enabled:
+            self._schedule(self.threshold)
+
+    def _schedule(self, delay: float):
+        # Amostrar um pouco depois não muda nada além do instante da detecção
+        delay = max(self.MIN_POLL, delay)
+        self._timer.tolerance = delay / 4
+        self._timer.start(delay)
+
+    def _sample(self) -> Optional[float]:
+        try:
+            return self.backend.idle_seconds()
+        except OSError as e:
+            print(f"Erro ao ler o tempo ocioso ({self.backend.name}): {e}")
+            return None
+
+    def _poll(self):
+        idle = self._sample()
+        if idle is None:
+            self._schedule(self.threshold)
+            return
+
+        if self.is_idle:
+            # Sem eventos: o tempo ocioso diminuir significa que o usuário voltou
+            if idle < self._last_idle:
+                self._leave_idle()
+                self._schedule(self.threshold - idle)
+            else:
+                self._last_idle = idle
+                self._away_poll = min(self._away_poll * 2, self.AWAY_POLL_MAX)
+                self._schedule(self._away_poll)
+            return
+
+        if idle >= self.threshold:
+            self._enter_idle(idle)
+        else:
+            self._schedule(self.threshold - idle)
+
+    def _enter_idle(self, idle: float):
+        self.is_idle = True
+        self._idle_since = self.scheduler.clock() - idle
+        self._last_idle = idle
+        self.idle_started.emit(idle)
+        if not self.backend.watch_activity(self._on_activity):
+            self._away_poll = self.AWAY_POLL
+            self._schedule(self._away_poll)
+
+    def _on_activity(self):
+        """Entrada do usuário avisada pelo backend durante a ausência."""
+        if not self.is_idle:
+            return
+        self._leave_idle()
+        if self._running and self.enabled:
+            self._schedule(self.threshold)
+
+    def _leave_idle(self):
+        self.is_idle = False
+        self.idle_ended.emit(self.scheduler.clock() - self._idle_since)
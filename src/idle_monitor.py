@@ -0,0 +1,195 @@
+"""
+Detecção de ociosidade (usuário longe do computador).
+Backends por plataforma (X11, Windows) e o adaptador Qt do núcleo
+(`idle_core.IdleCore`): a amostragem adaptativa é a do núcleo, e os sinais
+saem como `pyqtSignal` para a interface.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from idle_core import FakeIdleBackend, IdleBackend, IdleCore  # noqa: F401 (reexportados)
+from scheduler import Scheduler
+
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ('window', ctypes.c_ulong),
+        ('state', ctypes.c_int),
+        ('kind', ctypes.c_int),
+        ('til_or_since', ctypes.c_ulong),
+        ('idle', ctypes.c_ulong),
+        ('eventMask', ctypes.c_ulong),
+    ]
+
+
+class _XIEventMask(ctypes.Structure):
+    _fields_ = [
+        ('deviceid', ctypes.c_int),
+        ('mask_len', ctypes.c_int),
+        ('mask', ctypes.POINTER(ctypes.c_ubyte)),
+    ]
+
+
+class X11IdleBackend(IdleBackend):
+    """
+    X11: tempo ocioso pela extensão MIT-SCREEN-SAVER (libXss). Com XInput2
+    (libXi), a volta do usuário é event-driven: enquanto ausente, os eventos
+    brutos de teclado/mouse são selecionados na janela raiz e a conexão com o
+    servidor X é observada por um QSocketNotifier.
+    """
+
+    name = "x11"
+
+    _XI_ALL_MASTER_DEVICES = 1
+    _XI_RAW_EVENTS = (13, 15, 17)  # XI_RawKeyPress, XI_RawButtonPress, XI_RawMotion
+    _XI_MASK_LEN = 4
+    _XEVENT_SIZE = 192  # sizeof(XEvent) em 64 bits (24 longs)
+
+    def __init__(self):
+        self._x11 = self._load('X11')
+        self._xss = self._load('Xss')
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XScreenSaverInfo)]
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("não foi possível abrir o display X11")
+        self._root = self._x11.XDefaultRootWindow(self._display)
+        self._info = self._xss.XScreenSaverAllocInfo()
+
+        self._xi = None
+        self._notifier = None
+        self._callback: Optional[Callable[[], None]] = None
+        try:
+            self._xi = self._load('Xi')
+            self._xi.XISelectEvents.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XIEventMask), ctypes.c_int]
+            major, minor = ctypes.c_int(2), ctypes.c_int(0)
+            if self._xi.XIQueryVersion(ctypes.c_void_p(self._display),
+                                       ctypes.byref(major), ctypes.byref(minor)) != 0:
+                self._xi = None
+        except OSError:
+            self._xi = None  # Sem XInput2: o monitor faz polling enquanto ausente
+
+    @staticmethod
+    def _load(name: str):
+        path = ctypes.util.find_library(name)
+        if path is None:
+            raise OSError(f"biblioteca lib{name} não encontrada")
+        return ctypes.CDLL(path)
+
+    def idle_seconds(self) -> float:
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            raise OSError("XScreenSaverQueryInfo falhou")
+        return self._info.contents.idle / 1000.0
+
+    def _select_raw_events(self, enabled: bool):
+        bits = (ctypes.c_ubyte * self._XI_MASK_LEN)()
+        if enabled:
+            for event in self._XI_RAW_EVENTS:
+                bits[event >> 3] |= 1 << (event & 7)
+        mask = _XIEventMask(self._XI_ALL_MASTER_DEVICES, self._XI_MASK_LEN, bits)
+        self._xi.XISelectEvents(ctypes.c_void_p(self._display), self._root, ctypes.byref(mask), 1)
+        self._x11.XFlush(ctypes.c_void_p(self._display))
+
+    def _drain_events(self) -> int:
+        """Consome os eventos pendentes da conexão; retorna quantos havia."""
+        event = ctypes.create_string_buffer(self._XEVENT_SIZE)
+        count = 0
+        while self._x11.XPending(ctypes.c_void_p(self._display)):
+            self._x11.XNextEvent(ctypes.c_void_p(self._display), event)
+            count += 1
+        return count
+
+    def watch_activity(self, callback: Callable[[], None]) -> bool:
+        if self._xi is None:
+            return False
+        from PyQt6.QtCore import QSocketNotifier
+
+        self._callback = callback
+        self._drain_events()
+        self._select_raw_events(True)
+        if self._notifier is None:
+            fd = self._x11.XConnectionNumber(ctypes.c_void_p(self._display))
+            self._notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read)
+            self._notifier.activated.connect(self._on_readable)
+        self._notifier.setEnabled(True)
+        return True
+
+    def unwatch_activity(self):
+        self._callback = None
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+        if self._xi is not None:
+            self._select_raw_events(False)
+            self._drain_events()
+
+    def _on_readable(self, *args):
+        if not self._drain_events() or self._callback is None:
+            return
+        callback = self._callback
+        self.unwatch_activity()
+        callback()
+
+    def close(self):
+        self.unwatch_activity()
+        if self._display:
+            self._x11.XCloseDisplay(ctypes.c_void_p(self._display))
+            self._display = None
+
+
+class _LastInputInfo(ctypes.Structure):
+    _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+
+class WindowsIdleBackend(IdleBackend):
+    """Windows: GetLastInputInfo (sem eventos; o monitor faz polling enquanto ausente)."""
+
+    name = "windows"
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._info = _LastInputInfo(ctypes.sizeof(_LastInputInfo), 0)
+
+    def idle_seconds(self) -> float:
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            raise OSError("GetLastInputInfo falhou")
+        # Os contadores de 32 bits dão a volta a cada ~49 dias
+        return ((self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+def create_idle_backend() -> Optional[IdleBackend]:
+    """Backend da plataforma atual, ou None (detecção de ociosidade desativada)."""
+    try:
+        if sys.platform == 'win32':
+            return WindowsIdleBackend()
+        if os.environ.get('DISPLAY'):
+            return X11IdleBackend()
+    except (OSError, AttributeError) as e:
+        print(f"Detecção de ociosidade indisponível: {e}")
+    return None
+
+
+class IdleMonitor(QObject, IdleCore):
+    """Monitor de ociosidade da aplicação (ver `IdleCore`)."""
+
+    # Sinais
+    idle_started = pyqtSignal(float)  # Segundos ocioso ao detectar
+    idle_ended = pyqtSignal(float)  # Duração total da ausência (segundos)
+
+    def __init__(self, backend: Optional[IdleBackend], parent=None,
+                 scheduler: Optional[Scheduler] = None):
+        # Herança cooperativa do PyQt: QObject recebe `parent` e repassa o resto ao núcleo
+        super().__init__(parent=parent, backend=backend, scheduler=scheduler)
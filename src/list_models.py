@@ -0,0 +1,112 @@
+"""
+Modelos de lista (Qt model/view) usados pelo diálogo de configurações.
+Os modelos trabalham sobre as listas reais (mensagens, textos de desafio e
+TODOs) e avisam a view linha a linha; o texto de cada linha só é montado
+quando ela fica visível.
+"""
+
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from todo_model import TodoItem, TodoStatus
+
+
+class StringListModel(QAbstractListModel):
+    """Lista de textos editável (mensagens de pausa, textos de desafio)."""
+
+    def __init__(self, items: Optional[List[str]] = None, parent=None):
+        super().__init__(parent)
+        self._items: List[str] = items if items is not None else []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        text = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Linhas de altura uniforme: textos com várias linhas mostram só a primeira
+            first, sep, _ = text.partition('\n')
+            return f"{first} …" if sep else text
+        if role in (Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return text
+        return None
+
+    def items(self) -> List[str]:
+        """A lista editada (a própria lista do modelo, sem cópia)."""
+        return self._items
+
+    def set_items(self, items: List[str]):
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
+
+    def text_at(self, row: int) -> str:
+        return self._items[row]
+
+    def append(self, text: str):
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(text)
+        self.endInsertRows()
+
+    def set_text(self, row: int, text: str):
+        self._items[row] = text
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self.endRemoveRows()
+
+
+class TodoListModel(QAbstractListModel):
+    """TODOs do diálogo de configurações; `UserRole` devolve o id."""
+
+    def __init__(self, todos: Optional[List[TodoItem]] = None, parent=None):
+        super().__init__(parent)
+        self._todos: List[TodoItem] = todos if todos is not None else []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._todos)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._todos):
+            return None
+        todo = self._todos[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            status_icon = "[OK]" if todo.state is TodoStatus.COMPLETED else "[  ]"
+            recurring_icon = "[R]" if todo.is_recurring else ""
+            time_str = f" {todo.scheduled_time}" if todo.scheduled_time else ""
+            return f"{status_icon} {recurring_icon} {todo.title}{time_str}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return todo.description or None
+        if role == Qt.ItemDataRole.UserRole:
+            return todo.id
+        return None
+
+    def todos(self) -> List[TodoItem]:
+        """A lista editada (a própria lista do modelo, sem cópia)."""
+        return self._todos
+
+    def todo_at(self, row: int) -> TodoItem:
+        return self._todos[row]
+
+    def append(self, todo: TodoItem):
+        row = len(self._todos)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._todos.append(todo)
+        self.endInsertRows()
+
+    def todo_changed(self, row: int):
+        """Avisa a view de que o TODO da linha foi editado no lugar."""
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._todos[row]
+        self.endRemoveRows()
@@ -131,12 +131,15 @@ class BreakOverlay(QWidget):
         """Configura a janela antes de exibir."""
         self.break_message = message
         self.challenge_text = challenge_text
-        self.fixed_message = fixed_message
 
         self.message_label.setText(message)
         self.challenge_label.setText(challenge_text)
         self.challenge_input.clear()
+        self.set_fixed_message(fixed_message)
 
+    def set_fixed_message(self, fixed_message: str):
+        """Atualiza apenas o texto fixo (pode ser chamado com a janela visível)."""
+        self.fixed_message = fixed_message
         trimmed = (fixed_message or "").strip()
         if trimmed:
             self.fixed_label.setText(trimmed)
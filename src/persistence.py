@@ -0,0 +1,171 @@
+"""
+Módulo de persistência em segundo plano.
+Agrupa rajadas de salvamentos em uma única escrita atômica fora da thread da GUI.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8'):
+    """
+    Escreve o texto em um arquivo temporário no mesmo diretório e o renomeia
+    sobre o destino. Uma queda no meio da escrita nunca trunca o arquivo.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehindPersister:
+    """
+    Executa `write_fn` em uma thread de trabalho, no máximo uma vez por janela.
+
+    Cada chamada a `schedule()` marca o estado como sujo e reinicia a janela de
+    espera; pedidos feitos enquanto uma escrita já está pendente são contados
+    como coalescidos. `max_delay_ms` garante que rajadas contínuas não adiem a
+    escrita indefinidamente.
+    """
+
+    def __init__(self, write_fn: Callable[[], None], delay_ms: int = 500,
+                 max_delay_ms: Optional[int] = None, name: str = "WriteBehindPersister"):
+        self._write_fn = write_fn
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms if max_delay_ms is not None else delay_ms * 4
+
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._writing = False
+        self._first_request: float = 0.0
+        self._deadline: float = 0.0
+        self._stopped = False
+
+        # Contadores
+        self.requests = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.failures = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> bool:
+        """Retorna True se há uma escrita agendada ou em andamento."""
+        with self._cond:
+            return self._dirty or self._writing
+
+    def schedule(self):
+        """Agenda uma escrita (coalescida com as demais dentro da janela)."""
+        now = time.monotonic()
+        with self._cond:
+            if self._stopped:
+                return
+            self.requests += 1
+            if self._dirty:
+                self.coalesced += 1
+            else:
+                self._dirty = True
+                self._first_request = now
+            self._deadline = min(now + self.delay_ms / 1000,
+                                 self._first_request + self.max_delay_ms / 1000)
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Força a escrita pendente e aguarda sua conclusão.
+        Retorna False se o tempo limite expirar antes disso.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._dirty:
+                self._deadline = 0.0
+                self._cond.notify_all()
+            while self._dirty or self._writing:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                if not self._thread.is_alive():
+                    # Thread já encerrada: escreve na thread chamadora
+                    self._dirty = False
+                    self._record(self._do_write())
+                    break
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Grava o que estiver pendente e encerra a thread de trabalho."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def stats(self) -> dict:
+        """Retorna os contadores de escrita."""
+        with self._cond:
+            return {
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'writes': self.writes,
+                'failures': self.failures,
+            }
+
+    def _run(self):
+        """Laço da thread de trabalho."""
+        with self._cond:
+            while True:
+                while not self._dirty and not self._stopped:
+                    self._cond.wait()
+                if not self._dirty and self._stopped:
+                    return
+
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0 and not self._stopped:
+                    self._cond.wait(remaining)
+                    continue
+
+                self._dirty = False
+                self._writing = True
+                self._cond.release()
+                ok = False
+                try:
+                    ok = self._do_write()
+                finally:
+                    self._cond.acquire()
+                    self._record(ok)
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _do_write(self) -> bool:
+        """Executa a função de escrita; retorna True em caso de sucesso."""
+        try:
+            self._write_fn()
+            return True
+        except Exception as e:
+            print(f"Erro ao gravar em segundo plano: {e}")
+            return False
+
+    def _record(self, ok: bool):
+        """Atualiza os contadores (chamado com o lock adquirido)."""
+        if ok:
+            self.writes += 1
+        else:
+            self.failures += 1
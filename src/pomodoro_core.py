@@ -0,0 +1,243 @@
+"""
+Núcleo do Pomodoro, sem Qt.
+Controla os ciclos de trabalho e pausas no modo Pomodoro, com cada fase
+como um prazo no relógio do agendador (real ou virtual).
+"""
+
+import math
+from enum import Enum
+from typing import Optional
+
+from scheduler import Scheduler, get_scheduler
+from signals import Signal
+
+
+class PomodoroState(Enum):
+    """Estados possíveis do Pomodoro."""
+    IDLE = "idle"
+    WORKING = "working"
+    SHORT_BREAK = "short_break"
+    LONG_BREAK = "long_break"
+    WAITING_CONFIRMATION = "waiting"
+
+
+class PomodoroCore:
+    """Máquina de estados do Pomodoro (ver `PomodoroManager` para o adaptador Qt)."""
+
+    # Sinais
+    state_changed = Signal(str)
+    cycle_completed = Signal(int)
+    confirmation_needed = Signal(str)  # Mensagem descritiva
+    reminder_notification = Signal()
+    pomodoro_started = Signal()
+    pomodoro_ended = Signal()
+    break_started = Signal()
+    break_ended = Signal()
+
+    def __init__(self, scheduler: Optional[Scheduler] = None, **kwargs):
+        super().__init__(**kwargs)
+
+        # Timers (no agendador único). A fase é um prazo absoluto no relógio
+        # monotônico do agendador; um único disparo faz cada transição
+        self.scheduler = scheduler or get_scheduler()
+        self.phase_timer = self.scheduler.timer(
+            self._on_phase_end, tolerance=0.5, name="pomodoro: fim da fase")
+        self.reminder_timer = self.scheduler.timer(
+            self._on_reminder_timer, interval=30.0, tolerance=5.0, name="pomodoro: lembrete")
+
+        # Estado
+        self._state = PomodoroState.IDLE
+        self._cycles_completed = 0
+        self._deadline: Optional[float] = None  # Fim da fase em contagem
+        self._frozen_remaining = 0.0  # Restante guardado enquanto suspenso
+        self._waiting_for_work = False  # True se aguardando confirmação para TRABALHO
+        self._suspended = False  # Usuário ausente (ver suspend)
+
+        # Configurações (valores padrão)
+        self.work_duration = 25  # minutos
+        self.short_break_duration = 5  # minutos
+        self.long_break_duration = 15  # minutos
+        self.cycles_before_long_break = 4
+
+    def configure(self, work_duration: int, short_break_duration: int,
+                  long_break_duration: int, cycles_before_long_break: int):
+        """Configura os parâmetros do Pomodoro."""
+        self.work_duration = work_duration
+        self.short_break_duration = short_break_duration
+        self.long_break_duration = long_break_duration
+        self.cycles_before_long_break = cycles_before_long_break
+
+    @property
+    def state(self) -> PomodoroState:
+        """Retorna o estado atual."""
+        return self._state
+
+    @property
+    def cycles_completed(self) -> int:
+        """Retorna o número de ciclos completados."""
+        return self._cycles_completed
+
+    @property
+    def seconds_remaining(self) -> int:
+        """Retorna os segundos restantes no timer atual (arredondados para cima)."""
+        return max(0, math.ceil(self.time_remaining() - 1e-6))
+
+    def time_remaining(self) -> float:
+        """Segundos até o fim da fase, calculados do prazo (0 fora de contagem)."""
+        if self._suspended:
+            return self._frozen_remaining
+        if self._deadline is None:
+            return 0.0
+        return max(0.0, self._deadline - self.scheduler.clock())
+
+    @property
+    def is_active(self) -> bool:
+        """Retorna True se o Pomodoro está ativo (não IDLE)."""
+        return self._state != PomodoroState.IDLE
+
+    def start(self):
+        """Inicia o Pomodoro (começa período de trabalho)."""
+        if self._state != PomodoroState.IDLE:
+            return
+
+        self._cycles_completed = 0
+        self._waiting_for_work = False
+        self.pomodoro_started.emit()
+        self._start_work()
+
+    def stop(self):
+        """Encerra completamente o Pomodoro."""
+        self.phase_timer.stop()
+        self.reminder_timer.stop()
+        self._deadline = None
+        self._frozen_remaining = 0.0
+        self._suspended = False
+        self._set_state(PomodoroState.IDLE)
+        self._cycles_completed = 0
+        self._waiting_for_work = False
+        self.pomodoro_ended.emit()
+
+    def confirm_next_cycle(self):
+        """Usuário confirma para iniciar o próximo ciclo."""
+        if self._state != PomodoroState.WAITING_CONFIRMATION:
+            return
+
+        self.reminder_timer.stop()
+
+        if self._waiting_for_work:
+            # Após pausa, inicia trabalho
+            self._start_work()
+        else:
+            # Após trabalho, inicia pausa
+            self._start_break()
+
+    def suspend(self):
+        """Usuário ausente: congela a contagem e para o prazo e os lembretes."""
+        if self._suspended:
+            return
+        self._frozen_remaining = self.time_remaining()
+        self._suspended = True
+        self.phase_timer.stop()
+        self.reminder_timer.stop()
+
+    def resume(self, away_seconds: float = 0.0):
+        """
+        Retoma após a ausência. O trabalho continua de onde parou; uma pausa em
+        andamento desconta o tempo ausente (termina já se acabou).
+        """
+        if not self._suspended:
+            return
+        self._suspended = False
+        remaining = self._frozen_remaining
+        if self._state == PomodoroState.WORKING:
+            self._start_phase(remaining)
+        elif self._state in (PomodoroState.SHORT_BREAK, PomodoroState.LONG_BREAK):
+            self._start_phase(max(0.0, remaining - away_seconds))
+        elif self._state == PomodoroState.WAITING_CONFIRMATION:
+            self.reminder_timer.start()
+
+    def end_session(self):
+        """Usuário decide encerrar a sessão."""
+        self.stop()
+
+    def get_status_text(self) -> str:
+        """Retorna texto de status para exibição."""
+        if self._state == PomodoroState.IDLE:
+            return "Pomodoro inativo"
+        elif self._state == PomodoroState.WORKING:
+            minutes, seconds = divmod(self.seconds_remaining, 60)
+            return f"Trabalho - {minutes:02d}:{seconds:02d}"
+        elif self._state == PomodoroState.SHORT_BREAK:
+            minutes, seconds = divmod(self.seconds_remaining, 60)
+            return f"Pausa curta - {minutes:02d}:{seconds:02d}"
+        elif self._state == PomodoroState.LONG_BREAK:
+            minutes, seconds = divmod(self.seconds_remaining, 60)
+            return f"Pausa longa - {minutes:02d}:{seconds:02d}"
+        elif self._state == PomodoroState.WAITING_CONFIRMATION:
+            return "Aguardando confirmação"
+        return ""
+
+    def _set_state(self, new_state: PomodoroState):
+        """Altera o estado e emite sinal."""
+        self._state = new_state
+        self.state_changed.emit(new_state.value)
+
+    def _start_phase(self, seconds: float):
+        """Fixa o prazo da fase atual e agenda o único disparo da transição."""
+        self._deadline = self.scheduler.clock() + seconds
+        self.phase_timer.start_at(self._deadline)
+
+    def _start_work(self):
+        """Inicia período de trabalho."""
+        self._waiting_for_work = False
+        self._start_phase(self.work_duration * 60)
+        self._set_state(PomodoroState.WORKING)
+
+    def _start_break(self):
+        """Inicia período de pausa (curta ou longa)."""
+        # Determina se é pausa longa
+        if (self._cycles_completed % self.cycles_before_long_break) == 0 and self._cycles_completed > 0:
+            state, minutes = PomodoroState.LONG_BREAK, self.long_break_duration
+        else:
+            state, minutes = PomodoroState.SHORT_BREAK, self.short_break_duration
+
+        self._waiting_for_work = False
+        self._start_phase(minutes * 60)
+        self._set_state(state)
+        self.break_started.emit()
+
+    def _on_phase_end(self):
+        """Prazo da fase atingido: transição única, mesmo após suspensão ou atraso."""
+        if self._state == PomodoroState.WORKING:
+            self._cycles_completed += 1
+            self.cycle_completed.emit(self._cycles_completed)
+            self._enter_waiting_state(waiting_for_work=False)
+        elif self._state in (PomodoroState.SHORT_BREAK, PomodoroState.LONG_BREAK):
+            self.break_ended.emit()
+            self._enter_waiting_state(waiting_for_work=True)
+
+    def _enter_waiting_state(self, waiting_for_work: bool):
+        """Entra no estado de aguardando confirmação."""
+        self._deadline = None
+        self._waiting_for_work = waiting_for_work
+        self._set_state(PomodoroState.WAITING_CONFIRMATION)
+
+        if waiting_for_work:
+            msg = f"Pausa finalizada! Ciclo {self._cycles_completed} de {self.cycles_before_long_break}. " \
+                  f"Inicie o próximo período de trabalho ou encerre."
+        else:
+            # Determina tipo da próxima pausa
+            if (self._cycles_completed % self.cycles_before_long_break) == 0:
+                pause_type = "longa"
+            else:
+                pause_type = "curta"
+            msg = f"Ciclo {self._cycles_completed} completo! " \
+                  f"Inicie a pausa {pause_type} ou encerre o Pomodoro."
+
+        self.confirmation_needed.emit(msg)
+        self.reminder_timer.start()
+
+    def _on_reminder_timer(self):
+        """Emite lembrete a cada 30 segundos."""
+        if self._state == PomodoroState.WAITING_CONFIRMATION:
+            self.reminder_notification.emit()
@@ -0,0 +1,189 @@
+"""
+Regras de recorrência dos TODOs.
+Calcula a próxima ocorrência de cada regra; o TodoManager guarda o resultado
+em cada item e só recalcula quando a ocorrência dispara ou o item é editado.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import FrozenSet, Iterable, List, Optional
+
+
+WEEKDAY_NAMES = ('seg', 'ter', 'qua', 'qui', 'sex', 'sáb', 'dom')
+
+# Limite de busca; toda regra válida ocorre dentro de uma semana
+_MAX_SCAN_DAYS = 400
+
+
+def _format_minute(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _parse_minute(value: str) -> int:
+    hour, minute = map(int, value.split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Horário inválido: {value}")
+    return hour * 60 + minute
+
+
+class RecurrenceRule:
+    """
+    Regra de recorrência imutável.
+
+    Tipos:
+        daily          todo dia em `minute`
+        weekdays       nos dias da semana de `weekdays` (0 = segunda) em `minute`
+        every_n_days   a cada `interval` dias a partir de `start_day`, em `minute`
+        every_n_hours  a cada `interval` horas entre `minute` e `window_end`
+                       (inclusive), opcionalmente só nos dias de `weekdays`
+        once           uma única vez em `at`
+    """
+
+    DAILY = 'daily'
+    WEEKDAYS = 'weekdays'
+    EVERY_N_DAYS = 'every_n_days'
+    EVERY_N_HOURS = 'every_n_hours'
+    ONCE = 'once'
+
+    __slots__ = ('kind', 'minute', 'weekdays', 'interval', 'start_day', 'window_end', 'at')
+
+    def __init__(self, kind: str, minute: int = 0, weekdays: Iterable[int] = (),
+                 interval: int = 1, start_day: Optional[date] = None,
+                 window_end: Optional[int] = None, at: Optional[datetime] = None):
+        if kind not in (self.DAILY, self.WEEKDAYS, self.EVERY_N_DAYS, self.EVERY_N_HOURS, self.ONCE):
+            raise ValueError(f"Tipo de recorrência desconhecido: {kind}")
+        if interval < 1:
+            raise ValueError("O intervalo deve ser positivo")
+        self.kind = kind
+        self.minute = minute
+        self.weekdays: FrozenSet[int] = frozenset(weekdays)
+        self.interval = interval
+        self.start_day = start_day
+        self.window_end = window_end
+        self.at = at
+        if not self.weekdays <= set(range(7)):
+            raise ValueError("Dias da semana devem estar entre 0 (segunda) e 6 (domingo)")
+        if kind == self.WEEKDAYS and not self.weekdays:
+            raise ValueError("Informe ao menos um dia da semana")
+        if kind == self.EVERY_N_DAYS and start_day is None:
+            raise ValueError("Informe o dia inicial")
+        if kind == self.EVERY_N_HOURS and (window_end is None or window_end < minute):
+            raise ValueError("Janela de horário inválida")
+        if kind == self.ONCE and at is None:
+            raise ValueError("Informe a data/hora")
+
+    # Construtores
+
+    @classmethod
+    def daily(cls, minute: int) -> 'RecurrenceRule':
+        return cls(cls.DAILY, minute=minute)
+
+    @classmethod
+    def on_weekdays(cls, weekdays: Iterable[int], minute: int) -> 'RecurrenceRule':
+        return cls(cls.WEEKDAYS, minute=minute, weekdays=weekdays)
+
+    @classmethod
+    def every_n_days(cls, interval: int, minute: int, start_day: date) -> 'RecurrenceRule':
+        return cls(cls.EVERY_N_DAYS, minute=minute, interval=interval, start_day=start_day)
+
+    @classmethod
+    def every_n_hours(cls, interval: int, window_start: int, window_end: int,
+                      weekdays: Iterable[int] = ()) -> 'RecurrenceRule':
+        return cls(cls.EVERY_N_HOURS, minute=window_start, window_end=window_end,
+                   interval=interval, weekdays=weekdays)
+
+    @classmethod
+    def once(cls, at: datetime) -> 'RecurrenceRule':
+        return cls(cls.ONCE, at=at.replace(microsecond=0))
+
+    # Cálculo
+
+    def _minutes_on(self, day: date) -> List[int]:
+        """Minutos do dia em que a regra ocorre na data informada (em ordem)."""
+        if self.weekdays and day.weekday() not in self.weekdays:
+            return []
+        if self.kind == self.EVERY_N_DAYS and (day - self.start_day).days % self.interval:
+            return []
+        if self.kind == self.EVERY_N_HOURS:
+            return list(range(self.minute, self.window_end + 1, self.interval * 60))
+        return [self.minute]
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """Primeira ocorrência estritamente posterior a `after` (None se não houver)."""
+        if self.kind == self.ONCE:
+            return self.at if self.at > after else None
+
+        day = after.date()
+        if self.kind == self.EVERY_N_DAYS and day < self.start_day:
+            day = self.start_day
+        for _ in range(_MAX_SCAN_DAYS):
+            if self.kind == self.EVERY_N_DAYS:
+                # Pula direto para o próximo dia alinhado ao intervalo
+                day += timedelta(days=-(day - self.start_day).days % self.interval)
+            midnight = datetime.combine(day, datetime.min.time())
+            for minute in self._minutes_on(day):
+                candidate = midnight + timedelta(minutes=minute)
+                if candidate > after:
+                    return candidate
+            day += timedelta(days=1)
+        return None
+
+    # Serialização
+
+    def to_dict(self) -> dict:
+        data = {'kind': self.kind}
+        if self.kind == self.ONCE:
+            data['at'] = self.at.isoformat()
+            return data
+        data['time'] = _format_minute(self.minute)
+        if self.weekdays:
+            data['days'] = sorted(self.weekdays)
+        if self.kind in (self.EVERY_N_DAYS, self.EVERY_N_HOURS):
+            data['every'] = self.interval
+        if self.kind == self.EVERY_N_DAYS:
+            data['start'] = self.start_day.isoformat()
+        if self.kind == self.EVERY_N_HOURS:
+            data['until'] = _format_minute(self.window_end)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RecurrenceRule':
+        """Cria a regra a partir do dicionário salvo. Lança ValueError se inválido."""
+        kind = data.get('kind')
+        if kind == cls.ONCE:
+            return cls(kind, at=datetime.fromisoformat(data['at']))
+        start = data.get('start')
+        until = data.get('until')
+        return cls(
+            kind,
+            minute=_parse_minute(data.get('time', '00:00')),
+            weekdays=data.get('days', ()),
+            interval=int(data.get('every', 1)),
+            start_day=date.fromisoformat(start) if start else None,
+            window_end=_parse_minute(until) if until else None,
+        )
+
+    def describe(self) -> str:
+        """Texto curto para exibição."""
+        days = ', '.join(WEEKDAY_NAMES[d] for d in sorted(self.weekdays))
+        if self.kind == self.ONCE:
+            return self.at.strftime('%d/%m/%Y %H:%M')
+        if self.kind == self.DAILY:
+            return f"todo dia às {_format_minute(self.minute)}"
+        if self.kind == self.WEEKDAYS:
+            return f"{days} às {_format_minute(self.minute)}"
+        if self.kind == self.EVERY_N_DAYS:
+            return f"a cada {self.interval} dias às {_format_minute(self.minute)}"
+        text = (f"a cada {self.interval}h das {_format_minute(self.minute)} "
+                f"às {_format_minute(self.window_end)}")
+        return f"{text} ({days})" if days else text
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RecurrenceRule):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"RecurrenceRule({self.to_dict()!r})"
@@ -0,0 +1,383 @@
+"""
+Agendador único da aplicação.
+Todos os temporizadores (pausas, lembretes, Pomodoro, TODOs, status) são
+registrados aqui, com prazos no relógio monotônico; um único timer do sistema
+é armado para o próximo despertar. Cada temporizador tem uma tolerância: os que
+vencem perto uns dos outros são disparados no mesmo despertar.
+
+O agendador também reconcilia o relógio monotônico com o de parede: detecta
+suspensão/hibernação (o despertar chegou atrasado) e saltos do relógio de
+parede (NTP, ajuste manual) e avisa os interessados antes de disparar os
+temporizadores vencidos, para que todos os prazos sejam refeitos numa só passada.
+"""
+
+import heapq
+import itertools
+import math
+import sys
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, List, Optional
+
+
+Clock = Callable[[], float]
+
+HOUR = 3600.0
+
+CLOCK_JUMP_THRESHOLD = 5.0  # Segundos de atraso/desvio considerados salto
+WATCHDOG_INTERVAL = 60.0  # Despertar mínimo para notar a volta da suspensão
+
+
+class ClockEvent(Enum):
+    """Descontinuidades de relógio repassadas aos ouvintes do agendador."""
+    SLEEP = "sleep"  # O processo ficou parado (suspensão, hibernação)
+    WALL_JUMP = "wall_jump"  # O relógio de parede saltou (NTP, ajuste manual, fuso)
+
+
+def _default_clock() -> Clock:
+    """
+    Relógio monotônico que continua contando durante a suspensão, para que os
+    prazos vencidos no período disparem na volta. No Linux é o CLOCK_BOOTTIME;
+    no macOS, o CLOCK_MONOTONIC do clock_gettime (o `time.monotonic` de lá
+    para durante a suspensão); no Windows o `time.monotonic` já conta.
+    """
+    if hasattr(time, 'CLOCK_BOOTTIME'):
+        return lambda: time.clock_gettime(time.CLOCK_BOOTTIME)
+    if sys.platform == 'darwin':
+        return lambda: time.clock_gettime(time.CLOCK_MONOTONIC)
+    return time.monotonic
+
+
+class ScheduledTimer:
+    """
+    Temporizador registrado no `Scheduler`. Single-shot por padrão; com
+    `interval`, repete a cada `interval` segundos contados do prazo anterior
+    (sem acumular o atraso dos disparos).
+    """
+
+    __slots__ = ('scheduler', 'callback', 'interval', 'tolerance', 'name', 'deadline', '_seq')
+
+    def __init__(self, scheduler: 'Scheduler', callback: Callable[[], None],
+                 interval: Optional[float] = None, tolerance: float = 0.0, name: str = ""):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval
+        self.tolerance = tolerance
+        self.name = name
+        self.deadline: Optional[float] = None  # Relógio do agendador; None = parado
+        self._seq = -1
+
+    def start(self, delay: Optional[float] = None):
+        """(Re)inicia o temporizador; sem `delay`, usa o intervalo."""
+        if delay is None:
+            delay = self.interval
+        if delay is None:
+            raise ValueError(f"Temporizador sem intervalo: {self.name}")
+        self.scheduler._push(self, self.scheduler.clock() + max(0.0, delay))
+
+    def start_at(self, deadline: float):
+        """Agenda para um instante absoluto do relógio do agendador."""
+        self.scheduler._push(self, deadline)
+
+    def stop(self):
+        if self.deadline is not None:
+            self.deadline = None
+            self.scheduler._cancel(self)
+
+    def is_active(self) -> bool:
+        return self.deadline is not None
+
+    def remaining(self) -> float:
+        """Segundos até o prazo (0 se vencido, -1 se parado)."""
+        if self.deadline is None:
+            return -1.0
+        return max(0.0, self.deadline - self.scheduler.clock())
+
+    def __repr__(self) -> str:
+        return f"ScheduledTimer({self.name!r}, deadline={self.deadline!r})"
+
+
+class Scheduler:
+    """
+    Núcleo do agendador, sem Qt. Dois heaps com invalidação preguiçosa (cada
+    temporizador só tem uma entrada válida, identificada pelo seq):
+      - por prazo: o que já venceu é disparado no despertar;
+      - por prazo + tolerância: o topo é o último instante aceitável para o
+        próximo despertar.
+    Despertar nesse instante dispara de uma vez tudo que venceu até ali.
+
+    Quem integra com um laço de eventos sobrescreve `_arm(at)` e chama
+    `run_due()` quando o instante chega (ver `QtScheduler`).
+
+    Sem `clock`, usa o relógio monotônico que conta a suspensão e o
+    `time.time` como relógio de parede. Com um `clock` injetado (ex.: relógio
+    virtual), saltos do relógio de parede só são detectados se `wall_clock`
+    também for informado.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, wall_clock: Optional[Clock] = None):
+        if clock is None:
+            clock = _default_clock()
+            wall_clock = wall_clock or time.time
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._by_deadline: List[tuple] = []
+        self._by_latest: List[tuple] = []
+        self._seq = itertools.count()
+        self._live = 0  # Temporizadores ativos
+        self._armed_at: Optional[float] = None
+        self._running = False  # Dentro de run_due (rearmar só no fim)
+        self._clock_listeners: List[Callable[[ClockEvent, float], None]] = []
+        self._last_check = (clock(), wall_clock() if wall_clock else 0.0)
+        self._watchdog: Optional[ScheduledTimer] = None
+
+        # Estatísticas
+        self.wakeups = 0
+        self.fired = 0
+        self.clock_events = 0
+        self.started_at = clock()
+        self._recent_wakeups: Deque[float] = deque()  # Despertares da última hora
+
+    def timer(self, callback: Callable[[], None], interval: Optional[float] = None,
+              tolerance: float = 0.0, name: str = "") -> ScheduledTimer:
+        """Cria um temporizador (parado) com a tolerância de coalescência informada."""
+        return ScheduledTimer(self, callback, interval, tolerance, name)
+
+    def wall_time(self) -> float:
+        """
+        Horário de parede (epoch) para quem agenda por data e hora. Com relógio
+        virtual, avança junto com ele; sem relógio de parede, usa o do sistema.
+        """
+        return self.wall_clock() if self.wall_clock is not None else time.time()
+
+    def call_later(self, delay: float, callback: Callable[[], None],
+                   tolerance: float = 0.0, name: str = "") -> ScheduledTimer:
+        """Atalho para um single-shot já iniciado."""
+        timer = self.timer(callback, tolerance=tolerance, name=name)
+        timer.start(delay)
+        return timer
+
+    def start_watchdog(self, interval: float = WATCHDOG_INTERVAL):
+        """
+        Mantém sempre um despertar agendado (com tolerância folgada, para
+        coincidir com outros eventos), de modo que a volta de uma suspensão
+        seja notada em até ~2 intervalos mesmo sem outros temporizadores.
+        """
+        if self._watchdog is None:
+            self._watchdog = self.timer(lambda: None, interval=interval,
+                                        tolerance=interval, name="vigia do relógio")
+        self._watchdog.interval = interval
+        self._watchdog.start()
+
+    def stop_watchdog(self):
+        """Desliga o vigia (ex.: usuário ausente, quando nenhum despertar é desejado)."""
+        if self._watchdog is not None:
+            self._watchdog.stop()
+
+    def add_clock_listener(self, callback: Callable[[ClockEvent, float], None]):
+        """
+        Registra `callback(evento, segundos)`, chamado quando uma suspensão ou
+        um salto do relógio de parede é detectado. Os ouvintes rodam dentro do
+        despertar, antes dos temporizadores vencidos: podem parar e reiniciar
+        temporizadores à vontade, e o timer do sistema é rearmado uma única vez.
+        """
+        self._clock_listeners.append(callback)
+
+    # Heaps
+
+    def _push(self, timer: ScheduledTimer, deadline: float):
+        if timer._seq < 0:
+            self._live += 1
+        seq = next(self._seq)
+        timer.deadline = deadline
+        timer._seq = seq
+        heapq.heappush(self._by_deadline, (deadline, seq, timer))
+        heapq.heappush(self._by_latest, (deadline + timer.tolerance, seq, timer))
+        self._compact()
+        self._rearm()
+
+    def _cancel(self, timer: ScheduledTimer):
+        if timer._seq >= 0:
+            self._live -= 1
+        timer._seq = -1
+        self._rearm()
+
+    @staticmethod
+    def _is_live(entry: tuple) -> bool:
+        return entry[2]._seq == entry[1]
+
+    def _compact(self):
+        """Reconstrói os heaps quando as entradas inválidas dominam."""
+        if len(self._by_deadline) > 64 and len(self._by_deadline) > 4 * self._live:
+            self._by_deadline = [e for e in self._by_deadline if self._is_live(e)]
+            self._by_latest = [e for e in self._by_latest if self._is_live(e)]
+            heapq.heapify(self._by_deadline)
+            heapq.heapify(self._by_latest)
+
+    def pending(self) -> int:
+        """Temporizadores ativos."""
+        return self._live
+
+    def next_wakeup(self) -> Optional[float]:
+        """Instante do próximo despertar (None se nada agendado)."""
+        while self._by_latest and not self._is_live(self._by_latest[0]):
+            heapq.heappop(self._by_latest)
+        return self._by_latest[0][0] if self._by_latest else None
+
+    def _rearm(self):
+        if self._running:
+            return
+        at = self.next_wakeup()
+        if at != self._armed_at:
+            self._armed_at = at
+            self._arm(at)
+
+    def _arm(self, at: Optional[float]):
+        """Arma o timer do sistema para `at` (None = desarmar). Sem efeito no núcleo."""
+
+    # Execução
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """
+        Dispara todos os temporizadores vencidos e rearma o despertar.
+        Retorna quantos callbacks foram chamados.
+        """
+        now = self.clock() if now is None else now
+        events = self._detect_clock_events(now)
+        self._armed_at = None
+        self._count_wakeup(now)
+        fired = 0
+        self._running = True
+        try:
+            self._reconcile(events)
+            while self._by_deadline and self._by_deadline[0][0] <= now:
+                entry = heapq.heappop(self._by_deadline)
+                if not self._is_live(entry):
+                    continue
+                timer = entry[2]
+                if timer.interval:
+                    # Repetição ancorada no prazo anterior; ciclos perdidos não se acumulam
+                    deadline = timer.deadline + timer.interval
+                    if deadline <= now:
+                        deadline = now + timer.interval
+                    self._push(timer, deadline)
+                else:
+                    timer.deadline = None
+                    timer._seq = -1
+                    self._live -= 1
+                fired += 1
+                try:
+                    timer.callback()
+                except Exception as e:  # Um callback com erro não pode parar os demais
+                    print(f"Erro no temporizador {timer.name or timer.callback!r}: {e}")
+        finally:
+            self._running = False
+        self.fired += fired
+        self._rearm()
+        return fired
+
+    def check_clocks(self) -> bool:
+        """
+        Verifica agora se houve suspensão ou salto de relógio (ex.: ao abrir um
+        menu com contagem regressiva) e, se sim, reconcilia e dispara o que
+        venceu sem esperar o próximo despertar. Retorna True se houve evento.
+        """
+        now = self.clock()
+        if not self._detect_clock_events(now):
+            return False
+        self.run_due(now)
+        return True
+
+    def _detect_clock_events(self, now: float) -> List[tuple]:
+        """Compara os relógios com o último despertar; não altera estado."""
+        events = []
+        # O timer do sistema conta só o tempo acordado: chegar bem depois do
+        # instante armado significa que o processo ficou parado
+        if self._armed_at is not None and now - self._armed_at > CLOCK_JUMP_THRESHOLD:
+            events.append((ClockEvent.SLEEP, now - self._armed_at))
+        if self.wall_clock is not None:
+            last_now, last_wall = self._last_check
+            drift = (self.wall_clock() - last_wall) - (now - last_now)
+            if abs(drift) > CLOCK_JUMP_THRESHOLD:
+                events.append((ClockEvent.WALL_JUMP, drift))
+        return events
+
+    def _reconcile(self, events: List[tuple]):
+        """Repassa os eventos aos ouvintes (dentro do despertar, antes dos disparos)."""
+        self._last_check = (self.clock(), self.wall_clock() if self.wall_clock else 0.0)
+        for event, seconds in events:
+            self.clock_events += 1
+            if event is ClockEvent.SLEEP:
+                print(f"Suspensão detectada (ao menos {seconds:.0f}s parado); reagendando")
+            else:
+                print(f"Relógio de parede ajustado em {seconds:+.0f}s; reagendando")
+            for callback in list(self._clock_listeners):
+                try:
+                    callback(event, seconds)
+                except Exception as e:
+                    print(f"Erro ao reconciliar relógio ({event.value}): {e}")
+
+    def _count_wakeup(self, now: float):
+        self.wakeups += 1
+        self._recent_wakeups.append(now)
+        while self._recent_wakeups and self._recent_wakeups[0] < now - HOUR:
+            self._recent_wakeups.popleft()
+
+    def wakeups_per_hour(self) -> float:
+        """
+        Despertares na última hora; antes de completar uma hora de execução,
+        a taxa é extrapolada.
+        """
+        now = self.clock()
+        while self._recent_wakeups and self._recent_wakeups[0] < now - HOUR:
+            self._recent_wakeups.popleft()
+        elapsed = now - self.started_at
+        if elapsed >= HOUR:
+            return float(len(self._recent_wakeups))
+        return len(self._recent_wakeups) * HOUR / max(elapsed, 1.0)
+
+    def report(self) -> str:
+        """Resumo para log/profiling."""
+        return (f"Agendador: {self.pending()} temporizadores ativos, "
+                f"{self.wakeups} despertares ({self.wakeups_per_hour():.0f}/h), "
+                f"{self.fired} disparos, {self.clock_events} saltos de relógio")
+
+
+class QtScheduler(Scheduler):
+    """
+    Agendador da aplicação: um único QTimer single-shot armado para o próximo
+    despertar, com o vigia de relógio ligado.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, wall_clock: Optional[Clock] = None):
+        from PyQt6.QtCore import QTimer, Qt
+
+        super().__init__(clock, wall_clock)
+        # PreciseTimer: a tolerância já está embutida no instante armado
+        self._qtimer = QTimer()
+        self._qtimer.setSingleShot(True)
+        self._qtimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._qtimer.timeout.connect(self._on_timeout)
+        self.start_watchdog()
+
+    def _arm(self, at: Optional[float]):
+        if at is None:
+            self._qtimer.stop()
+            return
+        delay_ms = max(0, math.ceil((at - self.clock()) * 1000))
+        self._qtimer.start(delay_ms)
+
+    def _on_timeout(self):
+        self.run_due()
+
+
+_default: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    """Agendador compartilhado da aplicação (criado no primeiro uso)."""
+    global _default
+    if _default is None:
+        _default = QtScheduler()
+    return _default
@@ -0,0 +1,250 @@
+"""
+Índice de busca incremental por trigramas.
+Usado pela paleta de comandos: as entradas são adicionadas, atualizadas e
+removidas uma a uma conforme os dados mudam, e cada consulta só visita as
+listas de postagem dos trigramas da busca.
+"""
+
+import heapq
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# Limites por consulta: com muitas entradas casando (buscas de 1-2 letras),
+# só parte dos candidatos é pontuada e o usuário refina digitando mais
+MAX_SCORED = 500
+MAX_VISITED = 5000
+SMALL_KIND = 200  # Tipos com até isso de entradas são sempre considerados
+# Entradas que começam com a consulta, pontuadas antes dos limites acima
+# (em ordem alfabética: a igual à consulta e as de palavra inteira vêm primeiro)
+MAX_PREFIX = 200
+PREFIX_REBUILD = 256  # Inserções pendentes que fazem a lista ordenada ser refeita
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sem acentos e com pontuação trocada por espaços."""
+    text = text.lower()
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text)
+                       if not unicodedata.combining(c))
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in text).split())
+
+
+def trigrams(norm: str) -> Set[str]:
+    """
+    Trigramas de cada palavra, com dois espaços à esquerda: "ab" gera
+    "  a" e " ab", então buscas de uma ou duas letras casam início de palavra.
+    """
+    grams = set()
+    for word in norm.split():
+        padded = '  ' + word
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchEntry:
+    """Entrada do índice. `payload` é repassado sem alteração a quem ativar o resultado."""
+
+    __slots__ = ('key', 'kind', 'title', 'detail', 'payload', 'norm')
+
+    def __init__(self, key: str, kind: str, title: str, detail: str = "",
+                 payload: Any = None, norm: str = ""):
+        self.key = key
+        self.kind = kind
+        self.title = title
+        self.detail = detail
+        self.payload = payload
+        self.norm = norm
+
+    def __repr__(self) -> str:
+        return f"SearchEntry(key={self.key!r}, kind={self.kind!r}, title={self.title!r})"
+
+
+class SearchIndex:
+    """
+    Índice invertido trigrama → chaves. A busca tolera erros de digitação:
+    basta casar cerca de 2/3 dos trigramas da consulta. Pelo princípio da casa
+    dos pombos, um resultado que pode errar `k` trigramas aparece em pelo menos
+    uma das `k + 1` listas mais curtas, então só essas são percorridas.
+
+    Uma lista ordenada (texto normalizado, chave) garante que as entradas que
+    começam com a consulta sejam pontuadas mesmo quando milhares casam.
+    """
+
+    def __init__(self, kind_order: Iterable[str] = ()):
+        self._entries: Dict[str, SearchEntry] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._by_kind: Dict[str, Dict[str, None]] = {}  # Ordem de inserção por tipo
+        # Tipos listados primeiro no desempate (ex.: ações antes de TODOs)
+        self._kind_rank = {kind: i for i, kind in enumerate(kind_order)}
+        # Ordenada sob demanda: inserções esperam em `_prefix_pending` e
+        # entradas removidas são ignoradas na consulta até a próxima reconstrução
+        self._prefix_sorted: List[Tuple[str, str]] = []
+        self._prefix_pending: List[Tuple[str, str]] = []
+        self._prefix_stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[SearchEntry]:
+        return self._entries.get(key)
+
+    def entries(self, kind: str) -> Iterator[SearchEntry]:
+        """Entradas de um tipo, na ordem em que foram adicionadas."""
+        for key in self._by_kind.get(kind, ()):
+            yield self._entries[key]
+
+    # Atualização
+
+    def add(self, key: str, kind: str, title: str, detail: str = "",
+            payload: Any = None, text: Optional[str] = None):
+        """
+        Adiciona ou substitui a entrada `key`. `text` é o texto indexado
+        (padrão: o título). Se o texto não mudou, só os campos são atualizados.
+        """
+        norm = normalize(text if text is not None else title)
+        old = self._entries.get(key)
+        if old is not None and old.kind == kind and old.norm == norm:
+            old.title, old.detail, old.payload = title, detail, payload
+            return
+        if old is not None:
+            self.remove(key)
+
+        self._entries[key] = SearchEntry(key, kind, title, detail, payload, norm)
+        self._by_kind.setdefault(kind, {})[key] = None
+        self._prefix_pending.append((norm, key))
+        for gram in trigrams(norm):
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = {key}
+            else:
+                posting.add(key)
+
+    def remove(self, key: str) -> bool:
+        """Remove a entrada; retorna False se ela não existia."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._by_kind[entry.kind].pop(key, None)
+        self._prefix_stale += 1
+        for gram in trigrams(entry.norm):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+        return True
+
+    def remove_kind(self, kind: str):
+        """Remove todas as entradas de um tipo."""
+        for key in list(self._by_kind.get(kind, ())):
+            self.remove(key)
+
+    def sync_kind(self, kind: str, items: Iterable[Tuple[str, str, str, Any]]):
+        """
+        Faz as entradas de `kind` ficarem iguais a `items` (key, título,
+        detalhe, payload), mexendo só no que mudou.
+        """
+        keep = set()
+        for key, title, detail, payload in items:
+            keep.add(key)
+            self.add(key, kind, title, detail, payload)
+        for key in [k for k in self._by_kind.get(kind, ()) if k not in keep]:
+            self.remove(key)
+
+    # Consulta
+
+    def search(self, query: str, limit: int = 20) -> List[SearchEntry]:
+        """Melhores entradas para a consulta, da mais relevante para a menos."""
+        q = normalize(query)
+        grams = trigrams(q)
+        if not grams:
+            return []
+
+        postings = sorted((self._postings.get(g, ()) for g in grams), key=len)
+        misses = len(postings) // 3
+
+        scored = []
+        seen: Set[str] = set()
+
+        def score(key: str):
+            missed = 0
+            for posting in postings:
+                if key not in posting:
+                    missed += 1
+                    if missed > misses:
+                        return
+            entry = self._entries[key]
+            norm = entry.norm
+            pos = norm.find(q)
+            word_start = pos == 0 or (pos > 0 and norm[pos - 1] == ' ')
+            scored.append(((missed, pos < 0, not word_start,
+                            self._kind_rank.get(entry.kind, len(self._kind_rank)),
+                            len(norm), key), entry))
+
+        # Entradas que começam com a consulta: fora dos limites, para que a
+        # melhor resposta nunca seja descartada por uma consulta genérica
+        for key in self._prefixed(q):
+            seen.add(key)
+            score(key)
+
+        # Candidatos: chaves das `misses + 1` listas mais curtas, percorridas
+        # sob demanda. Tipos pequenos (ações, abas) entram sempre primeiro.
+        budget = MAX_VISITED
+        prefixed = len(scored)
+        for key in self._candidates(postings[:misses + 1]):
+            if key in seen:
+                continue
+            seen.add(key)
+            budget -= 1
+            if budget < 0 or len(scored) - prefixed >= MAX_SCORED:
+                break
+            score(key)
+        return [entry for _, entry in heapq.nsmallest(limit, scored, key=lambda s: s[0])]
+
+    def _prefixed(self, q: str) -> Iterator[str]:
+        """Até `MAX_PREFIX` chaves cujo texto normalizado começa com `q`, em ordem alfabética."""
+        ordered = self._prefix_order()
+        found = 0
+        for i in range(bisect_left(ordered, (q,)), len(ordered)):
+            norm, key = ordered[i]
+            if not norm.startswith(q) or found >= MAX_PREFIX:
+                return
+            entry = self._entries.get(key)
+            if entry is not None and entry.norm == norm:  # Ignora entradas removidas
+                found += 1
+                yield key
+
+    def prepare(self):
+        """
+        Incorpora à lista ordenada as inserções pendentes. Chamado após uma
+        carga em massa, para que a primeira consulta não pague a ordenação.
+        """
+        self._prefix_order()
+
+    def _prefix_order(self) -> List[Tuple[str, str]]:
+        """Lista (texto, chave) ordenada, com as pendências incorporadas."""
+        pending = self._prefix_pending
+        if len(pending) > PREFIX_REBUILD or self._prefix_stale > len(self._entries):
+            self._prefix_sorted = sorted((e.norm, k) for k, e in self._entries.items())
+            self._prefix_stale = 0
+        else:
+            for item in pending:
+                insort(self._prefix_sorted, item)
+        pending.clear()
+        return self._prefix_sorted
+
+    def _candidates(self, postings: List[Set[str]]) -> Iterator[str]:
+        """Chaves candidatas: primeiro as dos tipos pequenos, por prioridade, depois as das listas."""
+        for kind in sorted(self._kind_rank, key=self._kind_rank.get):
+            keys = self._by_kind.get(kind, {})
+            if len(keys) <= SMALL_KIND:
+                for key in keys:
+                    if any(key in posting for posting in postings):
+                        yield key
+        for posting in postings:
+            yield from posting
@@ -3,11 +3,19 @@ Módulo de configurações do Wsi Break Time.
 Gerencia o carregamento e salvamento das preferências do usuário.
 """
 
+import copy
 import json
 import os
-from dataclasses import dataclass, field, asdict
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, fields, asdict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Set
+
+from persistence import WriteBehindPersister, atomic_write_text
+from settings_journal import JournalBaseline, SettingsJournal, apply_records
+from settings_cache import SettingsCache
 
 
 DEFAULT_MESSAGES = [
@@ -31,6 +39,7 @@ class AppSettings:
     show_pre_notification: bool = True
     pre_notification_seconds: int = 30
     water_reminder_interval: int = 0
+    idle_break_minutes: int = 5  # Ausência que conta como pausa natural (0 = desativado)
     play_sound: bool = False
     skip_challenge_texts: List[str] = field(default_factory=lambda: [
         "mantenha o foco",
@@ -56,6 +65,7 @@ class AppSettings:
         "a meta e clara",
     ])
     todos: List[dict] = field(default_factory=list)  # Lista de TODOs serializados
+    todo_storage: str = "sqlite"  # Backend dos TODOs: "sqlite" (todos.db) ou "json" (lista acima)
 
     # Configurações do Pomodoro
     pomodoro_work_duration: int = 25  # minutos
@@ -63,11 +73,44 @@ class AppSettings:
     pomodoro_long_break: int = 15  # minutos
     pomodoro_cycles_before_long: int = 4  # ciclos antes da pausa longa
 
+    # Perfis (trabalho, jogos, leitura...): cada um guarda só os campos que sobrescreve
+    profiles: Dict[str, dict] = field(default_factory=dict)
+    active_profile: str = ""  # "" = configurações base
+
+
+# Grupos de campos usados para reconfigurar só os componentes afetados
+TIMER_FIELDS = frozenset({
+    'break_interval', 'show_pre_notification', 'pre_notification_seconds', 'water_reminder_interval',
+})
+POMODORO_FIELDS = frozenset({
+    'pomodoro_work_duration', 'pomodoro_short_break', 'pomodoro_long_break', 'pomodoro_cycles_before_long',
+})
+OVERLAY_FIELDS = frozenset({'fixed_message', 'break_messages', 'skip_challenge_texts'})
+IDLE_FIELDS = frozenset({'idle_break_minutes'})
+
+# Campos compartilhados por todos os perfis (não podem ser sobrescritos)
+PROFILE_SHARED_FIELDS = frozenset({'todos', 'todo_storage', 'profiles', 'active_profile'})
+
+
+def diff_settings(old: AppSettings, new: AppSettings) -> Set[str]:
+    """Retorna os nomes dos campos com valores diferentes entre duas configurações."""
+    return {f.name for f in fields(AppSettings) if getattr(old, f.name) != getattr(new, f.name)}
+
+
+def _field_values(settings: AppSettings) -> dict:
+    """Cópia dos valores dos campos (exceto a lista de TODOs)."""
+    return {f.name: copy.deepcopy(getattr(settings, f.name))
+            for f in fields(settings) if f.name != 'todos'}
+
 
 class SettingsManager:
     """Gerenciador de configurações."""
 
-    def __init__(self, config_path: str = None):
+    SAVE_DELAY_MS = 500  # Janela para coalescer salvamentos consecutivos
+    JOURNAL_COMPACT_BYTES = 256 * 1024  # Tamanho do journal que dispara a compactação
+
+    def __init__(self, config_path: str = None, save_delay_ms: int = SAVE_DELAY_MS,
+                 journal_mode: bool = False):
         if config_path is None:
             app_data = os.getenv('APPDATA', os.path.expanduser('~'))
             self.config_dir = Path(app_data) / 'WsiBreakTime'
@@ -76,45 +119,410 @@ class SettingsManager:
             self.config_path = Path(config_path)
             self.config_dir = self.config_path.parent
 
-        self.settings = AppSettings()
+        # Modo journal: cada mutação é anexada a config.journal
+        self.journal_mode = journal_mode
+        self.journal = SettingsJournal(self.config_path.with_suffix('.journal'))
+        self._baseline = None
+
+        # Cache binário do config.json já processado
+        self.cache = SettingsCache(self.config_dir / 'cache' / 'settings.cache')
+        self._preloaded_todos = None
+        self.load_timing: dict = {}
+
+        # Estado do último snapshot em disco, para distinguir edições externas
+        self._snapshot_values: dict = {}
+        self._last_written_digest = None
+
+        # Cópia rasa da base à espera da thread de escrita (a mais recente vence)
+        self._pending_lock = threading.Lock()
+        self._pending_state = None
+
+        # Configurações base (o que é gravado) e visões resolvidas por perfil
+        self.base = AppSettings()
+        self._resolved: Dict[str, AppSettings] = {}
         self.load()
 
+        # Escrita em segundo plano (0 = escrita síncrona)
+        self._persister = None
+        if save_delay_ms > 0:
+            self._persister = WriteBehindPersister(self._write, delay_ms=save_delay_ms)
+
+        self.todo_store = self._open_todo_store()
+
     def load(self) -> AppSettings:
-        """Carrega as configurações do arquivo."""
+        """
+        Carrega as configurações do arquivo.
+        Usa o cache binário quando o config.json não mudou desde a última leitura.
+        """
+        from todo_model import TodoItem
+
+        start = time.perf_counter()
+        source = 'defaults'
+        settings = AppSettings()
+        todos = []
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                raw = self.config_path.read_bytes()
+                self._last_written_digest = SettingsCache.digest(raw)
+                cached = self.cache.load(self.config_path, raw, AppSettings)
+                if cached is not None:
+                    settings, todos = cached  # todos é None se o cache veio de uma gravação
+                    source = 'cache'
+                else:
+                    data = json.loads(raw.decode('utf-8'))
                     for key, value in data.items():
-                        if hasattr(self.settings, key):
-                            setattr(self.settings, key, value)
-        except (json.JSONDecodeError, IOError) as e:
+                        if hasattr(settings, key):
+                            setattr(settings, key, value)
+                    todos = [TodoItem.from_dict(d) for d in settings.todos]
+                    self.cache.store(self.config_path, raw, settings, todos)
+                    source = 'json'
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
             print(f"Erro ao carregar configurações: {e}")
+            settings, todos = AppSettings(), []
+
+        self.base = settings
+        self._resolved.clear()
+        self._preloaded_todos = todos
+        self._snapshot_values = _field_values(settings)
+
+        # Reaplica as mutações gravadas após o último snapshot
+        try:
+            if apply_records(self.base, self.journal.read()):
+                self._preloaded_todos = None  # O journal alterou a lista de TODOs
+        except (KeyError, TypeError, IOError) as e:
+            print(f"Erro ao ler journal de configurações: {e}")
+
+        self.load_timing = {'source': source, 'ms': (time.perf_counter() - start) * 1000}
+
+        if self.journal_mode:
+            self._baseline = JournalBaseline(self.base)
 
         return self.settings
 
+    @property
+    def settings(self) -> AppSettings:
+        """Configurações efetivas: base mais as sobrescritas do perfil ativo."""
+        return self._resolve(self.base.active_profile)
+
+    def _resolve(self, profile: str) -> AppSettings:
+        """
+        Retorna (e guarda em cache) a visão resolvida de um perfil.
+        A visão é uma cópia rasa da base; só os campos sobrescritos são substituídos.
+        """
+        if not profile or profile not in self.base.profiles:
+            return self.base
+        view = self._resolved.get(profile)
+        if view is None:
+            view = copy.copy(self.base)
+            for name, value in self.base.profiles[profile].items():
+                if name not in PROFILE_SHARED_FIELDS and hasattr(view, name):
+                    setattr(view, name, copy.deepcopy(value))
+            self._resolved[profile] = view
+        return view
+
+    def _set_base_field(self, name: str, value):
+        """Altera um campo da base e o propaga às visões que não o sobrescrevem."""
+        setattr(self.base, name, value)
+        for profile, view in self._resolved.items():
+            overrides = self.base.profiles.get(profile, {})
+            if name in PROFILE_SHARED_FIELDS or name not in overrides:
+                setattr(view, name, value)
+
+    def profile_names(self) -> List[str]:
+        """Nomes dos perfis cadastrados."""
+        return sorted(self.base.profiles)
+
+    @property
+    def active_profile(self) -> str:
+        """Perfil ativo ("" quando as configurações base estão em uso)."""
+        profile = self.base.active_profile
+        return profile if profile in self.base.profiles else ""
+
+    def create_profile(self, name: str, overrides: dict = None):
+        """Cria (ou substitui) um perfil com as sobrescritas informadas."""
+        profiles = dict(self.base.profiles)
+        profiles[name] = {k: copy.deepcopy(v) for k, v in (overrides or {}).items()
+                          if k not in PROFILE_SHARED_FIELDS}
+        self._resolved.pop(name, None)
+        self._set_base_field('profiles', profiles)
+        self.save()
+
+    def delete_profile(self, name: str) -> Set[str]:
+        """Remove um perfil; se for o ativo, volta à base e retorna os campos alterados."""
+        changed = set()
+        if name == self.active_profile:
+            changed = self.switch_profile("")
+        if name in self.base.profiles:
+            profiles = dict(self.base.profiles)
+            del profiles[name]
+            self._resolved.pop(name, None)
+            self._set_base_field('profiles', profiles)
+            self.save()
+        return changed
+
+    def switch_profile(self, name: str) -> Set[str]:
+        """
+        Ativa um perfil ("" = base) sem reler arquivos.
+        Só os campos sobrescritos pelo perfil antigo ou novo são comparados.
+        """
+        if name and name not in self.base.profiles:
+            raise KeyError(name)
+        if name == self.active_profile:
+            return set()
+
+        old_view = self.settings
+        candidates = set(self.base.profiles.get(self.active_profile, {}))
+        candidates |= set(self.base.profiles.get(name, {}))
+
+        self._set_base_field('active_profile', name)
+        new_view = self.settings
+        self.save()
+
+        return {f for f in candidates - PROFILE_SHARED_FIELDS
+                if getattr(old_view, f) != getattr(new_view, f)}
+
     def save(self) -> bool:
-        """Salva as configurações no arquivo."""
+        """
+        Salva as configurações no arquivo.
+        Aqui só é tirada uma cópia rasa da base; com escrita em segundo plano,
+        a gravação é agendada e o método retorna True.
+        """
+        self._capture()
+
+        if self._persister is not None:
+            self._persister.schedule()
+            return True
+
         try:
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self.settings), f, indent=2, ensure_ascii=False)
+            self._write()
             return True
-        except IOError as e:
+        except (IOError, OSError) as e:
             print(f"Erro ao salvar configurações: {e}")
             return False
 
+    def flush(self, timeout: float = None) -> bool:
+        """Grava imediatamente qualquer salvamento pendente."""
+        if self._persister is None:
+            return True
+        return self._persister.flush(timeout)
+
+    def close(self, timeout: float = None):
+        """Grava pendências, compacta o journal e encerra a thread de escrita."""
+        self.todo_store.close()
+        if self._persister is not None:
+            self._persister.stop(timeout)
+            stats = self._persister.stats()
+            print(f"Configurações: {stats['requests']} salvamentos pedidos, "
+                  f"{stats['coalesced']} coalescidos, {stats['writes']} gravações")
+
+        if self.journal_mode and self.journal.size() > 0:
+            try:
+                self.compact()
+            except (IOError, OSError) as e:
+                print(f"Erro ao compactar journal de configurações: {e}")
+
+    def compact(self):
+        """Grava um novo snapshot com o estado atual e esvazia o journal."""
+        self.flush()  # A thread de escrita fica ociosa; a gravação abaixo é síncrona
+        self._capture()
+        self._write(snapshot=True)
+
+    def apply(self, new_settings: AppSettings) -> Set[str]:
+        """
+        Aplica campo a campo as configurações editadas sobre as atuais.
+        Com um perfil ativo, as alterações viram sobrescritas desse perfil
+        (copy-on-write); sem perfil, vão para a base.
+        Retorna os campos alterados (vazio se nada mudou, sem gravar).
+        """
+        view = self.settings
+        profile = self.active_profile
+        changed = diff_settings(view, new_settings) - PROFILE_SHARED_FIELDS
+
+        overrides = None
+        if profile:
+            overrides = dict(self.base.profiles[profile])
+
+        for name in changed:
+            value = copy.deepcopy(getattr(new_settings, name))
+            if overrides is None:
+                self._set_base_field(name, value)
+                continue
+            if value == getattr(self.base, name):
+                overrides.pop(name, None)
+            else:
+                overrides[name] = copy.deepcopy(value)
+            setattr(view, name, value)
+
+        if changed and overrides is not None:
+            profiles = dict(self.base.profiles)
+            profiles[profile] = overrides
+            self._set_base_field('profiles', profiles)  # A visão já foi atualizada acima
+        if changed:
+            self.save()
+        return changed
+
+    def is_own_write(self) -> bool:
+        """Verifica se o config.json em disco é o último conteúdo lido ou gravado por este processo."""
+        try:
+            raw = self.config_path.read_bytes()
+        except OSError:
+            return False
+        return SettingsCache.digest(raw) == self._last_written_digest
+
+    def reload(self) -> Set[str]:
+        """
+        Relê o config.json após uma edição externa e aplica os campos que
+        mudaram em relação ao snapshot anterior. Retorna os campos alterados.
+        O conteúdo da última gravação concluída (hash atualizado pela thread de
+        escrita só depois que o arquivo chega ao disco) é ignorado.
+        """
+        try:
+            raw = self.config_path.read_bytes()
+            if SettingsCache.digest(raw) == self._last_written_digest:
+                return set()
+            data = json.loads(raw.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
+            print(f"Erro ao recarregar configurações: {e}")
+            return set()
+
+        before = self.settings
+        before_values = {f.name: getattr(before, f.name) for f in fields(AppSettings)}
+
+        edited = set()
+        for name, value in data.items():
+            if name == 'todos' or not hasattr(self.base, name):
+                continue
+            if value == self._snapshot_values.get(name):
+                continue  # Não foi editado externamente
+            self._snapshot_values[name] = copy.deepcopy(value)
+            if getattr(self.base, name) != value:
+                self._set_base_field(name, value)
+                edited.add(name)
+
+        if not edited:
+            return set()
+
+        if 'profiles' in edited:
+            self._resolved.clear()
+
+        # Edições externas prevalecem sobre o journal: grava um snapshot consolidado
+        self.flush()
+        if self.journal_mode:
+            self.compact()
+
+        after = self.settings
+        return {name for name, value in before_values.items()
+                if name not in PROFILE_SHARED_FIELDS and getattr(after, name) != value}
+
+    def write_stats(self) -> dict:
+        """Retorna os contadores de salvamentos pedidos, coalescidos e gravados."""
+        if self._persister is None:
+            return {}
+        return self._persister.stats()
+
+    def _capture(self):
+        """
+        Guarda uma cópia rasa da base para a próxima gravação. Os campos são
+        sempre substituídos, nunca alterados no lugar, exceto a lista de TODOs
+        (o `JsonTodoStore` anexa a ela), que por isso também é copiada.
+        """
+        state = copy.copy(self.base)
+        state.todos = list(self.base.todos)
+        with self._pending_lock:
+            self._pending_state = state
+
+    def _write(self, snapshot: bool = False):
+        """
+        Grava a última cópia capturada: registros do journal (com compactação
+        ao passar de `JOURNAL_COMPACT_BYTES`) ou um snapshot completo. Roda na
+        thread de escrita; serialização, hash e fsync ficam todos aqui.
+        """
+        with self._pending_lock:
+            state, self._pending_state = self._pending_state, None
+        if state is None:
+            return
+
+        if self.journal_mode and not snapshot:
+            self.journal.append(self._baseline.diff(state))
+            if self.journal.size() <= self.JOURNAL_COMPACT_BYTES:
+                return
+        self._write_snapshot(state)
+
+    def _write_snapshot(self, state: AppSettings):
+        """
+        Serializa e grava o config.json de forma atômica, esvazia o journal e
+        renova o cache. O estado do último snapshot só muda depois que a
+        gravação chegou ao disco.
+        """
+        data = asdict(state)
+        snapshot = AppSettings(**data)
+        raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        digest = SettingsCache.digest(raw)
+        atomic_write_text(self.config_path, raw.decode('utf-8'))
+        self._last_written_digest = digest
+        self._snapshot_values = _field_values(snapshot)
+        if self.journal.size() > 0:
+            self.journal.truncate()  # O snapshot já contém essas mutações
+        if self._baseline is not None:
+            self._baseline.reset(snapshot)
+        # Os TODOs vão como dicionários (em settings.todos); não são reconstruídos a cada gravação
+        self.cache.store(self.config_path, raw, snapshot, None)
+
+    def startup_report(self) -> str:
+        """Resumo do tempo de carregamento das configurações nesta inicialização."""
+        source = self.load_timing.get('source', '?')
+        labels = {'cache': 'cache binário', 'json': 'config.json', 'defaults': 'padrões'}
+        return f"Configurações carregadas de {labels.get(source, source)} " \
+               f"em {self.load_timing.get('ms', 0):.1f} ms"
+
     def reset_to_defaults(self):
         """Restaura as configurações padrão."""
-        self.settings = AppSettings()
+        self.base = AppSettings()
+        self._resolved.clear()
         self.save()
 
+    def _open_todo_store(self):
+        """
+        Abre o backend de TODOs configurado. No primeiro uso do SQLite, a lista
+        do config.json é migrada para o banco e removida das configurações.
+        """
+        from todo_store import JsonTodoStore, SqliteTodoStore
+
+        if self.base.todo_storage != "sqlite":
+            return JsonTodoStore(self)
+
+        try:
+            store = SqliteTodoStore(self.config_dir / 'todos.db')
+            if not store.is_migrated():
+                migrated = store.migrate_from_json(self.base.todos)
+                if self.base.todos:
+                    print(f"{migrated} TODOs migrados do config.json para o SQLite")
+                    self._set_base_field('todos', [])
+                    self.save()
+            return store
+        except sqlite3.Error as e:
+            print(f"Erro ao abrir banco de TODOs, usando config.json: {e}")
+            return JsonTodoStore(self)
+
     def get_todos(self) -> list:
         """Retorna a lista de TODOs como objetos TodoItem."""
-        from todo_model import TodoItem
-        return [TodoItem.from_dict(d) for d in self.settings.todos]
+        from todo_store import JsonTodoStore
 
-    def save_todos(self, todos: list):
-        """Salva a lista de TODOs."""
-        self.settings.todos = [t.to_dict() for t in todos]
-        self.save()
+        # Na primeira chamada, reaproveita os objetos restaurados pelo load()
+        todos, self._preloaded_todos = self._preloaded_todos, None
+        if todos is not None and isinstance(self.todo_store, JsonTodoStore):
+            return todos
+        return self.todo_store.load()
+
+    def get_working_todos(self) -> list:
+        """Retorna só o conjunto de trabalho dos TODOs (pendentes, recorrentes e agendados)."""
+        from todo_store import JsonTodoStore, in_working_set
+
+        todos, self._preloaded_todos = self._preloaded_todos, None
+        if todos is not None and isinstance(self.todo_store, JsonTodoStore):
+            return [t for t in todos if in_working_set(t)]
+        return self.todo_store.load_working_set()
+
+    def save_todos(self, todos):
+        """Salva os TODOs (lista ou visão somente leitura do TodoManager)."""
+        self.todo_store.save_all(todos)
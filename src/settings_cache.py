@@ -0,0 +1,90 @@
+"""
+Cache binário das configurações já processadas.
+Evita reprocessar o config.json a cada inicialização quando ele não mudou.
+"""
+
+import hashlib
+import os
+import pickle
+from dataclasses import fields
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class SettingsCache:
+    """
+    Snapshot em pickle de `AppSettings` e dos `TodoItem` já construídos.
+
+    A entrada é válida somente se o mtime, o tamanho e o hash do conteúdo do
+    config.json coincidirem com os registrados, e se os campos de
+    `AppSettings` forem os mesmos da versão que gravou o cache.
+    """
+
+    VERSION = 3  # 3: TodoItem com regra de recorrência e próxima ocorrência
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+
+    @staticmethod
+    def _schema(settings_cls) -> Tuple[str, ...]:
+        return tuple(f.name for f in fields(settings_cls))
+
+    @staticmethod
+    def digest(raw: bytes) -> str:
+        """Hash do conteúdo do config.json."""
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def load(self, config_path: Path, raw: bytes, settings_cls) -> Optional[tuple]:
+        """
+        Retorna (settings, todos) se o cache corresponder ao arquivo atual
+        (todos é None quando o cache guardou só os dicionários).
+        Qualquer falha (cache ausente, antigo ou corrompido) retorna None.
+        """
+        try:
+            stat = os.stat(config_path)
+            with open(self.cache_path, 'rb') as f:
+                entry = pickle.load(f)
+            if (entry.get('version') != self.VERSION
+                    or entry.get('schema') != self._schema(settings_cls)
+                    or entry.get('mtime_ns') != stat.st_mtime_ns
+                    or entry.get('size') != stat.st_size
+                    or entry.get('digest') != self.digest(raw)):
+                return None
+            settings = entry['settings']
+            if not isinstance(settings, settings_cls):
+                return None
+            return settings, entry['todos']
+        except Exception:
+            # Cache corrompido ou incompatível: volta ao caminho JSON
+            return None
+
+    def store(self, config_path: Path, raw: bytes, settings, todos: Optional[List]):
+        """
+        Grava o cache para o conteúdo atual do config.json.
+        `todos` pode ser None: os TODOs ficam só como dicionários em `settings.todos`.
+        """
+        try:
+            stat = os.stat(config_path)
+            entry = {
+                'version': self.VERSION,
+                'schema': self._schema(type(settings)),
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'digest': self.digest(raw),
+                'settings': settings,
+                'todos': todos,
+            }
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Erro ao gravar cache de configurações: {e}")
+
+    def clear(self):
+        """Remove o cache."""
+        try:
+            self.cache_path.unlink()
+        except OSError:
+            pass
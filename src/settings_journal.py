@@ -0,0 +1,162 @@
+"""
+Journal de mutações das configurações.
+Cada alteração é anexada como um registro JSON compacto por linha; o
+config.json passa a ser apenas o snapshot da última compactação.
+"""
+
+import copy
+import json
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+
+# Campos de um TODO cuja alteração isolada é registrada como mudança de status
+TODO_STATUS_FIELDS = frozenset({'status', 'completed_at', 'last_reset_date',
+                                'next_occurrence', 'occurrence_at'})
+
+
+class JournalBaseline:
+    """
+    Cópia do último estado gravado em disco (snapshot + journal).
+    Serve de referência para gerar apenas os registros que mudaram.
+    """
+
+    def __init__(self, settings):
+        self.values: Dict[str, object] = {}
+        self.todos: Dict[str, dict] = {}
+        self.reset(settings)
+
+    def reset(self, settings):
+        """Recaptura o estado completo das configurações."""
+        self.values = {
+            f.name: copy.deepcopy(getattr(settings, f.name))
+            for f in fields(settings) if f.name != 'todos'
+        }
+        self.todos = {d['id']: dict(d) for d in settings.todos if 'id' in d}
+
+    def diff(self, settings) -> List[dict]:
+        """
+        Gera os registros que levam o baseline ao estado atual e o atualiza.
+        O custo de E/S é proporcional às mudanças, não ao estado total.
+        """
+        records = []
+
+        for name, old in self.values.items():
+            value = getattr(settings, name)
+            if value != old:
+                records.append({'op': 'set', 'k': name, 'v': value})
+                self.values[name] = copy.deepcopy(value)
+
+        seen = set()
+        for data in settings.todos:
+            todo_id = data.get('id')
+            if todo_id is None:
+                continue
+            seen.add(todo_id)
+            old = self.todos.get(todo_id)
+            if old is None:
+                records.append({'op': 'add', 'v': data})
+            elif data != old:
+                changed = {k: v for k, v in data.items() if k not in old or old[k] != v}
+                op = 'status' if changed.keys() <= TODO_STATUS_FIELDS else 'upd'
+                records.append({'op': op, 'id': todo_id, 'v': changed})
+            else:
+                continue
+            self.todos[todo_id] = dict(data)
+
+        for todo_id in [tid for tid in self.todos if tid not in seen]:
+            records.append({'op': 'del', 'id': todo_id})
+            del self.todos[todo_id]
+
+        return records
+
+
+def apply_records(settings, records: Iterator[dict]) -> bool:
+    """
+    Reaplica registros do journal sobre as configurações carregadas.
+    Retorna True se algum registro alterou a lista de TODOs.
+    """
+    todos = None
+    for record in records:
+        op = record.get('op')
+        if op in ('add', 'upd', 'status', 'del') and todos is None:
+            todos = {d['id']: d for d in settings.todos if 'id' in d}
+        if op == 'set':
+            if hasattr(settings, record['k']) and record['k'] != 'todos':
+                setattr(settings, record['k'], record['v'])
+        elif op == 'add':
+            data = record['v']
+            todos[data['id']] = dict(data)
+        elif op in ('upd', 'status'):
+            data = todos.get(record['id'])
+            if data is not None:
+                data.update(record['v'])
+        elif op == 'del':
+            todos.pop(record['id'], None)
+    if todos is None:
+        return False
+    settings.todos = list(todos.values())
+    return True
+
+
+class SettingsJournal:
+    """Arquivo append-only com um registro de mutação por linha."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def size(self) -> int:
+        """Tamanho atual do journal em bytes."""
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def read(self) -> Iterator[dict]:
+        """
+        Lê os registros em ordem. Linhas corrompidas (ex.: última linha
+        truncada por uma queda) são ignoradas.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def append(self, records: List[dict]):
+        """Anexa os registros e força a gravação em disco."""
+        if not records:
+            return
+        payload = ''.join(
+            json.dumps(r, separators=(',', ':'), ensure_ascii=False) + '\n' for r in records
+        )
+        if self._ends_with_partial_line():
+            payload = '\n' + payload
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ends_with_partial_line(self) -> bool:
+        """Verifica se uma escrita anterior foi interrompida no meio da linha."""
+        if self.size() == 0:
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def truncate(self):
+        """Esvazia o journal (após a compactação em um novo snapshot)."""
+        if self.path.exists():
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,46 @@
+"""
+Sinais sem Qt para os núcleos de agendamento (timer, Pomodoro, TODOs).
+Têm o mesmo uso de `pyqtSignal` (connect/disconnect/emit): os gerenciadores
+Qt herdam do núcleo e redeclaram cada sinal como `pyqtSignal`, de modo que o
+mesmo código emite sinais Qt na aplicação e callbacks simples na simulação.
+"""
+
+from typing import Callable, List
+
+
+class BoundSignal:
+    """Sinal de uma instância: chama os slots em ordem de conexão."""
+
+    __slots__ = ('_slots',)
+
+    def __init__(self):
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable):
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Callable):
+        self._slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class Signal:
+    """Declaração de sinal na classe (os tipos são só documentação, como no pyqtSignal)."""
+
+    def __init__(self, *types):
+        self.types = types
+        self._attr = ""
+
+    def __set_name__(self, owner, name: str):
+        self._attr = f"_signal_{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__.get(self._attr)
+        if bound is None:
+            bound = obj.__dict__[self._attr] = BoundSignal()
+        return bound
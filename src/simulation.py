@@ -0,0 +1,70 @@
+"""
+Execução acelerada dos núcleos de agendamento, sem Qt.
+`VirtualScheduler` é o agendador com relógio virtual: em vez de armar um
+timer do sistema, avança o relógio direto para o próximo despertar, então
+meses de pausas, Pomodoros e TODOs recorrentes rodam em segundos, com o
+mesmo código (e as mesmas tolerâncias) da aplicação.
+"""
+
+from typing import Optional
+
+from scheduler import Scheduler
+
+
+class VirtualClock:
+    """
+    Relógio monotônico virtual (`now`, em segundos) com o relógio de parede
+    ancorado em `epoch`. Saltos do relógio de parede mudam só o `epoch`.
+    """
+
+    def __init__(self, epoch: float = 0.0):
+        self.now = 0.0
+        self.epoch = epoch
+
+    def __call__(self) -> float:
+        return self.now
+
+    def wall(self) -> float:
+        return self.epoch + self.now
+
+
+class VirtualScheduler(Scheduler):
+    """
+    Agendador dirigido pelo relógio virtual. Cada despertar acontece
+    exatamente no instante que a aplicação armaria no timer do sistema.
+    """
+
+    def __init__(self, epoch: float = 0.0, clock: Optional[VirtualClock] = None):
+        self.virtual_clock = clock or VirtualClock(epoch)
+        super().__init__(self.virtual_clock, self.virtual_clock.wall)
+
+    def run_until(self, until: float) -> int:
+        """Executa todos os despertares até `until` (relógio monotônico); retorna quantos."""
+        clock = self.virtual_clock
+        count = 0
+        while self._armed_at is not None and self._armed_at <= until:
+            clock.now = max(clock.now, self._armed_at)
+            self.run_due()
+            count += 1
+        clock.now = max(clock.now, until)
+        return count
+
+    def advance(self, seconds: float) -> int:
+        """Avança `seconds` segundos de uso normal."""
+        return self.run_until(self.virtual_clock.now + seconds)
+
+    def run_until_wall(self, wall: float) -> int:
+        """Avança até o horário de parede `wall` (epoch)."""
+        return self.run_until(wall - self.virtual_clock.epoch)
+
+    def suspend(self, seconds: float):
+        """
+        Máquina suspensa por `seconds`: nada desperta no período (o relógio
+        continua contando, como o CLOCK_BOOTTIME) e o processo acorda na volta.
+        """
+        self.virtual_clock.now += seconds
+        self.run_due()
+
+    def jump_wall_clock(self, seconds: float):
+        """Ajuste do relógio de parede (NTP, fuso); notado no próximo despertar."""
+        self.virtual_clock.epoch += seconds
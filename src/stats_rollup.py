@@ -0,0 +1,359 @@
+"""
+Estatísticas de pausas agregadas de forma incremental.
+Cada evento do log soma em baldes por hora, dia, semana e mês (horário
+local); o painel consulta os baldes, nunca o histórico bruto. Os agregados
+são salvos junto com cada lote do log e, ao abrir, só os eventos ainda não
+agregados são relidos.
+"""
+
+import json
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from event_log import EventLogReader, EventLogWriter, EventRecord, EventType
+from persistence import atomic_write_text
+
+
+HOUR = 'hour'
+DAY = 'day'
+WEEK = 'week'
+MONTH = 'month'
+GRANULARITIES = (HOUR, DAY, WEEK, MONTH)
+
+# Limites superiores (segundos) das faixas do histograma de tempo até a
+# confirmação; a última faixa recebe tudo acima de 1 h
+LATENCY_BOUNDS = (10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+class StatsBucket:
+    """Contadores e somas de um intervalo de tempo."""
+
+    __slots__ = ('breaks', 'confirmed', 'break_seconds', 'idle_breaks', 'idle_seconds',
+                 'pomodoro_cycles', 'focus_seconds', 'todos_completed', 'latency')
+
+    def __init__(self):
+        self.breaks = 0  # pausas iniciadas
+        self.confirmed = 0  # pausas confirmadas
+        self.break_seconds = 0.0  # soma do tempo até a confirmação
+        self.idle_breaks = 0  # pausas naturais (ausência)
+        self.idle_seconds = 0.0
+        self.pomodoro_cycles = 0
+        self.focus_seconds = 0.0  # soma dos períodos de trabalho do Pomodoro
+        self.todos_completed = 0
+        self.latency = [0] * (len(LATENCY_BOUNDS) + 1)
+
+    def add(self, other: 'StatsBucket'):
+        """Soma outro balde a este."""
+        for name in self.__slots__[:-1]:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.latency = [a + b for a, b in zip(self.latency, other.latency)]
+
+    @property
+    def rest_seconds(self) -> float:
+        """Tempo longe da tela: pausas confirmadas mais pausas naturais."""
+        return self.break_seconds + self.idle_seconds
+
+    @property
+    def mean_latency(self) -> float:
+        """Tempo médio (segundos) até confirmar uma pausa."""
+        return self.break_seconds / self.confirmed if self.confirmed else 0.0
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """
+        Limite superior (segundos) da faixa que contém o quantil `q` (0..1)
+        do tempo até a confirmação; None se não houve confirmação ou se ele
+        cai acima da última faixa.
+        """
+        if not self.confirmed:
+            return None
+        target = q * self.confirmed
+        seen = 0
+        for bound, count in zip(LATENCY_BOUNDS, self.latency):
+            seen += count
+            if seen >= target:
+                return float(bound)
+        return None
+
+    def to_list(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values: list) -> 'StatsBucket':
+        bucket = cls()
+        for name, value in zip(cls.__slots__, values):
+            setattr(bucket, name, value)
+        if len(bucket.latency) != len(LATENCY_BOUNDS) + 1:
+            raise ValueError("Histograma com faixas diferentes")
+        return bucket
+
+
+def bucket_key(granularity: str, moment: datetime) -> int:
+    """Chave inteira do balde que contém `moment` (horário local)."""
+    if granularity == HOUR:
+        return moment.toordinal() * 24 + moment.hour
+    if granularity == DAY:
+        return moment.toordinal()
+    if granularity == WEEK:
+        return moment.toordinal() - moment.weekday()  # Segunda-feira
+    if granularity == MONTH:
+        return moment.year * 12 + moment.month - 1
+    raise ValueError(f"Granularidade desconhecida: {granularity}")
+
+
+def bucket_start(granularity: str, key: int) -> datetime:
+    """Início (horário local) do balde `key`."""
+    if granularity == HOUR:
+        day, hour = divmod(key, 24)
+        return datetime.combine(date.fromordinal(day), datetime.min.time()) + timedelta(hours=hour)
+    if granularity in (DAY, WEEK):
+        return datetime.combine(date.fromordinal(key), datetime.min.time())
+    if granularity == MONTH:
+        year, month = divmod(key, 12)
+        return datetime(year, month + 1, 1)
+    raise ValueError(f"Granularidade desconhecida: {granularity}")
+
+
+class StatsRollup:
+    """
+    Agregados por hora, dia, semana e mês, mais o total geral e a sequência
+    de dias com pausa. `apply()` custa O(1) por evento; as consultas custam
+    O(baldes) do intervalo pedido.
+
+    O arquivo guarda quantos registros do log já foram agregados e o
+    timestamp do primeiro deles; se o log foi recriado, os agregados são
+    refeitos do zero. Os baldes por hora só são mantidos pelos últimos
+    `HOURLY_RETENTION_DAYS` dias.
+    """
+
+    VERSION = 1
+    HOURLY_RETENTION_DAYS = 92
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._reset()
+        self._dirty = False
+
+        # Estatísticas
+        self.replayed = 0  # eventos relidos do log ao abrir
+        self.saves = 0
+
+    def _reset(self):
+        self.buckets: Dict[str, Dict[int, StatsBucket]] = {g: {} for g in GRANULARITIES}
+        self.total = StatsBucket()
+        self.position = 0  # registros do log já agregados
+        self.log_origin: Optional[float] = None  # timestamp do primeiro registro
+        self.last_active_day: Optional[int] = None
+        self.current_streak = 0
+        self.best_streak = 0
+        self._span: Optional[Tuple[float, float]] = None  # hora (epoch) dos baldes em cache
+        self._span_targets: List[StatsBucket] = []
+        self._span_day = 0
+
+    # Persistência
+
+    def load(self) -> bool:
+        """Carrega os agregados salvos. Qualquer falha começa do zero."""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') != self.VERSION or data.get('latency_bounds') != list(LATENCY_BOUNDS):
+                return False
+            buckets = {g: {int(k): StatsBucket.from_list(v) for k, v in data['buckets'][g].items()}
+                       for g in GRANULARITIES}
+            total = StatsBucket.from_list(data['total'])
+            state = (data['position'], data['log_origin'], data['last_active_day'],
+                     data['current_streak'], data['best_streak'])
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Erro ao carregar estatísticas: {e}")
+            return False
+        self.buckets = buckets
+        self.total = total
+        self._span = None
+        (self.position, self.log_origin, self.last_active_day,
+         self.current_streak, self.best_streak) = state
+        return True
+
+    def save(self):
+        """Grava os agregados (só se mudaram desde a última gravação)."""
+        if not self._dirty:
+            return
+        self._prune_hours()
+        data = {
+            'version': self.VERSION,
+            'latency_bounds': list(LATENCY_BOUNDS),
+            'position': self.position,
+            'log_origin': self.log_origin,
+            'last_active_day': self.last_active_day,
+            'current_streak': self.current_streak,
+            'best_streak': self.best_streak,
+            'total': self.total.to_list(),
+            'buckets': {g: {str(k): b.to_list() for k, b in self.buckets[g].items()}
+                        for g in GRANULARITIES},
+        }
+        try:
+            atomic_write_text(self.path, json.dumps(data, separators=(',', ':')))
+        except OSError as e:
+            print(f"Erro ao salvar estatísticas: {e}")
+            return
+        self._dirty = False
+        self.saves += 1
+
+    def _prune_hours(self):
+        hours = self.buckets[HOUR]
+        if not hours or self.last_active_day is None:
+            return
+        oldest = (self.last_active_day - self.HOURLY_RETENTION_DAYS) * 24
+        for key in [k for k in hours if k < oldest]:
+            del hours[key]
+        self._span = None
+
+    # Sincronização com o log
+
+    def catch_up(self, log_path: Path):
+        """
+        Agrega os registros do log que ainda não estão nos agregados salvos
+        (queda antes de salvar, ou estatísticas apagadas).
+        """
+        with EventLogReader(log_path) as reader:
+            count = len(reader)
+            origin = reader.record(0).ts if count else None
+            if self.position > count or (self.position and origin != self.log_origin):
+                print("Log de eventos diferente do agregado: refazendo estatísticas")
+                self._reset()
+                self._dirty = True
+            before = self.position
+            for record in reader.records(self.position):
+                self.apply(record)
+            self.replayed += self.position - before
+
+    def attach(self, writer: EventLogWriter):
+        """
+        Passa a agregar cada evento acrescentado ao log e a salvar depois de
+        cada lote gravado. Chame depois de `catch_up()`, sem lote pendente.
+        """
+        writer.add_listener(self.apply)
+        writer.add_flush_listener(self.save)
+
+    # Agregação
+
+    def apply(self, record: EventRecord):
+        """Soma um evento a todos os baldes que o contêm."""
+        if self.position == 0:
+            self.log_origin = record.ts
+        self.position += 1
+        self._dirty = True
+
+        kind = record.kind
+        if kind not in _COUNTED:
+            return
+        targets = self._targets_at(record.ts)
+        seconds = record.duration
+        if kind == EventType.BREAK_STARTED:
+            for bucket in targets:
+                bucket.breaks += 1
+        elif kind == EventType.BREAK_ENDED:
+            slot = bisect_right(LATENCY_BOUNDS, seconds - 1e-9)
+            for bucket in targets:
+                bucket.confirmed += 1
+                bucket.break_seconds += seconds
+                bucket.latency[slot] += 1
+            self._mark_active(self._span_day)
+        elif kind == EventType.IDLE_BREAK:
+            for bucket in targets:
+                bucket.idle_breaks += 1
+                bucket.idle_seconds += seconds
+            self._mark_active(self._span_day)
+        elif kind == EventType.POMODORO_CYCLE:
+            for bucket in targets:
+                bucket.pomodoro_cycles += 1
+                bucket.focus_seconds += seconds
+        elif kind == EventType.TODO_COMPLETED:
+            for bucket in targets:
+                bucket.todos_completed += 1
+
+    def _targets_at(self, ts: float) -> List[StatsBucket]:
+        """
+        Baldes que contêm `ts`. Os eventos chegam em ordem, então a lista da
+        hora corrente é reaproveitada até o próximo evento cair fora dela.
+        """
+        if self._span is not None and self._span[0] <= ts < self._span[1]:
+            return self._span_targets
+        moment = datetime.fromtimestamp(ts)
+        targets = [self.total]
+        for granularity in GRANULARITIES:
+            table = self.buckets[granularity]
+            key = bucket_key(granularity, moment)
+            bucket = table.get(key)
+            if bucket is None:
+                bucket = table[key] = StatsBucket()
+            targets.append(bucket)
+        hour_start = moment.replace(minute=0, second=0, microsecond=0).timestamp()
+        self._span = (hour_start, hour_start + 3600)
+        self._span_targets = targets
+        self._span_day = moment.toordinal()
+        return targets
+
+    def _mark_active(self, day: int):
+        """Atualiza a sequência de dias seguidos com alguma pausa."""
+        if day == self.last_active_day:
+            return
+        if self.last_active_day is not None and day == self.last_active_day + 1:
+            self.current_streak += 1
+        else:
+            self.current_streak = 1
+        self.last_active_day = day
+        self.best_streak = max(self.best_streak, self.current_streak)
+
+    # Consultas
+
+    def series(self, granularity: str, start: datetime, end: datetime) -> List[Tuple[datetime, StatsBucket]]:
+        """Baldes não vazios de `granularity` que começam em [start, end), em ordem."""
+        table = self.buckets[granularity]
+        first = bucket_key(granularity, start)
+        if bucket_start(granularity, first) < start:
+            first += 1 if granularity != WEEK else 7
+        last = bucket_key(granularity, end)
+        if bucket_start(granularity, last) < end:
+            last += 1 if granularity != WEEK else 7
+        if last - first > len(table):
+            keys = sorted(k for k in table if first <= k < last)
+        else:
+            keys = [k for k in range(first, last) if k in table]
+        return [(bucket_start(granularity, k), table[k]) for k in keys]
+
+    def totals(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> StatsBucket:
+        """Soma dos dias em [start, end); sem intervalo, o total geral."""
+        if start is None and end is None:
+            return self.total
+        start = start or datetime.min
+        end = end or datetime.max
+        result = StatsBucket()
+        for _, bucket in self.series(DAY, start, end):
+            result.add(bucket)
+        return result
+
+    def streak(self, today: Optional[date] = None) -> int:
+        """Dias seguidos com pausa até hoje (ou ontem, se hoje ainda não houve)."""
+        if self.last_active_day is None:
+            return 0
+        today = (today or date.today()).toordinal()
+        return self.current_streak if today - self.last_active_day <= 1 else 0
+
+    def hour_profile(self, days: Iterable[date]) -> List[StatsBucket]:
+        """Soma, por hora do dia (0..23), dos baldes horários dos dias informados."""
+        hours = self.buckets[HOUR]
+        profile = [StatsBucket() for _ in range(24)]
+        for day in days:
+            base = day.toordinal() * 24
+            for hour in range(24):
+                bucket = hours.get(base + hour)
+                if bucket is not None:
+                    profile[hour].add(bucket)
+        return profile
+
+
+_COUNTED = frozenset((EventType.BREAK_STARTED, EventType.BREAK_ENDED, EventType.IDLE_BREAK,
+                      EventType.POMODORO_CYCLE, EventType.TODO_COMPLETED))
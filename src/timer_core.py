@@ -0,0 +1,243 @@
+"""
+Núcleo do timer de pausas, sem Qt.
+Controla os intervalos entre pausas e os lembretes de confirmação de sessão
+sobre o agendador único; o relógio vem do agendador (real ou virtual).
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from scheduler import ClockEvent, Scheduler, get_scheduler
+from signals import Signal
+
+
+class TimerCore:
+    """Máquina de estados das pausas (ver `TimerManager` para o adaptador Qt)."""
+
+    break_starting = Signal()
+    break_started = Signal()
+    break_ended = Signal()
+    pre_notification = Signal(int)
+    water_reminder = Signal()
+    confirmation_reminder = Signal()
+
+    REMINDER_INTERVAL = 60  # segundos
+    SLEEP_AS_BREAK = 60  # Suspensão a partir disso (segundos) conta como pausa feita
+
+    def __init__(self, scheduler: Optional[Scheduler] = None, **kwargs):
+        super().__init__(**kwargs)
+
+        # Temporizadores no agendador único; a tolerância permite disparar
+        # junto com outros eventos próximos
+        self.scheduler = scheduler or get_scheduler()
+        self.main_timer = self.scheduler.timer(
+            self._on_main_timer_timeout, tolerance=0.5, name="pausa")
+        self.pre_notify_timer = self.scheduler.timer(
+            self._on_pre_notify, tolerance=1.0, name="pré-notificação")
+        self.water_timer = self.scheduler.timer(
+            self._on_water_reminder, tolerance=30.0, name="água")
+        self.reminder_timer = self.scheduler.timer(
+            self._on_reminder, interval=self.REMINDER_INTERVAL, tolerance=5.0, name="lembrete de confirmação")
+
+        self.is_running = False
+        self.is_on_break = False
+        self.is_idle = False  # Usuário ausente (temporizadores parados)
+        self._resume_after_idle = False
+
+        self.break_interval = 20
+        self.pre_notification_seconds = 30
+        self.water_interval = 0
+
+        self.session_start_time: datetime = None
+        self._session_started_at: Optional[float] = None  # Relógio do agendador
+        self.breaks_taken = 0
+
+        self.scheduler.add_clock_listener(self._on_clock_event)
+
+    def configure(self, break_interval: int,
+                  pre_notification_seconds: int = 30, water_interval: int = 0):
+        """
+        Configura os intervalos do timer.
+        Com o timer em execução, reinicia apenas o que foi afetado pela mudança:
+        a contagem só recomeça se o intervalo entre pausas mudou.
+        """
+        interval_changed = break_interval != self.break_interval
+        pre_changed = pre_notification_seconds != self.pre_notification_seconds
+        water_changed = water_interval != self.water_interval
+
+        self.break_interval = break_interval
+        self.pre_notification_seconds = pre_notification_seconds
+        self.water_interval = water_interval
+
+        if not self.is_running:
+            return
+
+        if water_changed:
+            self._start_water_timer()
+
+        # Em pausa ou com o timer pausado, os novos valores valem no próximo ciclo
+        if self.is_on_break or not self.main_timer.is_active():
+            return
+
+        if interval_changed:
+            self._start_main_timer()
+        elif pre_changed:
+            self._arm_pre_notification()
+
+    def start(self):
+        """Inicia o timer de pausas."""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.session_start_time = datetime.fromtimestamp(self.scheduler.wall_time())
+        self._session_started_at = self.scheduler.clock()
+        self._start_main_timer()
+        self._start_water_timer()
+
+    def stop(self):
+        """Para todos os timers."""
+        self.is_running = False
+        self.main_timer.stop()
+        self.pre_notify_timer.stop()
+        self.water_timer.stop()
+        self.reminder_timer.stop()
+
+    def pause(self):
+        """Pausa o timer (mantém o estado)."""
+        self._resume_after_idle = False
+        if self.is_running and not self.is_on_break:
+            self.main_timer.stop()
+            self.pre_notify_timer.stop()
+
+    def resume(self):
+        """Retoma o timer pausado."""
+        if self.is_running and not self.is_on_break:
+            self._start_main_timer()
+
+    def enter_idle(self):
+        """
+        Usuário ausente por mais que uma pausa: conta como pausa natural
+        (encerra a pausa em andamento) e para todos os temporizadores até a volta.
+        """
+        if not self.is_running or self.is_idle:
+            return
+        self._resume_after_idle = self.is_on_break or self.main_timer.is_active()
+        if self.is_on_break:
+            self._end_break()
+        elif self._resume_after_idle:
+            self.breaks_taken += 1
+        self.is_idle = True
+        self.main_timer.stop()
+        self.pre_notify_timer.stop()
+        self.water_timer.stop()
+        self.reminder_timer.stop()
+
+    def exit_idle(self):
+        """Usuário voltou: a próxima pausa conta do zero a partir de agora."""
+        if not self.is_idle:
+            return
+        self.is_idle = False
+        if not self.is_running:
+            return
+        if self._resume_after_idle:
+            self._start_main_timer()
+        self._start_water_timer()
+
+    def confirm_break(self):
+        """Confirma a sessão e encerra a pausa atual."""
+        if self.is_on_break:
+            self._end_break()
+
+    @property
+    def next_break_time(self) -> Optional[datetime]:
+        """
+        Horário da próxima pausa, derivado do prazo monotônico (não fica
+        defasado após suspensão ou ajuste do relógio). None se parado/pausado.
+        """
+        if not self.main_timer.is_active():
+            return None
+        return datetime.fromtimestamp(self.scheduler.wall_time()) + self.get_time_until_break()
+
+    def get_time_until_break(self) -> timedelta:
+        """Retorna o tempo restante até a próxima pausa."""
+        if not self.main_timer.is_active():
+            return timedelta(0)
+        return timedelta(seconds=self.main_timer.remaining())
+
+    def get_session_duration(self) -> timedelta:
+        """Retorna a duração da sessão atual."""
+        if self._session_started_at is None:
+            return timedelta(0)
+        return timedelta(seconds=self.scheduler.clock() - self._session_started_at)
+
+    def _start_water_timer(self):
+        """(Re)inicia o lembrete de água, se ativado."""
+        self.water_timer.stop()
+        if self.water_interval > 0:
+            self.water_timer.interval = self.water_interval * 60
+            self.water_timer.start()
+
+    def _start_main_timer(self):
+        """Inicia o timer principal."""
+        self.main_timer.start(self.break_interval * 60)
+        self._arm_pre_notification()
+
+    def _arm_pre_notification(self):
+        """Agenda a pré-notificação relativa à próxima pausa."""
+        self.pre_notify_timer.stop()
+        if self.pre_notification_seconds <= 0 or not self.main_timer.is_active():
+            return
+        pre_notify_delay = self.get_time_until_break().total_seconds() - self.pre_notification_seconds
+        if pre_notify_delay > 0:
+            self.pre_notify_timer.start(pre_notify_delay)
+
+    def _on_main_timer_timeout(self):
+        """Chamado quando é hora de fazer uma pausa."""
+        self.main_timer.stop()
+        self._start_break()
+
+    def _on_pre_notify(self):
+        """Chamado segundos antes da pausa."""
+        self.pre_notification.emit(self.pre_notification_seconds)
+
+    def _start_break(self):
+        """Inicia uma pausa."""
+        self.is_on_break = True
+        self.break_starting.emit()
+        self.break_started.emit()
+        self.reminder_timer.start()
+
+    def _end_break(self):
+        """Finaliza a pausa."""
+        self.reminder_timer.stop()
+        self.is_on_break = False
+        self.breaks_taken += 1
+        self.break_ended.emit()
+
+        if self.is_running:
+            self._start_main_timer()
+
+    def _on_clock_event(self, event: ClockEvent, seconds: float):
+        """
+        Política de recuperação após suspensão (os prazos são monotônicos, então
+        um salto do relógio de parede não exige nada). Uma suspensão longa conta
+        como pausa feita: encerra a pausa em andamento ou recomeça o intervalo,
+        em vez de abrir uma pausa logo na volta. Lembretes repetidos perdidos
+        disparam uma única vez (regra do agendador).
+        """
+        if event is not ClockEvent.SLEEP or not self.is_running or seconds < self.SLEEP_AS_BREAK:
+            return
+        if self.is_on_break:
+            self._end_break()
+        elif self.main_timer.is_active():
+            self.breaks_taken += 1
+            self._start_main_timer()
+
+    def _on_reminder(self):
+        """Emite lembrete de confirmação de sessão."""
+        self.confirmation_reminder.emit()
+
+    def _on_water_reminder(self):
+        """Emite lembrete de beber água."""
+        self.water_reminder.emit()
@@ -0,0 +1,482 @@
+"""
+Núcleo dos TODOs recorrentes, sem Qt.
+Controla a criação, edição, verificação e reset diário de TODOs; os horários
+vêm do relógio de parede do agendador (real ou virtual).
+"""
+
+import heapq
+import itertools
+import random
+import string
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, ValuesView
+
+from scheduler import ClockEvent, Scheduler, get_scheduler
+from signals import Signal
+from todo_model import TodoItem
+from todo_store import TodoStore, in_working_set, scheduled_within
+
+
+@dataclass
+class TodoChangeSet:
+    """IDs adicionados, removidos e atualizados em uma transação do TodoManager."""
+
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    updated: Set[str] = field(default_factory=set)
+    reloaded: bool = False  # A lista inteira foi substituída (set_todos)
+
+    def record_added(self, todo_id: str):
+        if todo_id in self.removed:
+            # Removido e readicionado na mesma transação: para o consumidor é um update
+            self.removed.discard(todo_id)
+            self.updated.add(todo_id)
+        else:
+            self.added.add(todo_id)
+
+    def record_updated(self, todo_id: str):
+        if todo_id not in self.added:
+            self.updated.add(todo_id)
+
+    def record_removed(self, todo_id: str):
+        self.updated.discard(todo_id)
+        if todo_id in self.added:
+            self.added.discard(todo_id)  # Nunca foi visto fora da transação
+        else:
+            self.removed.add(todo_id)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.updated or self.reloaded)
+
+
+class TodoCore:
+    """Gerenciador de TODOs recorrentes (ver `TodoManager` para o adaptador Qt)."""
+
+    # Signals
+    todo_due = Signal(object)  # Emitted when a TODO becomes due (TodoItem)
+    todos_missed = Signal(list)  # Emitted once for TODOs that came due while suspended
+    todo_completed = Signal(object)  # Emitted when a TODO is completed (TodoItem)
+    todos_changed = Signal()  # Emitted once per transaction that changed the list
+    todos_changeset = Signal(object)  # Emitted right before todos_changed (TodoChangeSet)
+    verification_required = Signal(object, str)  # Emitted with TODO and verification code
+
+    def __init__(self, scheduler: Optional[Scheduler] = None, **kwargs):
+        super().__init__(**kwargs)
+
+        # Índice id → TODO do conjunto de trabalho (com backend, os concluídos
+        # avulsos ficam só nele); o dict preserva a ordem de inserção
+        self._todos: Dict[str, TodoItem] = {}
+        self._notified_todos: set = set()  # TODOs já notificados na ocorrência atual
+
+        # Min-heap de prazos (epoch, seq, todo_id): a próxima ocorrência de cada
+        # TODO com regra, ou "agora" para os pendentes ainda não notificados.
+        # Cada TODO tem um único seq válido em `_deadline_seqs`; entradas antigas
+        # são descartadas ao chegar ao topo em vez de removidas do meio do heap.
+        self._deadlines: List[tuple] = []
+        self._deadline_seqs: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._running = False
+
+        # Single-shot no agendador único, armado para o prazo mais próximo
+        # (nenhum trabalho entre prazos)
+        self.scheduler = scheduler or get_scheduler()
+        self._deadline_timer = self.scheduler.timer(
+            self._on_deadline, tolerance=1.0, name="TODOs")
+        # Após suspensão/salto de relógio, o próximo processamento de prazos
+        # agrupa as notificações em uma só
+        self._catching_up = False
+        self.scheduler.add_clock_listener(self._on_clock_event)
+
+        self._pending_verification: dict[str, str] = {}  # todo_id -> verification_code
+
+        self._store: Optional[TodoStore] = None  # Backend com gravação imediata das mutações
+
+        # Transação em andamento (ver batch()): alterações e gravações acumuladas
+        self._batch_depth = 0
+        self._changes = TodoChangeSet()
+        self._dirty: Dict[str, TodoItem] = {}
+        self._deleted: Set[str] = set()
+        self._rearm_pending = False  # Timer rearmado uma vez no fim da transação
+
+    def _now(self) -> datetime:
+        """Horário atual pelo relógio de parede do agendador."""
+        return datetime.fromtimestamp(self.scheduler.wall_time())
+
+    def set_store(self, store: Optional[TodoStore]):
+        """Define o backend onde cada mutação é gravada e consultas são feitas."""
+        self._store = store
+
+    def start(self):
+        """Inicia o gerenciador de TODOs."""
+        self._running = True
+        self._check_todos()  # Initial check
+
+    def stop(self):
+        """Para o gerenciador de TODOs."""
+        self._running = False
+        self._deadline_timer.stop()
+
+    def set_todos(self, todos: Iterable[TodoItem]):
+        """Define os TODOs em memória (ao carregar, só o conjunto de trabalho do backend)."""
+        with self.batch():
+            self._todos = {t.id: t for t in todos}
+            self._notified_todos.clear()
+            self._changes.reloaded = True
+            self._check_todos()  # Check immediately
+
+    def get_todos(self) -> List[TodoItem]:
+        """Retorna uma cópia da lista de TODOs (para quem vai modificá-la)."""
+        return list(self._todos.values())
+
+    @property
+    def todos(self) -> ValuesView:
+        """Visão somente leitura do conjunto de trabalho, em ordem de inserção, sem cópia."""
+        return self._todos.values()
+
+    def all_todos(self) -> List[TodoItem]:
+        """
+        Lista completa, com o histórico, consultada no backend sob demanda.
+        Os itens do conjunto de trabalho são os próprios objetos em memória.
+        """
+        if self._store is None:
+            return list(self._todos.values())
+        return [self._todos.get(t.id, t) for t in self._store.load()]
+
+    def count(self) -> int:
+        """Retorna o número de TODOs, incluindo o histórico."""
+        if self._store is not None:
+            return self._store.count()
+        return len(self._todos)
+
+    def get_todo(self, todo_id: str) -> Optional[TodoItem]:
+        """Busca um TODO pelo ID: O(1) na memória; o histórico vem do backend."""
+        todo = self._todos.get(todo_id)
+        if todo is None and self._store is not None:
+            todo = self._store.get(todo_id)
+        return todo
+
+    def get_pending_todos(self) -> List[TodoItem]:
+        """Retorna TODOs pendentes que estão no horário."""
+        if self._store is not None:
+            return self._store.due_pending()
+        return [t for t in self._todos.values() if t.is_due()]
+
+    def get_upcoming_todos(self, minutes: int) -> List[TodoItem]:
+        """Retorna TODOs com ocorrência nos próximos `minutes` minutos."""
+        if self._store is not None:
+            return self._store.scheduled_within(minutes, self._now())
+        return scheduled_within(self._todos.values(), minutes, self._now())
+
+    def get_recurring_todos(self) -> List[TodoItem]:
+        """Retorna TODOs recorrentes."""
+        return [t for t in self._todos.values() if t.is_recurring]
+
+    def add_todo(self, todo: TodoItem):
+        """Adiciona um novo TODO."""
+        self.add_todos([todo])
+
+    def remove_todo(self, todo_id: str):
+        """Remove um TODO pelo ID."""
+        self.remove_todos([todo_id])
+
+    def update_todo(self, todo: TodoItem):
+        """Atualiza um TODO existente."""
+        self.update_todos([todo])
+
+    def add_todos(self, todos: Iterable[TodoItem]):
+        """Adiciona vários TODOs em uma única transação."""
+        now = self._now()
+        with self.batch():
+            for todo in todos:
+                existed = todo.id in self._todos
+                todo.schedule_next(now)
+                self._persist(todo)
+                self._track(todo)
+                if existed:
+                    self._changes.record_updated(todo.id)
+                else:
+                    self._changes.record_added(todo.id)
+
+    def remove_todos(self, todo_ids: Iterable[str]):
+        """Remove vários TODOs em uma única transação."""
+        with self.batch():
+            for todo_id in todo_ids:
+                # Itens do histórico não estão em memória, mas saem do backend
+                if self._todos.pop(todo_id, None) is None and self._store is None:
+                    continue
+                self._pending_verification.pop(todo_id, None)
+                self._notified_todos.discard(todo_id)
+                self._unschedule(todo_id)
+                self._dirty.pop(todo_id, None)
+                self._deleted.add(todo_id)
+                self._changes.record_removed(todo_id)
+
+    def update_todos(self, todos: Iterable[TodoItem]):
+        """Atualiza vários TODOs existentes em uma única transação."""
+        now = self._now()
+        with self.batch():
+            for todo in todos:
+                if todo.id not in self._todos and not self._stored(todo.id):
+                    continue
+                todo.schedule_next(now)  # A regra pode ter mudado
+                self._persist(todo)
+                self._track(todo)
+                self._changes.record_updated(todo.id)
+
+    def complete_todos(self, todo_ids: Iterable[str]):
+        """
+        Completa vários TODOs em uma única transação, sem pedir código de
+        verificação (uso programático).
+        """
+        with self.batch():
+            for todo_id in todo_ids:
+                todo = self._todos.get(todo_id)
+                if todo is not None:
+                    self._complete_todo(todo)
+
+    @contextmanager
+    def batch(self) -> Iterator[TodoChangeSet]:
+        """
+        Agrupa mutações em uma transação. As gravações no backend e os sinais
+        `todos_changeset`/`todos_changed` ficam para o fim do bloco mais externo
+        e saem uma única vez. Se o bloco falhar, o que já foi alterado em
+        memória ainda é gravado, mantendo backend e memória consistentes.
+        """
+        if self._batch_depth == 0:
+            self._changes = TodoChangeSet()
+        self._batch_depth += 1
+        try:
+            yield self._changes
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit()
+
+    def _commit(self):
+        """Grava as alterações acumuladas e emite os sinais uma vez."""
+        dirty, self._dirty = self._dirty, {}
+        deleted, self._deleted = self._deleted, set()
+        changes, self._changes = self._changes, TodoChangeSet()
+        if self._rearm_pending:
+            self._rearm_pending = False
+            self._arm_deadline_timer()
+        if self._store is not None:
+            if deleted:
+                self._store.delete_many(deleted)
+            if dirty:
+                self._store.upsert_many(dirty.values())
+        if changes:
+            self.todos_changeset.emit(changes)
+            self.todos_changed.emit()
+
+    def _stored(self, todo_id: str) -> bool:
+        """True se o TODO existe no backend (itens do histórico, fora da memória)."""
+        return self._store is not None and self._store.get(todo_id) is not None
+
+    def _track(self, todo: TodoItem):
+        """
+        Mantém o TODO em memória e no heap de prazos se fizer parte do conjunto
+        de trabalho; senão ele fica só no backend. Itens existentes mantêm a posição.
+        """
+        if self._store is None or in_working_set(todo):
+            self._todos[todo.id] = todo
+            self._schedule(todo)
+        elif self._todos.pop(todo.id, None) is not None:
+            self._notified_todos.discard(todo.id)
+            self._unschedule(todo.id)
+
+    def _persist(self, *todos: TodoItem):
+        """Marca os TODOs para gravação no backend ao fim da transação."""
+        for todo in todos:
+            self._deleted.discard(todo.id)
+            self._dirty[todo.id] = todo
+
+    def request_completion(self, todo_id: str) -> Optional[str]:
+        """
+        Solicita completar um TODO recorrente.
+        Gera e retorna código de verificação para TODOs recorrentes.
+        Para TODOs não-recorrentes, completa diretamente.
+        """
+        todo = self._get_todo_by_id(todo_id)
+        if not todo:
+            return None
+
+        if todo.is_recurring:
+            # Generate 8-character alphanumeric code
+            code = self._generate_verification_code()
+            self._pending_verification[todo_id] = code
+            self.verification_required.emit(todo, code)
+            return code
+        else:
+            # Non-recurring TODO: complete directly
+            self._complete_todo(todo)
+            return None
+
+    def verify_and_complete(self, todo_id: str, entered_code: str) -> bool:
+        """
+        Verifica o código e completa o TODO se correto.
+        Retorna True se verificação bem-sucedida, False caso contrário.
+        """
+        if todo_id not in self._pending_verification:
+            return False
+
+        expected_code = self._pending_verification[todo_id]
+        if entered_code.upper() == expected_code.upper():
+            todo = self._get_todo_by_id(todo_id)
+            if todo:
+                self._complete_todo(todo)
+                del self._pending_verification[todo_id]
+                return True
+        return False
+
+    def _generate_verification_code(self) -> str:
+        """Gera código alfanumérico de 8 caracteres."""
+        chars = string.ascii_uppercase + string.digits
+        return ''.join(random.choices(chars, k=8))
+
+    def _complete_todo(self, todo: TodoItem):
+        """Marca TODO como completo."""
+        with self.batch():
+            todo.mark_completed(self.scheduler.wall_time())
+            self._persist(todo)
+            self._notified_todos.discard(todo.id)
+            self._schedule(todo)  # Continua no heap até a próxima ocorrência
+            self._changes.record_updated(todo.id)
+            self.todo_completed.emit(todo)
+
+    def _get_todo_by_id(self, todo_id: str) -> Optional[TodoItem]:
+        """Busca TODO pelo ID."""
+        return self._todos.get(todo_id)
+
+    def _check_todos(self):
+        """
+        Varredura completa: calcula a próxima ocorrência dos itens que ainda
+        não a têm (ex.: config.json antigo) e reconstrói o heap de prazos.
+        Executada só ao iniciar e ao carregar; ocorrências que venceram com a
+        app fechada disparam logo em seguida, pelo próprio heap.
+        """
+        now = self._now()
+        with self.batch():
+            for todo in self._todos.values():
+                if todo.next_occurrence is None and todo.rule is not None:
+                    todo.schedule_next(now)
+                    if todo.next_occurrence is not None:
+                        self._persist(todo)
+                        self._changes.record_updated(todo.id)
+            self._rebuild_deadlines()
+
+    # Heap de prazos
+
+    def _rebuild_deadlines(self):
+        """Recalcula o prazo de todos os TODOs de uma vez."""
+        now_ts = self.scheduler.wall_time()
+        self._deadlines = []
+        self._deadline_seqs = {}
+        for todo in self._todos.values():
+            entry = self._deadline_entry(todo, now_ts)
+            if entry is not None:
+                self._deadlines.append(entry)
+        heapq.heapify(self._deadlines)
+        self._arm_deadline_timer()
+
+    def _deadline_entry(self, todo: TodoItem, now_ts: float) -> Optional[tuple]:
+        """Cria a entrada do heap para o TODO e a torna a única válida."""
+        self._deadline_seqs.pop(todo.id, None)
+        if todo.is_due() and todo.id not in self._notified_todos:
+            due = now_ts  # Notifica imediatamente
+        elif todo.next_occurrence is not None:
+            due = todo.next_occurrence
+        else:
+            return None
+        seq = next(self._seq)
+        self._deadline_seqs[todo.id] = seq
+        return (due, seq, todo.id)
+
+    def _schedule(self, todo: TodoItem):
+        """Atualiza o prazo de um TODO no heap (O(log n))."""
+        entry = self._deadline_entry(todo, self.scheduler.wall_time())
+        if entry is not None:
+            heapq.heappush(self._deadlines, entry)
+            # Edições repetidas deixam entradas antigas; compacta se dominarem o heap
+            if len(self._deadlines) > 2 * len(self._deadline_seqs) + 64:
+                self._deadlines = [e for e in self._deadlines if self._is_live(e)]
+                heapq.heapify(self._deadlines)
+        self._arm_deadline_timer()
+
+    def _unschedule(self, todo_id: str):
+        """Invalida o prazo de um TODO; a entrada sai do heap ao chegar ao topo."""
+        if self._deadline_seqs.pop(todo_id, None) is not None:
+            self._arm_deadline_timer()
+
+    def _is_live(self, entry: tuple) -> bool:
+        return self._deadline_seqs.get(entry[2]) == entry[1]
+
+    def _arm_deadline_timer(self):
+        """Arma o single-shot para o prazo válido mais próximo."""
+        if self._batch_depth:
+            self._rearm_pending = True
+            return
+        while self._deadlines and not self._is_live(self._deadlines[0]):
+            heapq.heappop(self._deadlines)
+        if not self._running or not self._deadlines:
+            self._deadline_timer.stop()
+            return
+        self._deadline_timer.start(self._deadlines[0][0] - self.scheduler.wall_time())
+
+    def _on_deadline(self):
+        """
+        Processa os prazos vencidos: dispara as ocorrências (o TODO volta a
+        pendente e a próxima é calculada) e emite `todo_due` uma vez por ocorrência.
+        """
+        now = self._now()
+        now_ts = now.timestamp()
+        catching_up, self._catching_up = self._catching_up, False
+        missed: List[TodoItem] = []
+        with self.batch():
+            while self._deadlines and self._deadlines[0][0] <= now_ts:
+                entry = heapq.heappop(self._deadlines)
+                if not self._is_live(entry):
+                    continue
+                todo_id = entry[2]
+                del self._deadline_seqs[todo_id]
+                todo = self._get_todo_by_id(todo_id)
+                if todo is None:
+                    continue
+
+                if todo.next_occurrence is not None and todo.next_occurrence <= now_ts:
+                    todo.fire_occurrence(now)
+                    self._notified_todos.discard(todo_id)
+                    self._persist(todo)
+                    self._changes.record_updated(todo_id)
+
+                if todo.is_due() and todo_id not in self._notified_todos:
+                    self._notified_todos.add(todo_id)
+                    if catching_up:
+                        missed.append(todo)
+                    else:
+                        self.todo_due.emit(todo)
+
+                # Próxima ocorrência (sempre no futuro após o disparo)
+                entry = self._deadline_entry(todo, now_ts)
+                if entry is not None:
+                    heapq.heappush(self._deadlines, entry)
+        if len(missed) == 1:
+            self.todo_due.emit(missed[0])
+        elif missed:
+            self.todos_missed.emit(missed)
+        self._arm_deadline_timer()
+
+    def _on_clock_event(self, event: ClockEvent, seconds: float):
+        """
+        Os prazos dos TODOs são horários de parede: após suspensão ou salto do
+        relógio, o timer é rearmado a partir do horário atual e o que venceu no
+        intervalo vira uma única notificação.
+        """
+        if not self._running:
+            return
+        self._arm_deadline_timer()
+        # Só agrupa se há algo já vencido (senão valeria para o próximo prazo normal)
+        self._catching_up = bool(self._deadlines) and self._deadlines[0][0] <= self.scheduler.wall_time()
+
@@ -2,12 +2,14 @@
 Modelo de dados para TODOs recorrentes.
 """
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 from enum import Enum
+import time
 import uuid
 
+from recurrence import RecurrenceRule
+
 
 class TodoStatus(Enum):
     """Status de um TODO."""
@@ -15,59 +17,251 @@ class TodoStatus(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+def _parse_hhmm(value: Optional[str]) -> Optional[int]:
+    """Converte "HH:MM" em minutos desde a meia-noite."""
+    if not value:
+        return None
+    hour, minute = map(int, value.split(':'))
+    return hour * 60 + minute
+
+
+def _parse_status(value) -> TodoStatus:
+    """Converte o status salvo; valores desconhecidos voltam a pendente."""
+    try:
+        return TodoStatus(value)
+    except ValueError:
+        return TodoStatus.PENDING
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """Converte data/hora ISO 8601 (horário local) em epoch em segundos."""
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        return None
+
+
+def _parse_rule(value: Optional[dict]) -> Optional[RecurrenceRule]:
+    """Converte a regra salva; regras inválidas são ignoradas."""
+    if not value:
+        return None
+    try:
+        return RecurrenceRule.from_dict(value)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Regra de recorrência inválida ignorada: {e}")
+        return None
+
+
+def _format_timestamp(value: Optional[int]) -> Optional[str]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).isoformat()
+
+
+def _parse_day(value: Optional[str]) -> Optional[int]:
+    """Converte "YYYY-MM-DD" no ordinal do dia."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return None
+
+
 class TodoItem:
-    """Representa um item TODO."""
-
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    title: str = ""
-    description: str = ""
-    is_recurring: bool = False
-    scheduled_time: Optional[str] = None  # Format: "HH:MM" for recurring TODOs
-    status: str = TodoStatus.PENDING.value
-    completed_at: Optional[str] = None  # ISO format datetime
-    last_reset_date: Optional[str] = None  # ISO format date (YYYY-MM-DD)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    """
+    Representa um item TODO.
+
+    Os campos já ficam na forma usada nas verificações: horário em minutos do
+    dia, datas/horas como epoch em segundos, último reset como ordinal do dia e
+    status como membro de `TodoStatus`. As propriedades `scheduled_time`,
+    `status`, `completed_at`, `last_reset_date` e `created_at` mantêm a
+    interface em strings, e `to_dict()` gera o formato do config.json.
+
+    Itens com regra (`recurrence`, ou `is_recurring` com `scheduled_time`, que
+    equivale a uma regra diária) guardam a próxima ocorrência em
+    `next_occurrence`. Ela só é recalculada quando dispara (`fire_occurrence`)
+    ou quando o item é editado (`schedule_next`).
+    """
+
+    # Chaves do formato serializado (config.json / SQLite)
+    FIELDS = ('id', 'title', 'description', 'is_recurring', 'scheduled_time',
+              'status', 'completed_at', 'last_reset_date', 'created_at',
+              'recurrence', 'next_occurrence', 'occurrence_at')
+
+    __slots__ = ('id', 'title', 'description', 'is_recurring', 'scheduled_minute',
+                 'state', 'completed_ts', 'last_reset_day', 'created_ts',
+                 'recurrence', 'next_occurrence', 'occurrence_ts')
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        title: str = "",
+        description: str = "",
+        is_recurring: bool = False,
+        scheduled_time: Optional[str] = None,  # Format: "HH:MM" for recurring TODOs
+        status: str = TodoStatus.PENDING.value,
+        completed_at: Optional[str] = None,  # ISO format datetime
+        last_reset_date: Optional[str] = None,  # ISO format date (YYYY-MM-DD)
+        created_at: Optional[str] = None,  # ISO format datetime
+        recurrence: Optional[dict] = None,  # RecurrenceRule.to_dict(); None = diária se recorrente
+        next_occurrence: Optional[str] = None,  # ISO format datetime (cache)
+        occurrence_at: Optional[str] = None,  # ISO format datetime da última ocorrência disparada
+    ):
+        self.id: str = id or str(uuid.uuid4())
+        self.title = title
+        self.description = description
+        self.is_recurring = bool(is_recurring)
+        self.scheduled_minute: Optional[int] = _parse_hhmm(scheduled_time)
+        self.state = _parse_status(status)
+        self.completed_ts: Optional[int] = _parse_timestamp(completed_at)
+        self.last_reset_day: Optional[int] = _parse_day(last_reset_date)
+        self.created_ts: int = _parse_timestamp(created_at) or int(time.time())
+        self.recurrence: Optional[RecurrenceRule] = _parse_rule(recurrence)
+        self.next_occurrence: Optional[int] = _parse_timestamp(next_occurrence)
+        self.occurrence_ts: Optional[int] = _parse_timestamp(occurrence_at)
+
+    # Interface em strings (exibição e compatibilidade)
+
+    @property
+    def scheduled_time(self) -> Optional[str]:
+        if self.scheduled_minute is None:
+            return None
+        return f"{self.scheduled_minute // 60:02d}:{self.scheduled_minute % 60:02d}"
+
+    @scheduled_time.setter
+    def scheduled_time(self, value: Optional[str]):
+        self.scheduled_minute = _parse_hhmm(value)
+        self.next_occurrence = None  # A regra implícita mudou
+
+    @property
+    def status(self) -> str:
+        return self.state.value
+
+    @status.setter
+    def status(self, value: str):
+        self.state = _parse_status(value)
+
+    @property
+    def completed_at(self) -> Optional[str]:
+        return _format_timestamp(self.completed_ts)
+
+    @property
+    def last_reset_date(self) -> Optional[str]:
+        if self.last_reset_day is None:
+            return None
+        return date.fromordinal(self.last_reset_day).isoformat()
+
+    @property
+    def created_at(self) -> str:
+        return datetime.fromtimestamp(self.created_ts).isoformat()
 
     def to_dict(self) -> dict:
         """Converte para dicionario para serialização JSON."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'is_recurring': self.is_recurring,
+            'scheduled_time': self.scheduled_time,
+            'status': self.state.value,
+            'completed_at': self.completed_at,
+            'last_reset_date': self.last_reset_date,
+            'created_at': self.created_at,
+            'recurrence': self.recurrence.to_dict() if self.recurrence else None,
+            'next_occurrence': _format_timestamp(self.next_occurrence),
+            'occurrence_at': _format_timestamp(self.occurrence_ts),
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'TodoItem':
         """Cria instância a partir de dicionário."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        return cls(**{k: v for k, v in data.items() if k in cls.FIELDS})
 
-    def is_due(self) -> bool:
-        """Verifica se o TODO está pendente no horário atual."""
-        if self.status != TodoStatus.PENDING.value:
-            return False
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TodoItem):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
 
-        if not self.is_recurring or not self.scheduled_time:
-            return True
+    __hash__ = None  # Mutável, como o dataclass anterior
+
+    def __repr__(self) -> str:
+        return (f"TodoItem(id={self.id!r}, title={self.title!r}, "
+                f"is_recurring={self.is_recurring!r}, scheduled_time={self.scheduled_time!r}, "
+                f"status={self.state.value!r})")
 
-        now = datetime.now()
-        scheduled_hour, scheduled_minute = map(int, self.scheduled_time.split(':'))
-        scheduled = now.replace(hour=scheduled_hour, minute=scheduled_minute, second=0, microsecond=0)
+    # Recorrência
 
-        # Is it past the scheduled time today?
-        return now >= scheduled
+    @property
+    def rule(self) -> Optional[RecurrenceRule]:
+        """Regra efetiva: a explícita ou a diária implícita dos recorrentes."""
+        if self.recurrence is not None:
+            return self.recurrence
+        if self.is_recurring:
+            return RecurrenceRule.daily(self.scheduled_minute or 0)
+        return None
 
-    def needs_reset(self) -> bool:
-        """Verifica se o TODO recorrente precisa ser resetado para novo dia."""
-        if not self.is_recurring:
+    def set_rule(self, rule: Optional[RecurrenceRule]):
+        """Define a regra explícita e invalida a próxima ocorrência."""
+        self.recurrence = rule
+        self.next_occurrence = None
+
+    def schedule_next(self, now: datetime):
+        """
+        Recalcula `next_occurrence` a partir da última ocorrência disparada
+        (ou da conclusão). Sem histórico, as ocorrências de hoje ainda contam,
+        como no antigo reset da meia-noite.
+        """
+        rule = self.rule
+        if rule is None:
+            self.next_occurrence = None
+            return
+
+        anchor_ts = self.occurrence_ts
+        if self.state is TodoStatus.COMPLETED and self.completed_ts is not None:
+            anchor_ts = max(anchor_ts or 0, self.completed_ts)
+
+        if anchor_ts is not None:
+            anchor = datetime.fromtimestamp(anchor_ts)
+        elif rule.kind == RecurrenceRule.ONCE:
+            anchor = datetime.min
+        else:
+            anchor = datetime.combine(now.date(), datetime.min.time()) - timedelta(seconds=1)
+
+        upcoming = rule.next_after(anchor)
+        self.next_occurrence = int(upcoming.timestamp()) if upcoming else None
+
+    def fire_occurrence(self, now: datetime):
+        """
+        Abre a ocorrência agendada: o TODO volta a pendente e a próxima é
+        calculada. Ocorrências perdidas (app fechada) disparam uma única vez.
+        """
+        self.occurrence_ts = self.next_occurrence
+        self.state = TodoStatus.PENDING
+        self.completed_ts = None
+        self.last_reset_day = now.date().toordinal()
+        rule = self.rule
+        upcoming = rule.next_after(max(datetime.fromtimestamp(self.occurrence_ts), now)) if rule else None
+        self.next_occurrence = int(upcoming.timestamp()) if upcoming else None
+
+    # Verificações
+
+    def is_due(self) -> bool:
+        """
+        Verifica se o TODO está pendente no horário. Itens com regra só ficam
+        pendentes no horário depois que uma ocorrência disparou.
+        """
+        if self.state is not TodoStatus.PENDING:
             return False
 
-        today = datetime.now().date().isoformat()
-        return self.last_reset_date != today
+        if self.recurrence is None and not self.is_recurring:
+            return True
 
-    def reset_for_new_day(self):
-        """Reseta o TODO para o novo dia."""
-        self.status = TodoStatus.PENDING.value
-        self.completed_at = None
-        self.last_reset_date = datetime.now().date().isoformat()
+        return self.occurrence_ts is not None
 
-    def mark_completed(self):
-        """Marca o TODO como completo."""
-        self.status = TodoStatus.COMPLETED.value
-        self.completed_at = datetime.now().isoformat()
+    def mark_completed(self, now_ts: Optional[float] = None):
+        """Marca o TODO como completo (em `now_ts`, ou agora)."""
+        self.state = TodoStatus.COMPLETED
+        self.completed_ts = int(now_ts if now_ts is not None else time.time())
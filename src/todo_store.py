@@ -0,0 +1,378 @@
+"""
+Armazenamento de TODOs.
+Define a interface dos backends e as implementações em JSON (lista dentro do
+config.json) e SQLite (banco próprio com índices).
+"""
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from todo_model import TodoItem, TodoStatus
+
+
+class TodoStore(ABC):
+    """Interface comum dos backends de armazenamento de TODOs."""
+
+    @abstractmethod
+    def load(self) -> List[TodoItem]:
+        """Retorna todos os TODOs na ordem de inserção."""
+
+    @abstractmethod
+    def save_all(self, todos: Iterable[TodoItem]):
+        """Substitui o conteúdo do armazenamento pelos TODOs informados."""
+
+    def upsert(self, todo: TodoItem):
+        """Insere ou atualiza um TODO."""
+        self.upsert_many([todo])
+
+    @abstractmethod
+    def upsert_many(self, todos: Iterable[TodoItem]):
+        """Insere ou atualiza vários TODOs de uma vez."""
+
+    def delete(self, todo_id: str):
+        """Remove um TODO pelo ID."""
+        self.delete_many([todo_id])
+
+    @abstractmethod
+    def delete_many(self, todo_ids: Iterable[str]):
+        """Remove vários TODOs de uma vez."""
+
+    @abstractmethod
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Busca um TODO pelo ID."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Retorna o número de TODOs armazenados."""
+
+    def load_working_set(self) -> List[TodoItem]:
+        """Retorna só o conjunto de trabalho (ver `in_working_set`), em ordem de inserção."""
+        return [t for t in self.load() if in_working_set(t)]
+
+    def iter_dicts(self) -> Iterator[dict]:
+        """Gera os TODOs já serializados (formato de `to_dict()`), sob demanda."""
+        for todo in self.load():
+            yield todo.to_dict()
+
+    def due_pending(self) -> List[TodoItem]:
+        """Retorna os TODOs pendentes que já estão no horário."""
+        return [t for t in self.load() if t.is_due()]
+
+    def scheduled_within(self, minutes: int, now: Optional[datetime] = None) -> List[TodoItem]:
+        """Retorna os TODOs cuja próxima ocorrência cai nos próximos `minutes` minutos."""
+        return scheduled_within(self.load(), minutes, now or datetime.now())
+
+    def close(self):
+        """Libera recursos do backend."""
+
+
+def in_working_set(todo: TodoItem) -> bool:
+    """
+    True se o TODO precisa ficar em memória: pendente, recorrente ou com
+    ocorrência agendada. Os concluídos avulsos são histórico e ficam só no backend.
+    """
+    return (todo.state is TodoStatus.PENDING or todo.is_recurring
+            or todo.recurrence is not None or todo.next_occurrence is not None)
+
+
+def _time_window(now: datetime, minutes: int):
+    """Retorna o intervalo (início, fim] em epoch a partir de agora."""
+    start = now.timestamp()
+    return start, start + minutes * 60
+
+
+def scheduled_within(todos: Iterable[TodoItem], minutes: int, now: datetime) -> List[TodoItem]:
+    """Filtra, em ordem de horário, os TODOs com ocorrência nos próximos `minutes` minutos."""
+    start, end = _time_window(now, minutes)
+    items = [t for t in todos
+             if t.next_occurrence is not None and start < t.next_occurrence <= end]
+    return sorted(items, key=lambda t: t.next_occurrence)
+
+
+def _epoch_to_iso(value: Optional[int]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat() if value is not None else None
+
+
+class JsonTodoStore(TodoStore):
+    """Backend legado: lista de dicionários em `AppSettings.todos`."""
+
+    def __init__(self, settings_manager):
+        self._manager = settings_manager
+
+    @property
+    def _dicts(self) -> List[dict]:
+        # Os TODOs ficam na base, compartilhados por todos os perfis
+        return self._manager.base.todos
+
+    def load(self) -> List[TodoItem]:
+        return [TodoItem.from_dict(d) for d in self._dicts]
+
+    def save_all(self, todos: Iterable[TodoItem]):
+        self._manager.base.todos = [t.to_dict() for t in todos]
+        self._manager.save()
+
+    def upsert_many(self, todos: Iterable[TodoItem]):
+        index = {d.get('id'): i for i, d in enumerate(self._dicts)}
+        for todo in todos:
+            i = index.get(todo.id)
+            if i is None:
+                index[todo.id] = len(self._dicts)
+                self._dicts.append(todo.to_dict())
+            else:
+                self._dicts[i] = todo.to_dict()
+        self._manager.save()
+
+    def delete_many(self, todo_ids: Iterable[str]):
+        ids = set(todo_ids)
+        self._manager.base.todos = [d for d in self._dicts if d.get('id') not in ids]
+        self._manager.save()
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        for d in self._dicts:
+            if d.get('id') == todo_id:
+                return TodoItem.from_dict(d)
+        return None
+
+    def count(self) -> int:
+        return len(self._dicts)
+
+    def iter_dicts(self) -> Iterator[dict]:
+        for data in list(self._dicts):
+            yield dict(data)
+
+
+class SqliteTodoStore(TodoStore):
+    """
+    Backend SQLite (modo WAL) com índices por id, status, recorrência e horário.
+    Consultas de TODOs vencidos ou próximos não carregam a lista inteira.
+    """
+
+    SCHEMA_VERSION = 2  # 2: regra de recorrência e próxima ocorrência indexada
+    LOOKUP_CHUNK = 500  # IDs por consulta de posições (abaixo do limite de parâmetros do SQLite)
+
+    # Colunas mapeadas diretamente; campos extras do TodoItem vão para `extra` (JSON)
+    COLUMNS = ('id', 'title', 'description', 'is_recurring', 'scheduled_time',
+               'status', 'completed_at', 'last_reset_date', 'created_at',
+               'recurrence', 'next_occurrence', 'occurrence_at')
+
+    # Colunas acrescentadas depois da versão 1 (nome, tipo)
+    ADDED_COLUMNS = (('recurrence', 'TEXT'), ('next_occurrence', 'INTEGER'),
+                     ('occurrence_at', 'INTEGER'))
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        row = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM todos").fetchone()
+        self._next_position = row[0] + 1
+
+    def _create_schema(self):
+        """Cria tabelas e índices se ainda não existirem."""
+        with self._conn:
+            # A chave primária já indexa `id`
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS todos (
+                    id TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    title TEXT NOT NULL DEFAULT '',
+                    description TEXT NOT NULL DEFAULT '',
+                    is_recurring INTEGER NOT NULL DEFAULT 0,
+                    scheduled_time TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    completed_at TEXT,
+                    last_reset_date TEXT,
+                    created_at TEXT,
+                    extra TEXT,
+                    recurrence TEXT,
+                    next_occurrence INTEGER,
+                    occurrence_at INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_todos_status ON todos(status);
+                CREATE INDEX IF NOT EXISTS idx_todos_recurring ON todos(is_recurring);
+                CREATE INDEX IF NOT EXISTS idx_todos_scheduled ON todos(scheduled_time);
+                CREATE INDEX IF NOT EXISTS idx_todos_position ON todos(position);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            # Bancos da versão 1: acrescenta as colunas novas
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(todos)")}
+            for name, sql_type in self.ADDED_COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE todos ADD COLUMN {name} {sql_type}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_todos_next ON todos(next_occurrence)"
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(self.SCHEMA_VERSION),)
+            )
+
+    # Conversão entre linhas e TodoItem
+
+    def _to_row(self, todo: TodoItem, position: int) -> tuple:
+        data = todo.to_dict()
+        extra = {k: v for k, v in data.items() if k not in self.COLUMNS}
+        recurrence = data.get('recurrence')
+        return (
+            data['id'], position, data.get('title') or '', data.get('description') or '',
+            1 if data.get('is_recurring') else 0, data.get('scheduled_time'),
+            data.get('status') or TodoStatus.PENDING.value, data.get('completed_at'),
+            data.get('last_reset_date'), data.get('created_at'),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+            json.dumps(recurrence) if recurrence else None,
+            # Epoch inteiro: a coluna indexada é comparada com o relógio direto no SQL
+            todo.next_occurrence, todo.occurrence_ts,
+        )
+
+    @staticmethod
+    def _row_data(row: sqlite3.Row) -> dict:
+        data = {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'is_recurring': bool(row['is_recurring']),
+            'scheduled_time': row['scheduled_time'],
+            'status': row['status'],
+            'completed_at': row['completed_at'],
+            'last_reset_date': row['last_reset_date'],
+            'created_at': row['created_at'],
+            'recurrence': json.loads(row['recurrence']) if row['recurrence'] else None,
+        }
+        if row['extra']:
+            data.update(json.loads(row['extra']))
+        return data
+
+    @classmethod
+    def _from_row(cls, row: sqlite3.Row) -> TodoItem:
+        todo = TodoItem.from_dict(cls._row_data(row))
+        todo.next_occurrence = row['next_occurrence']
+        todo.occurrence_ts = row['occurrence_at']
+        return todo
+
+    def _query(self, sql: str, params: tuple = ()) -> List[TodoItem]:
+        return [self._from_row(r) for r in self._conn.execute(sql, params)]
+
+    # Migração
+
+    def is_migrated(self) -> bool:
+        """Retorna True se a lista do config.json já foi importada."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        return row is not None
+
+    def migrate_from_json(self, dicts: List[dict]) -> int:
+        """
+        Importa uma única vez a lista de TODOs serializados do config.json.
+        Retorna o número de itens importados.
+        """
+        if self.is_migrated():
+            return 0
+        todos = [TodoItem.from_dict(d) for d in dicts]
+        with self._conn:
+            self._upsert_rows(todos)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),)
+            )
+        return len(todos)
+
+    # Interface TodoStore
+
+    def load(self) -> List[TodoItem]:
+        return self._query("SELECT * FROM todos ORDER BY position")
+
+    def save_all(self, todos: Iterable[TodoItem]):
+        with self._conn:
+            self._conn.execute("DELETE FROM todos")
+            self._next_position = 0
+            self._upsert_rows(todos)
+
+    def upsert_many(self, todos: Iterable[TodoItem]):
+        with self._conn:
+            self._upsert_rows(todos)
+
+    def _positions(self, todo_ids: List[str]) -> dict:
+        """Posições dos IDs já gravados, em consultas de até `LOOKUP_CHUNK` IDs."""
+        positions = {}
+        for i in range(0, len(todo_ids), self.LOOKUP_CHUNK):
+            chunk = todo_ids[i:i + self.LOOKUP_CHUNK]
+            marks = ','.join('?' * len(chunk))
+            positions.update(self._conn.execute(
+                f"SELECT id, position FROM todos WHERE id IN ({marks})", chunk))
+        return positions
+
+    def _upsert_rows(self, todos: Iterable[TodoItem]):
+        """Grava as linhas mantendo a posição original dos itens existentes."""
+        todos = list(todos)
+        positions = self._positions([todo.id for todo in todos])
+
+        def rows():
+            for todo in todos:
+                position = positions.get(todo.id)
+                if position is None:
+                    position = positions[todo.id] = self._next_position
+                    self._next_position += 1
+                yield self._to_row(todo, position)
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO todos (id, position, title, description, is_recurring, "
+            "scheduled_time, status, completed_at, last_reset_date, created_at, extra, "
+            "recurrence, next_occurrence, occurrence_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows()
+        )
+
+    def delete_many(self, todo_ids: Iterable[str]):
+        with self._conn:
+            self._conn.executemany("DELETE FROM todos WHERE id = ?", ((i,) for i in todo_ids))
+
+    def load_working_set(self) -> List[TodoItem]:
+        return self._query(
+            "SELECT * FROM todos WHERE status = ? OR is_recurring = 1 "
+            "OR recurrence IS NOT NULL OR next_occurrence IS NOT NULL "
+            "ORDER BY position",
+            (TodoStatus.PENDING.value,)
+        )
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        items = self._query("SELECT * FROM todos WHERE id = ?", (todo_id,))
+        return items[0] if items else None
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0]
+
+    def iter_dicts(self) -> Iterator[dict]:
+        # O cursor percorre a tabela sob demanda, sem criar TodoItem
+        for row in self._conn.execute("SELECT * FROM todos ORDER BY position"):
+            data = self._row_data(row)
+            data['next_occurrence'] = _epoch_to_iso(row['next_occurrence'])
+            data['occurrence_at'] = _epoch_to_iso(row['occurrence_at'])
+            yield data
+
+    def due_pending(self) -> List[TodoItem]:
+        return self._query(
+            "SELECT * FROM todos WHERE status = ? "
+            "AND ((is_recurring = 0 AND recurrence IS NULL) OR occurrence_at IS NOT NULL) "
+            "ORDER BY position",
+            (TodoStatus.PENDING.value,)
+        )
+
+    def scheduled_within(self, minutes: int, now: Optional[datetime] = None) -> List[TodoItem]:
+        start, end = _time_window(now or datetime.now(), minutes)
+        return self._query(
+            "SELECT * FROM todos WHERE next_occurrence > ? AND next_occurrence <= ? "
+            "ORDER BY next_occurrence",
+            (start, end)
+        )
+
+    def close(self):
+        self._conn.close()
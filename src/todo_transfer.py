@@ -0,0 +1,183 @@
+"""
+Importação e exportação de TODOs em JSONL e CSV.
+Os arquivos são lidos e gravados linha a linha, com memória limitada, e um
+callback opcional recebe o progresso.
+"""
+
+import codecs
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from todo_model import TodoItem
+
+
+# progress(itens_processados, fração 0..1 ou None se desconhecida)
+ProgressCallback = Callable[[int, Optional[float]], None]
+
+FORMATS = ('jsonl', 'csv')
+PROGRESS_EVERY = 1000  # Itens entre chamadas do callback
+
+_TRUE_VALUES = {'1', 'true', 'sim', 'yes', 'x'}
+
+
+def detect_format(path: Path) -> str:
+    """Deduz o formato pela extensão do arquivo."""
+    suffix = Path(path).suffix.lower().lstrip('.')
+    if suffix in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if suffix == 'csv':
+        return 'csv'
+    raise ValueError(f"Formato não suportado: {Path(path).name} (use .jsonl ou .csv)")
+
+
+class ImportStats:
+    """Contadores de uma importação."""
+
+    def __init__(self):
+        self.read = 0
+        self.skipped = 0
+
+    def __repr__(self) -> str:
+        return f"ImportStats(read={self.read}, skipped={self.skipped})"
+
+
+# Exportação
+
+def _csv_row(data: dict) -> dict:
+    row = dict(data)
+    row['is_recurring'] = '1' if data.get('is_recurring') else '0'
+    if data.get('recurrence'):
+        row['recurrence'] = json.dumps(data['recurrence'], separators=(',', ':'))
+    return row
+
+
+def export_todos(records: Iterable[dict], path: Path, fmt: Optional[str] = None,
+                 total: Optional[int] = None,
+                 progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Grava os TODOs serializados (`TodoItem.to_dict()` / `TodoStore.iter_dicts()`)
+    consumindo o iterável sob demanda. Grava em arquivo temporário e substitui
+    o destino ao final. Retorna o número de itens exportados.
+    """
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt}")
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = None
+            if fmt == 'csv':
+                writer = csv.DictWriter(f, fieldnames=TodoItem.FIELDS, extrasaction='ignore')
+                writer.writeheader()
+            for data in records:
+                if writer is not None:
+                    writer.writerow(_csv_row(data))
+                else:
+                    f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n')
+                count += 1
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(count, count / total if total else None)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+    if progress:
+        progress(count, 1.0)
+    return count
+
+
+# Importação
+
+class _LineReader:
+    """
+    Lê o arquivo em modo binário, contando os bytes consumidos. Linhas que
+    não são UTF-8 válido saem com caracteres de substituição e são contadas
+    em `invalid`, para que a linha (ou registro CSV) seja ignorada.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.done = 0
+        self.invalid = 0
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                if self.done == 0 and raw.startswith(codecs.BOM_UTF8):
+                    raw = raw[len(codecs.BOM_UTF8):]
+                self.done += len(raw)
+                try:
+                    yield raw.decode('utf-8')
+                except UnicodeDecodeError:
+                    self.invalid += 1
+                    yield raw.decode('utf-8', errors='replace')
+
+    def fraction(self) -> Optional[float]:
+        return self.done / self.size if self.size else None
+
+
+def _from_csv_row(row: dict) -> dict:
+    data = {k: (v if v != '' else None) for k, v in row.items() if k in TodoItem.FIELDS}
+    data['is_recurring'] = (row.get('is_recurring') or '').strip().lower() in _TRUE_VALUES
+    data['title'] = data.get('title') or ''
+    data['description'] = data.get('description') or ''
+    if data.get('recurrence'):
+        data['recurrence'] = json.loads(data['recurrence'])
+    if not data.get('id'):
+        data.pop('id', None)  # Gera um novo
+    if not data.get('status'):
+        data.pop('status', None)
+    return data
+
+
+def read_todos(path: Path, fmt: Optional[str] = None,
+               progress: Optional[ProgressCallback] = None,
+               stats: Optional[ImportStats] = None) -> Iterator[TodoItem]:
+    """
+    Gera os TODOs do arquivo um a um. Linhas inválidas (inclusive as que não
+    são UTF-8) são ignoradas e contadas em `stats.skipped`.
+    """
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt}")
+    stats = stats if stats is not None else ImportStats()
+    reader = _LineReader(path)
+
+    if fmt == 'csv':
+        rows: Iterable = csv.DictReader(reader)
+        rows.fieldnames  # Lê o cabeçalho antes de contar linhas inválidas dos registros
+        parse = _from_csv_row
+    else:
+        rows = (line for line in reader if line.strip())
+        parse = json.loads
+
+    invalid = reader.invalid
+    for row in rows:
+        try:
+            if reader.invalid != invalid:
+                invalid = reader.invalid
+                raise ValueError("texto não é UTF-8 válido")
+            todo = TodoItem.from_dict(parse(row))
+        except (TypeError, ValueError, AttributeError) as e:
+            stats.skipped += 1
+            print(f"Linha ignorada na importação: {e}")
+            continue
+        stats.read += 1
+        if progress and stats.read % PROGRESS_EVERY == 0:
+            progress(stats.read, reader.fraction())
+        yield todo
+
+    if progress:
+        progress(stats.read, 1.0)
@@ -3,9 +3,16 @@ Módulo de gerenciamento do ícone na bandeja do sistema (System Tray).
 """
 
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
-from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor, QFont
+from PyQt6.QtGui import QIcon, QAction, QActionGroup, QPixmap, QPainter, QColor, QFont
 from PyQt6.QtCore import pyqtSignal, QObject
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import time
+
+
+# Acima desta quantidade de TODOs pendentes o submenu agrupa por hora
+TODOS_GROUP_THRESHOLD = 25
 
 
 class TrayIcon(QObject):
@@ -19,6 +26,12 @@ class TrayIcon(QObject):
     take_break_now_requested = pyqtSignal()
     quit_requested = pyqtSignal()
     complete_todo_requested = pyqtSignal(str)  # Emite todo_id
+    profile_selected = pyqtSignal(str)  # Emite nome do perfil ("" = padrão)
+    create_profile_requested = pyqtSignal()
+    import_todos_requested = pyqtSignal()
+    export_todos_requested = pyqtSignal()
+    command_palette_requested = pyqtSignal()
+    menu_visibility_changed = pyqtSignal(bool)  # Menu aberto/fechado
 
     # Sinais do Pomodoro
     start_pomodoro_requested = pyqtSignal()
@@ -84,12 +97,21 @@ class TrayIcon(QObject):
         self.status_action = QAction("Próxima pausa em: --:--", self.menu)
         self.status_action.setEnabled(False)
         self.menu.addAction(self.status_action)
+        # O texto é calculado só ao abrir o menu (ver set_status_source)
+        self._status_source: Optional[Callable[[], str]] = None
+        self.menu.aboutToShow.connect(self.refresh_status)
+        self.menu.aboutToShow.connect(lambda: self.menu_visibility_changed.emit(True))
+        self.menu.aboutToHide.connect(lambda: self.menu_visibility_changed.emit(False))
 
         self.menu.addSeparator()
 
         # TODOs submenu
         self.todos_menu = self.menu.addMenu("TODOs Pendentes")
-        self._update_todos_menu_empty()
+        self._setup_todos_menu()
+
+        # Perfis submenu
+        self.profiles_menu = self.menu.addMenu("Perfil")
+        self.set_profiles([], "")
 
         self.menu.addSeparator()
 
@@ -127,6 +149,11 @@ class TrayIcon(QObject):
 
         self.menu.addSeparator()
 
+        # Busca rápida (paleta de comandos)
+        search_action = QAction("Busca rápida...", self.menu)
+        search_action.triggered.connect(self.command_palette_requested.emit)
+        self.menu.addAction(search_action)
+
         # Configurações
         settings_action = QAction("Configurações...", self.menu)
         settings_action.triggered.connect(self.show_settings_requested.emit)
@@ -174,6 +201,23 @@ class TrayIcon(QObject):
         """Atualiza o texto de status no menu."""
         self.status_action.setText(f"Próxima pausa em: {time_remaining}")
 
+    def set_status_source(self, source: Callable[[], str]):
+        """Função que devolve o texto de status, chamada quando o menu vai abrir."""
+        self._status_source = source
+
+    def refresh_status(self):
+        """Recalcula o texto de status a partir da fonte (sem fonte, nada muda)."""
+        if self._status_source is None:
+            return
+        text = self._status_source()
+        if text != self.status_action.text():
+            self.status_action.setText(text)
+
+    def set_tooltip(self, text: str):
+        """Atualiza o tooltip do ícone (sem chamada ao sistema se não mudou)."""
+        if text != self.tray_icon.toolTip():
+            self.tray_icon.setToolTip(text)
+
     def set_paused_state(self, paused: bool):
         """Atualiza o estado de pausa."""
         self.is_paused = paused
@@ -199,34 +243,216 @@ class TrayIcon(QObject):
             self.tray_icon.setIcon(self._create_default_icon("#2196F3"))  # Azul
             self.tray_icon.setToolTip("Wsi Break Time - Descanse seus olhos")
 
-    def _update_todos_menu_empty(self):
-        """Configura menu de TODOs vazio."""
-        self.todos_menu.clear()
-        no_todos_action = QAction("Nenhum TODO pendente", self.todos_menu)
-        no_todos_action.setEnabled(False)
-        self.todos_menu.addAction(no_todos_action)
+    def _setup_todos_menu(self):
+        """
+        Cria as partes fixas do submenu de TODOs. Os itens dos TODOs são
+        montados só quando o submenu é aberto (`aboutToShow`), e apenas se a
+        lista mudou desde a última abertura.
+        """
+        self._todos_source: Optional[Callable[[], Iterable]] = None
+        self._todos_dirty = True
+        self._todo_actions: Dict[str, QAction] = {}  # todo_id → ação (reaproveitada)
+        self._todo_texts: Dict[str, str] = {}
+        self._group_menus: Dict[str, QMenu] = {}  # Título do grupo → submenu
+        self._group_todos: Dict[str, list] = {}  # TODOs de cada grupo
+        self._dirty_groups: set = set()
+        # Estatísticas para profiling (ver docs/architecture/05-tray-icon.md)
+        self.todos_menu_stats = {
+            'invalidations': 0, 'rebuilds': 0, 'last_ms': 0.0, 'total_ms': 0.0,
+            'created': 0, 'updated': 0, 'removed': 0,
+        }
+
+        self._no_todos_action = QAction("Nenhum TODO pendente", self.todos_menu)
+        self._no_todos_action.setEnabled(False)
+        self.todos_menu.addAction(self._no_todos_action)
+
+        # Tudo antes deste separador é dinâmico
+        self._todos_footer = self.todos_menu.addSeparator()
 
-    def update_todos_menu(self, pending_todos: list):
-        """Atualiza o submenu de TODOs pendentes."""
-        self.todos_menu.clear()
+        manage_action = QAction("Gerenciar TODOs...", self.todos_menu)
+        manage_action.triggered.connect(self.show_settings_requested.emit)
+        self.todos_menu.addAction(manage_action)
 
-        if not pending_todos:
-            self._update_todos_menu_empty()
-            return
+        import_action = QAction("Importar TODOs...", self.todos_menu)
+        import_action.triggered.connect(self.import_todos_requested.emit)
+        self.todos_menu.addAction(import_action)
 
-        for todo in pending_todos:
-            time_str = f" [{todo.scheduled_time}]" if todo.scheduled_time else ""
-            recurring_icon = "[R] " if todo.is_recurring else ""
-            action = QAction(f"{recurring_icon}{todo.title}{time_str}", self.todos_menu)
-            # Usar lambda com valor padrão para capturar o id corretamente
-            action.triggered.connect(lambda checked, tid=todo.id: self.complete_todo_requested.emit(tid))
-            self.todos_menu.addAction(action)
+        export_action = QAction("Exportar TODOs...", self.todos_menu)
+        export_action.triggered.connect(self.export_todos_requested.emit)
+        self.todos_menu.addAction(export_action)
 
-        self.todos_menu.addSeparator()
+        self.todos_menu.aboutToShow.connect(self._refresh_todos_menu)
+        # Um único slot para todos os TODOs (inclusive nos submenus de grupo);
+        # o id vem em action.data()
+        self.todos_menu.triggered.connect(self._on_todos_menu_triggered)
 
-        manage_action = QAction("Gerenciar TODOs...", self.todos_menu)
-        manage_action.triggered.connect(self.show_settings_requested.emit)
-        self.todos_menu.addAction(manage_action)
+    def set_todos_source(self, source: Callable[[], Iterable]):
+        """Função que devolve os TODOs pendentes, chamada ao abrir o submenu."""
+        self._todos_source = source
+        self.invalidate_todos_menu()
+
+    def invalidate_todos_menu(self):
+        """Marca o submenu como desatualizado; nada é refeito até ele ser aberto."""
+        self._todos_dirty = True
+        self.todos_menu_stats['invalidations'] += 1
+
+    def update_todos_menu(self, pending_todos: list):
+        """Atualiza o submenu de TODOs pendentes com a lista informada."""
+        self._todos_source = lambda: pending_todos
+        self._todos_dirty = True
+        self._refresh_todos_menu()
+
+    def _on_todos_menu_triggered(self, action: QAction):
+        todo_id = action.data()
+        if isinstance(todo_id, str):
+            self.complete_todo_requested.emit(todo_id)
+
+    def _refresh_todos_menu(self):
+        """Sincroniza o submenu com os TODOs pendentes, mexendo só no que mudou."""
+        if not self._todos_dirty:
+            return
+        start = time.perf_counter()
+        self._todos_dirty = False
+        pending = list(self._todos_source()) if self._todos_source else []
+        alive = {todo.id for todo in pending}
+
+        if len(pending) > TODOS_GROUP_THRESHOLD:
+            groups = self._group_pending(pending)
+            desired = []
+            for title, todos in groups:
+                menu = self._group_menus.get(title)
+                if menu is None:
+                    menu = QMenu(title, self.todos_menu)
+                    menu.aboutToShow.connect(lambda t=title: self._refresh_group_menu(t))
+                    self._group_menus[title] = menu
+                menu.setTitle(f"{title} ({len(todos)})")
+                desired.append(menu.menuAction())
+            self._group_todos = dict(groups)
+            self._dirty_groups = set(self._group_todos)
+        else:
+            self._group_todos = {}
+            self._dirty_groups = set()
+            desired = [self._todo_action(todo) for todo in pending]
+
+        # Submenus de grupo e ações de TODOs que não estão mais pendentes
+        for title in [t for t in self._group_menus if t not in self._group_todos]:
+            self.todos_menu.removeAction(self._group_menus[title].menuAction())
+            self._group_menus.pop(title).deleteLater()
+        for todo_id in [i for i in self._todo_actions if i not in alive]:
+            self._todo_actions.pop(todo_id).deleteLater()  # Sai de todos os menus
+            self._todo_texts.pop(todo_id, None)
+            self.todos_menu_stats['removed'] += 1
+
+        if not pending:
+            desired = [self._no_todos_action]
+        self._sync_menu(self.todos_menu, desired, self._todos_footer)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        stats = self.todos_menu_stats
+        stats['rebuilds'] += 1
+        stats['last_ms'] = elapsed
+        stats['total_ms'] += elapsed
+
+    def _refresh_group_menu(self, title: str):
+        """Monta os itens de um grupo na primeira abertura após a mudança."""
+        if title not in self._dirty_groups:
+            return
+        self._dirty_groups.discard(title)
+        actions = [self._todo_action(todo) for todo in self._group_todos.get(title, ())]
+        self._sync_menu(self._group_menus[title], actions, None)
+
+    def _todo_action(self, todo) -> QAction:
+        """Ação do TODO, reaproveitada entre atualizações (texto só muda se preciso)."""
+        time_str = f" [{todo.scheduled_time}]" if todo.scheduled_time else ""
+        recurring_icon = "[R] " if todo.is_recurring else ""
+        text = f"{recurring_icon}{todo.title}{time_str}"
+
+        action = self._todo_actions.get(todo.id)
+        if action is None:
+            action = QAction(text, self.todos_menu)
+            action.setData(todo.id)
+            self._todo_actions[todo.id] = action
+            self._todo_texts[todo.id] = text
+            self.todos_menu_stats['created'] += 1
+        elif self._todo_texts.get(todo.id) != text:
+            action.setText(text)
+            self._todo_texts[todo.id] = text
+            self.todos_menu_stats['updated'] += 1
+        return action
+
+    @staticmethod
+    def _group_pending(pending: list) -> List[tuple]:
+        """
+        Agrupa os pendentes: "Atrasados" (ocorrência de dias anteriores), uma
+        faixa por hora da ocorrência de hoje e "Sem horário" (TODOs simples).
+        """
+        today_start = datetime.combine(datetime.now().date(), datetime.min.time()).timestamp()
+        groups: Dict[tuple, list] = {}
+        for todo in pending:
+            ts = todo.occurrence_ts
+            if ts is None:
+                key = (24, "Sem horário")
+            elif ts < today_start:
+                key = (-1, "Atrasados")
+            else:
+                hour = datetime.fromtimestamp(ts).hour
+                key = (hour, f"{hour:02d}:00 - {hour:02d}:59")
+            groups.setdefault(key, []).append(todo)
+        return [(key[1], todos) for key, todos in sorted(groups.items(), key=lambda g: g[0][0])]
+
+    @staticmethod
+    def _sync_menu(menu: QMenu, desired: List[QAction], before: Optional[QAction]):
+        """
+        Deixa as ações dinâmicas de `menu` (as que ficam antes de `before`)
+        iguais a `desired`, na ordem, removendo e movendo só o necessário.
+        """
+        current = menu.actions()
+        if before is not None:
+            current = current[:current.index(before)]
+        wanted = set(desired)
+        for action in current:
+            if action not in wanted:
+                menu.removeAction(action)
+        current = [a for a in current if a in wanted]
+
+        # Percorre a ordem desejada com um cursor sobre a ordem atual;
+        # insertAction move ações que já estão no menu
+        moved = set()
+        pos = 0
+        for action in desired:
+            while pos < len(current) and current[pos] in moved:
+                pos += 1
+            if pos < len(current) and current[pos] is action:
+                pos += 1
+                continue
+            anchor = current[pos] if pos < len(current) else before
+            if anchor is None:
+                menu.addAction(action)
+            else:
+                menu.insertAction(anchor, action)
+            moved.add(action)
+
+    def set_profiles(self, names: list, active: str):
+        """Atualiza o submenu de perfis, marcando o ativo."""
+        self.profiles_menu.clear()
+        group = QActionGroup(self.profiles_menu)
+        group.setExclusive(True)
+
+        for name in [""] + list(names):
+            action = QAction(name or "Padrão", self.profiles_menu)
+            action.setCheckable(True)
+            action.setChecked(name == active)
+            action.triggered.connect(lambda checked, n=name: self.profile_selected.emit(n))
+            group.addAction(action)
+            self.profiles_menu.addAction(action)
+
+        self.profiles_menu.addSeparator()
+
+        create_action = QAction("Novo perfil...", self.profiles_menu)
+        create_action.triggered.connect(self.create_profile_requested.emit)
+        self.profiles_menu.addAction(create_action)
+
+        self.profiles_menu.setTitle(f"Perfil: {active}" if active else "Perfil")
 
     def set_pomodoro_state(self, active: bool, waiting_confirmation: bool = False,
                            status_text: str = None):